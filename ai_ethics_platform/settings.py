@@ -147,8 +147,55 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Media files (Uploads)
+# Only caches are kept here; queued datasets are stored in the database
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_ROOT = Path(os.getenv('MEDIA_ROOT', BASE_DIR / 'media'))
+
+# Uploaded CSV files at least this large are analyzed in chunks instead of loaded whole
+STREAMING_CSV_THRESHOLD_BYTES = int(os.getenv('STREAMING_CSV_THRESHOLD_BYTES', 50 * 1024 * 1024))
+STREAMING_CSV_CHUNKSIZE = int(os.getenv('STREAMING_CSV_CHUNKSIZE', 100000))
+# Rows kept in memory from a streamed upload for column checks and AI analysis
+STREAMING_CSV_SAMPLE_ROWS = int(os.getenv('STREAMING_CSV_SAMPLE_ROWS', 10000))
+
+# Workers used across sensitive attributes in bias analysis (1 = serial, 0 = one per CPU)
+BIAS_ANALYSIS_WORKERS = int(os.getenv('BIAS_ANALYSIS_WORKERS', 1))
+# 'thread' shares the DataFrame, 'process' shares column arrays through shared memory
+BIAS_ANALYSIS_BACKEND = os.getenv('BIAS_ANALYSIS_BACKEND', 'thread')
+
+# Fitted surrogate models are cached by a hash of their training data
+SURROGATE_CACHE_ENABLED = os.getenv('SURROGATE_CACHE_ENABLED', 'True') == 'True'
+SURROGATE_CACHE_MAX_BYTES = int(os.getenv('SURROGATE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+# Set SURROGATE_CACHE_DISK_DIR to an empty string to keep the cache in memory only
+SURROGATE_CACHE_DISK_DIR = os.getenv('SURROGATE_CACHE_DISK_DIR', str(MEDIA_ROOT / 'surrogate_models')) or None
+SURROGATE_CACHE_DISK_MAX_BYTES = int(os.getenv('SURROGATE_CACHE_DISK_MAX_BYTES', 2 * 1024 * 1024 * 1024))
+
+# Fit transparency surrogates on growing stratified subsamples until feature rankings stabilize
+TRANSPARENCY_ADAPTIVE_SAMPLING = os.getenv('TRANSPARENCY_ADAPTIVE_SAMPLING', 'True') == 'True'
+
+# Background analysis jobs, run by the `worker` process of the Procfile and render.yaml
+# (`manage.py run_analysis_workers`). Jobs keep their dataset in the database, so workers
+# only need the web service's DATABASE_URL. ANALYSIS_JOBS_EAGER runs each job inside the
+# request that queued it instead; set it where no worker runs
+ANALYSIS_JOBS_EAGER = os.getenv('ANALYSIS_JOBS_EAGER', 'False') == 'True'
+ANALYSIS_JOB_WORKERS = int(os.getenv('ANALYSIS_JOB_WORKERS', 2))
+ANALYSIS_JOB_POLL_INTERVAL = float(os.getenv('ANALYSIS_JOB_POLL_INTERVAL', 1.0))
+# Running jobs update their heartbeat this often, and are requeued on worker start when
+# it is older than ANALYSIS_JOB_STALE_SECONDS
+ANALYSIS_JOB_HEARTBEAT_SECONDS = float(os.getenv('ANALYSIS_JOB_HEARTBEAT_SECONDS', 30))
+ANALYSIS_JOB_STALE_SECONDS = int(os.getenv('ANALYSIS_JOB_STALE_SECONDS', 30 * 60))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv('ANALYSIS_JOB_MAX_ATTEMPTS', 3))
+# Progress event streams are long polls: they end once new events were sent or after
+# this long without any, and browsers reconnect with Last-Event-ID
+ANALYSIS_EVENTS_STREAM_SECONDS = int(os.getenv('ANALYSIS_EVENTS_STREAM_SECONDS', 5))
+ANALYSIS_EVENTS_POLL_INTERVAL = float(os.getenv('ANALYSIS_EVENTS_POLL_INTERVAL', 0.5))
+# Completed analyses listed per page on the bias detection and transparency pages
+ANALYSIS_LIST_PAGE_SIZE = int(os.getenv('ANALYSIS_LIST_PAGE_SIZE', 10))
+# Compression of stored analysis results: 'gzip', or 'zstd' with the zstandard package installed
+ANALYSIS_RESULT_CODEC = os.getenv('ANALYSIS_RESULT_CODEC', 'gzip')
+# Homepage counters are cached in the default cache under a version stored in the database,
+# which every process checks and any process bumps when a counted object changes; the
+# timeout only evicts unused versions (bulk_create and queryset updates skip the bump)
+HOMEPAGE_STATS_CACHE_TIMEOUT = int(os.getenv('HOMEPAGE_STATS_CACHE_TIMEOUT', 300))
 
 # For production environments, enable SSL
 if not DEBUG:
@@ -157,3 +204,45 @@ if not DEBUG:
 # Google Gemini AI configuration
 GOOGLE_GEMINI_API_KEY = os.environ.get('GOOGLE_GEMINI_API_KEY')
 GEMINI_MODEL_NAME = 'gemini-1.5-pro'  # Use the most advanced available model
+# 'gemini' calls Google; 'stub' calls the local server started by `manage.py run_llm_stub`
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini')
+LLM_STUB_URL = os.getenv('LLM_STUB_URL', 'http://127.0.0.1:8765/v1/generate')
+# Estimated tokens the dataset ethics prompt may use (about 4 characters per token)
+GEMINI_PROMPT_TOKEN_BUDGET = int(os.getenv('GEMINI_PROMPT_TOKEN_BUDGET', 2000))
+# Independent Gemini prompts sent at once, and seconds to wait for each response
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 4))
+GEMINI_CALL_TIMEOUT = float(os.getenv('GEMINI_CALL_TIMEOUT', 60))
+# Deadline of a single Gemini request and retries of transient failures
+GEMINI_REQUEST_TIMEOUT = float(os.getenv('GEMINI_REQUEST_TIMEOUT', 20))
+GEMINI_MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', 2))
+GEMINI_RETRY_BASE_DELAY = float(os.getenv('GEMINI_RETRY_BASE_DELAY', 0.5))
+GEMINI_RETRY_MAX_DELAY = float(os.getenv('GEMINI_RETRY_MAX_DELAY', 8))
+# Gemini calls are skipped for GEMINI_BREAKER_RESET_SECONDS after this many consecutive failures
+GEMINI_BREAKER_FAILURE_THRESHOLD = int(os.getenv('GEMINI_BREAKER_FAILURE_THRESHOLD', 5))
+GEMINI_BREAKER_RESET_SECONDS = float(os.getenv('GEMINI_BREAKER_RESET_SECONDS', 30))
+
+# Gemini responses are cached by a hash of the prompt
+GEMINI_CACHE_ENABLED = os.getenv('GEMINI_CACHE_ENABLED', 'True') == 'True'
+GEMINI_CACHE_ALIAS = 'ai_responses'
+GEMINI_CACHE_TTL = int(os.getenv('GEMINI_CACHE_TTL', 24 * 60 * 60))
+# Set GEMINI_CACHE_DISK_DIR to an empty string to keep responses in the cache backend only
+GEMINI_CACHE_DISK_DIR = os.getenv('GEMINI_CACHE_DISK_DIR', str(MEDIA_ROOT / 'ai_responses')) or None
+GEMINI_CACHE_DISK_MAX_BYTES = int(os.getenv('GEMINI_CACHE_DISK_MAX_BYTES', 100 * 1024 * 1024))
+# A prompt being generated is leased in the cache backend for up to this long, so other
+# processes wait for its response; with the default local-memory backend identical prompts
+# are only shared within a process (one request at a time under sync gunicorn workers),
+# so set GEMINI_CACHE_BACKEND to a shared backend to deduplicate across workers
+GEMINI_CACHE_LEASE_SECONDS = int(os.getenv('GEMINI_CACHE_LEASE_SECONDS', 120))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Local memory culls least recently used responses beyond MAX_ENTRIES
+    GEMINI_CACHE_ALIAS: {
+        'BACKEND': os.getenv('GEMINI_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('GEMINI_CACHE_LOCATION', 'ai-responses'),
+        'TIMEOUT': GEMINI_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('GEMINI_CACHE_MAX_ENTRIES', 1000))},
+    },
+}
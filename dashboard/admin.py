@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import ModelAnalysis, CaseStudy, EducationalResource, UserProfile, UserActivity
+from .models import ModelAnalysis, CaseStudy, EducationalResource, UserProfile, UserActivity, AnalysisJob
 
 # Define inline admin for UserProfile
 class UserProfileInline(admin.StackedInline):
@@ -35,13 +35,13 @@ class ModelAnalysisAdmin(admin.ModelAdmin):
     list_display = ('name', 'model_type', 'user', 'created_at')
     list_filter = ('model_type', 'created_at')
     search_fields = ('name', 'description', 'user__username')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'summary', 'bias_analysis', 'transparency_analysis', 'fairness_metrics')
     fieldsets = (
         (None, {
             'fields': ('name', 'description', 'model_type', 'dataset_description', 'user')
         }),
         ('Analysis Results', {
-            'fields': ('bias_analysis', 'transparency_analysis', 'fairness_metrics'),
+            'fields': ('summary', 'bias_analysis', 'transparency_analysis', 'fairness_metrics'),
             'classes': ('collapse',),
         }),
         ('Timestamps', {
@@ -73,8 +73,16 @@ class UserActivityAdmin(admin.ModelAdmin):
         # Prevent manual creation of activity records
         return False
 
+# AnalysisJob Admin
+class AnalysisJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job_type', 'status', 'stage', 'progress', 'attempts', 'user', 'created_at', 'finished_at')
+    list_filter = ('job_type', 'status', 'created_at')
+    search_fields = ('id', 'user__username', 'error')
+    readonly_fields = ('created_at', 'started_at', 'heartbeat_at', 'finished_at')
+
 # Register models for admin interface
 admin.site.register(ModelAnalysis, ModelAnalysisAdmin)
 admin.site.register(CaseStudy, CaseStudyAdmin)
 admin.site.register(EducationalResource, EducationalResourceAdmin)
 admin.site.register(UserActivity, UserActivityAdmin)
+admin.site.register(AnalysisJob, AnalysisJobAdmin)
@@ -0,0 +1,311 @@
+"""
+Cache of generated AI responses keyed by a hash of the prompt
+Responses live in a Django cache (TTL, LRU culling) backed by a local disk tier,
+and concurrent requests for the same prompt share one upstream call: threads of
+a process wait on an in-process call, and processes sharing the cache backend
+(Redis, database, memcached; not the default local memory) wait on a lease
+taken in that backend
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+# Bumped whenever prompts or response handling change, invalidating old entries
+CACHE_VERSION = 1
+
+
+def prompt_cache_key(model_name, prompt):
+    """
+    Builds the cache key of a prompt
+
+    Parameters:
+    -----------
+    model_name : str
+        Model the prompt is sent to
+    prompt : str
+        Full prompt text
+
+    Returns:
+    --------
+    str
+        Hex SHA-256 digest identifying the response
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}|{model_name}|".encode())
+    digest.update(prompt.encode())
+    return digest.hexdigest()
+
+
+class _InflightCall:
+    """Upstream call that other requests for the same key wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.text = None
+        self.error = None
+
+
+class AIResponseCache:
+    """
+    Two-tier cache of AI response texts with single-flight generation
+
+    The first tier is a Django cache backend, which applies the TTL and evicts
+    the least recently used entries once it is full. When disk_dir is set,
+    responses are also written there with their expiry time so they survive
+    restarts, and the directory is trimmed to disk_max_bytes, oldest first.
+
+    With lease_timeout set, the generating caller also holds a lease in the
+    cache backend for up to lease_timeout seconds; callers of other processes
+    poll for its response every poll_interval seconds instead of generating
+    it again. The lease only spans processes when the backend is shared.
+    """
+
+    def __init__(self, cache, timeout, disk_dir=None, disk_max_bytes=None, lease_timeout=None,
+                 poll_interval=0.2):
+        self.cache = cache
+        self.timeout = timeout
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns (text, tier) for a key, where tier is 'memory', 'disk' or None on a miss
+        """
+        text, tier = self._lookup(key)
+        self._count(tier)
+        return text, tier
+
+    def put(self, key, text):
+        """Stores a response text under a key"""
+        self.cache.set(self._cache_key(key), text, self.timeout)
+        self._write_to_disk(key, text, time.time() + self.timeout)
+
+    def get_or_generate(self, key, generate):
+        """
+        Returns (text, tier) for a key, calling generate() on a miss
+
+        While one caller generates a response, other callers asking for the
+        same key wait for it instead of making their own upstream call; their
+        tier is 'shared'. Failed calls are not cached and the error is raised
+        in every waiting caller of the same process; callers waiting on the
+        lease from another process take it over and try themselves.
+        """
+        text, tier = self._lookup(key)
+        if tier is not None:
+            self._count(tier)
+            return text, tier
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InflightCall()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                self._count(None)
+                raise call.error
+            self._count('shared')
+            return call.text, 'shared'
+
+        try:
+            text, tier = self._generate_with_lease(key, generate)
+            call.text = text
+            return text, tier
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # Counted once, by where the response finally came from
+            self._count(tier)
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def _generate_with_lease(self, key, generate):
+        """Generates the response under the cross-process lease, or returns the lease holder's response"""
+        lease_key = f"{self._cache_key(key)}:lease"
+        leased = not self.lease_timeout or self.cache.add(lease_key, os.getpid(), self.lease_timeout)
+        deadline = time.monotonic() + (self.lease_timeout or 0)
+
+        while not leased:
+            time.sleep(self.poll_interval)
+            text = self.cache.get(self._cache_key(key))
+            if text is not None:
+                return text, 'shared'
+            # The holder finished without a response (failed) or its lease expired
+            leased = self.cache.add(lease_key, os.getpid(), self.lease_timeout)
+            if not leased and time.monotonic() >= deadline:
+                break
+
+        try:
+            # Another leader may have finished between our lookup and claiming the key
+            text, tier = self._lookup(key)
+            if tier is None:
+                text = generate()
+                self.put(key, text)
+            return text, tier
+        finally:
+            if leased and self.lease_timeout:
+                self.cache.delete(lease_key)
+
+    def _lookup(self, key):
+        text = self.cache.get(self._cache_key(key))
+        if text is not None:
+            return text, 'memory'
+
+        entry = self._load_from_disk(key)
+        if entry is None:
+            return None, None
+
+        text, expires_at = entry
+        self.cache.set(self._cache_key(key), text, max(1, int(expires_at - time.time())))
+        return text, 'disk'
+
+    def _count(self, tier):
+        # Counters are read by the status endpoint while other threads update them
+        with self._lock:
+            if tier == 'memory':
+                self.hits += 1
+            elif tier == 'disk':
+                self.disk_hits += 1
+            elif tier == 'shared':
+                self.shared += 1
+            else:
+                self.misses += 1
+
+    def _cache_key(self, key):
+        return f"ai_response:{key}"
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            text, expires_at = entry['text'], entry['expires_at']
+        except (OSError, ValueError, KeyError):
+            # Partially written or unreadable entries are dropped
+            self._remove(path)
+            return None
+
+        if expires_at <= time.time():
+            self._remove(path)
+            return None
+
+        # Mark as recently used for disk eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return text, expires_at
+
+    def _write_to_disk(self, key, text, expires_at):
+        if not self.disk_dir:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'text': text, 'expires_at': expires_at}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            return
+
+        self._trim_disk()
+
+    def _trim_disk(self):
+        if not self.disk_max_bytes:
+            return
+
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Returns the process-wide cache configured by the GEMINI_CACHE_* settings,
+    or None when caching is disabled
+    """
+    global _default_cache
+
+    if not settings.GEMINI_CACHE_ENABLED:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AIResponseCache(
+                caches[settings.GEMINI_CACHE_ALIAS],
+                timeout=settings.GEMINI_CACHE_TTL,
+                disk_dir=settings.GEMINI_CACHE_DISK_DIR,
+                disk_max_bytes=settings.GEMINI_CACHE_DISK_MAX_BYTES,
+                lease_timeout=settings.GEMINI_CACHE_LEASE_SECONDS
+            )
+        return _default_cache
+
+
+@receiver(setting_changed)
+def reset_default_cache(sender, setting, **kwargs):
+    """Rebuild the default cache when its settings change (e.g. in tests)"""
+    global _default_cache
+    if setting.startswith('GEMINI_CACHE_') or setting == 'CACHES':
+        with _default_cache_lock:
+            _default_cache = None
@@ -0,0 +1,180 @@
+"""
+Bias and transparency analysis pipelines shared by the views and background jobs
+"""
+
+from django.conf import settings
+import pandas as pd
+
+from .bias_detection import (
+    detect_bias_in_data, calculate_fairness_metrics, perform_ai_ethics_analysis_async,
+    detect_bias_from_stats, calculate_fairness_metrics_from_stats
+)
+from .fairness_stats import FairnessStatsAccumulator
+from .transparency import analyze_model_explainability
+from .model_cache import get_default_cache
+from .progress import report_progress
+from .serialization import to_json
+from .gemini_async import run_alongside
+from . import gemini_ai
+
+
+def read_uploaded_csv(data_file):
+    """
+    Reads an uploaded CSV file
+
+    Small files are loaded whole. Files above STREAMING_CSV_THRESHOLD_BYTES only
+    have a sample loaded, and the file is rewound so the statistics can be
+    computed by streaming it in chunks.
+
+    Returns (df, stream_file) where stream_file is None for in-memory analysis
+    """
+    if data_file.size < settings.STREAMING_CSV_THRESHOLD_BYTES:
+        return pd.read_csv(data_file), None
+
+    df = pd.read_csv(data_file, nrows=settings.STREAMING_CSV_SAMPLE_ROWS)
+    data_file.seek(0)
+    return df, data_file
+
+
+def run_bias_analysis(df, stream_file, sensitive_attrs, progress=None):
+    """Runs bias detection and fairness metrics in memory or over the streamed file"""
+    if stream_file is None:
+        return (detect_bias_in_data(df, sensitive_attrs, progress=progress),
+                calculate_fairness_metrics(df, sensitive_attrs, progress=progress))
+
+    accumulator = FairnessStatsAccumulator.from_csv(
+        stream_file, sensitive_attrs, chunksize=settings.STREAMING_CSV_CHUNKSIZE, progress=progress
+    )
+    report_progress(progress, 'bias_tests', accumulator.row_count, accumulator.row_count)
+    return (detect_bias_from_stats(accumulator, sensitive_attrs),
+            calculate_fairness_metrics_from_stats(accumulator, sensitive_attrs))
+
+
+def run_bias_pipeline(df, stream_file, sensitive_attrs, analysis_type, sample_dataset_type='',
+                      progress=None):
+    """
+    Runs the full bias detection workflow for one dataset
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        The dataset, or a sample of it when stream_file is given
+    stream_file : file-like or None
+        Whole CSV file streamed for the statistics of large uploads
+    sensitive_attrs : list
+        Sensitive attribute columns present in the data
+    analysis_type : str
+        'dataset' or 'manual'
+    sample_dataset_type : str
+        Optional sample dataset type used to focus the AI analysis
+    progress : callable, optional
+        Progress hook called as the workflow advances (see dashboard.progress)
+
+    Returns:
+    --------
+    tuple
+        (bias_results, fairness_metrics), both JSON-serializable
+    """
+    # Detect bias in the data and calculate fairness metrics while the AI-powered
+    # ethics analysis runs in the background
+    def compute_statistics():
+        results = run_bias_analysis(df, stream_file, sensitive_attrs, progress=progress)
+        # Whatever time remains is spent waiting for the AI analysis
+        report_progress(progress, 'ai_ethics_analysis', fraction=0.6)
+        return results
+
+    report_progress(progress, 'bias_statistics', fraction=0.1)
+    (bias_results, fairness_metrics), ai_ethics_analysis = run_alongside(
+        compute_statistics,
+        perform_ai_ethics_analysis_async(df, sensitive_attrs, None, sample_dataset_type)
+    )
+
+    # Structure for minimal viable result if there are issues
+    if not isinstance(bias_results, dict):
+        bias_results = {
+            'error': 'Invalid bias results format',
+            'dataset_size': len(df),
+            'analysis_type': analysis_type
+        }
+
+    # Merge AI analysis with bias results (safely)
+    if isinstance(ai_ethics_analysis, dict) and 'error' not in ai_ethics_analysis:
+        bias_results['ai_ethics_analysis'] = ai_ethics_analysis
+
+    # Add analysis type to results
+    bias_results['analysis_type'] = analysis_type
+
+    # Convert NumPy values and keys once; the results are encoded again only when saved
+    return to_json(bias_results), to_json(fairness_metrics)
+
+
+def run_transparency_pipeline(df, target_column, model_type, explanation_level, analysis_type,
+                              progress=None):
+    """
+    Runs the full transparency workflow for one dataset
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        The dataset
+    target_column : str
+        The target/outcome column
+    model_type : str
+        Type of model (classification, regression, etc.)
+    explanation_level : str
+        Level of explanation detail (basic, intermediate, advanced)
+    analysis_type : str
+        'dataset' or 'manual'
+    progress : callable, optional
+        Progress hook called as the workflow advances (see dashboard.progress)
+
+    Returns:
+    --------
+    dict
+        Explainability results including AI transparency insights when available
+    """
+    # Generate model explainability
+    report_progress(progress, 'explainability', fraction=0.1)
+    explainability_results = analyze_model_explainability(
+        df,
+        target_column,
+        model_type,
+        explanation_level,
+        model_cache=get_default_cache(),
+        adaptive_sampling=settings.TRANSPARENCY_ADAPTIVE_SAMPLING,
+        progress=progress
+    )
+
+    # Add AI-powered insights for enhanced transparency
+    feature_importances = {}
+    if 'feature_importance' in explainability_results:
+        feature_importances = explainability_results['feature_importance']
+
+    # Add analysis type to results
+    explainability_results['analysis_type'] = analysis_type
+
+    # Prepare model info for AI analysis
+    model_info = {
+        'model_type': model_type,
+        'data_shape': df.shape,
+        'target_column': target_column,
+        'explanation_level': explanation_level,
+        'analysis_type': analysis_type
+    }
+
+    # Get AI-powered transparency insights
+    report_progress(progress, 'ai_transparency_insights', fraction=0.7)
+    try:
+        ai_transparency_insights = gemini_ai.generate_transparency_insights(
+            model_info,
+            feature_importances
+        )
+
+        # Add AI insights to results
+        if 'error' not in ai_transparency_insights:
+            explainability_results['ai_transparency_insights'] = ai_transparency_insights
+    except Exception as ai_error:
+        # Log the error but continue without AI insights
+        print(f"AI transparency analysis error: {str(ai_error)}")
+
+    return to_json(explainability_results)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+    
+    def ready(self):
+        # Connects the signal receivers that invalidate the homepage statistics
+        from . import homepage_stats  # noqa: F401
@@ -3,14 +3,19 @@ Bias detection and fairness metrics calculation for AI models
 Includes Gemini AI-powered analysis for enhanced ethical insights
 """
 
+import asyncio
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import confusion_matrix
 import scipy.stats as stats
+from django.conf import settings
+
+from .fairness_stats import FairnessStatsAccumulator, DEFAULT_CHUNKSIZE
+from .parallel_stats import accumulate_parallel
+from .progress import report_progress
 
 # Import Gemini AI module
 from . import gemini_ai
+from . import gemini_async
 
 def create_dataframe_from_manual_input(form_data):
     """
@@ -155,7 +160,8 @@ def get_category_values(column_name):
     
     return categories.get(column_name, ['unknown'])
 
-def detect_bias_in_data(df, sensitive_attributes, target_column=None, sample_dataset_type=None):
+def detect_bias_in_data(df, sensitive_attributes, target_column=None, sample_dataset_type=None,
+                        n_jobs=None, backend=None, progress=None):
     """
     Detects potential bias in data based on sensitive attributes
     
@@ -169,138 +175,24 @@ def detect_bias_in_data(df, sensitive_attributes, target_column=None, sample_dat
         Target/outcome column if available
     sample_dataset_type : str, optional
         Type of dataset being analyzed (e.g., 'hiring_dataset', 'loan_approval')
+    n_jobs : int, optional
+        Workers used across sensitive attributes (defaults to BIAS_ANALYSIS_WORKERS)
+    backend : str, optional
+        'thread' or 'process' pool (defaults to BIAS_ANALYSIS_BACKEND)
+    progress : callable, optional
+        Progress hook called with the stage name and rows processed (see dashboard.progress)
         
     Returns:
     --------
     dict
         Dictionary containing bias detection results
     """
-    results = {
-        'dataset_size': len(df),
-        'attribute_distribution': {},
-        'correlation_with_sensitive': {},
-        'statistical_parity': {},
-        'overall_assessment': {}
-    }
-    
-    # Check distribution of sensitive attributes
-    for attr in sensitive_attributes:
-        if attr not in df.columns:
-            results['attribute_distribution'][attr] = {
-                'error': f"Column {attr} not found in dataset"
-            }
-            continue
-        
-        # Calculate distribution
-        distribution = df[attr].value_counts(normalize=True).to_dict()
-        results['attribute_distribution'][attr] = {
-            'distribution': distribution,
-            'entropy': stats.entropy(list(distribution.values())),
-            'unique_values': len(distribution)
-        }
-        
-        # Add assessment
-        if max(distribution.values()) > 0.8:
-            results['attribute_distribution'][attr]['assessment'] = "Highly imbalanced"
-        elif max(distribution.values()) > 0.6:
-            results['attribute_distribution'][attr]['assessment'] = "Moderately imbalanced"
-        else:
-            results['attribute_distribution'][attr]['assessment'] = "Relatively balanced"
-    
-    # If target column provided, check for correlation with sensitive attributes
-    if target_column and target_column in df.columns:
-        for attr in sensitive_attributes:
-            if attr not in df.columns:
-                continue
-                
-            # For categorical target, check chi-square
-            if df[target_column].dtype == 'object' or df[target_column].dtype == 'category':
-                try:
-                    contingency = pd.crosstab(df[attr], df[target_column])
-                    chi2, p, _, _ = stats.chi2_contingency(contingency)
-                    correlation = {
-                        'method': 'chi_square',
-                        'chi2': chi2,
-                        'p_value': p,
-                        'significant': p < 0.05
-                    }
-                except:
-                    correlation = {
-                        'method': 'chi_square',
-                        'error': 'Could not calculate chi-square'
-                    }
-            # For numerical target, check correlation
-            else:
-                try:
-                    # Convert categorical attributes to numerical
-                    if df[attr].dtype == 'object' or df[attr].dtype == 'category':
-                        le = LabelEncoder()
-                        attr_encoded = le.fit_transform(df[attr])
-                        corr, p = stats.pearsonr(attr_encoded, df[target_column])
-                    else:
-                        corr, p = stats.pearsonr(df[attr], df[target_column])
-                    
-                    correlation = {
-                        'method': 'pearson',
-                        'correlation': corr,
-                        'p_value': p,
-                        'significant': p < 0.05
-                    }
-                except:
-                    correlation = {
-                        'method': 'pearson',
-                        'error': 'Could not calculate correlation'
-                    }
-            
-            results['correlation_with_sensitive'][attr] = correlation
-            
-            # Calculate statistical parity if binary target
-            if len(df[target_column].unique()) == 2:
-                try:
-                    parity_results = check_statistical_parity(df, attr, target_column)
-                    results['statistical_parity'][attr] = parity_results
-                except Exception as e:
-                    results['statistical_parity'][attr] = {
-                        'error': str(e)
-                    }
-    
-    # Overall assessment
-    for attr in sensitive_attributes:
-        if attr not in df.columns:
-            continue
-            
-        # Check for potential bias
-        bias_indicators = []
-        
-        # Imbalanced distribution
-        if attr in results['attribute_distribution'] and 'assessment' in results['attribute_distribution'][attr]:
-            if results['attribute_distribution'][attr]['assessment'] in ["Highly imbalanced", "Moderately imbalanced"]:
-                bias_indicators.append("Imbalanced distribution")
-        
-        # Correlation with target
-        if attr in results['correlation_with_sensitive']:
-            if 'significant' in results['correlation_with_sensitive'][attr] and results['correlation_with_sensitive'][attr]['significant']:
-                bias_indicators.append("Significant correlation with target")
-        
-        # Statistical parity difference
-        if attr in results['statistical_parity'] and 'parity_difference' in results['statistical_parity'][attr]:
-            if abs(results['statistical_parity'][attr]['parity_difference']) > 0.1:
-                bias_indicators.append("Statistical parity difference exceeds 0.1")
-        
-        # Set overall assessment
-        if len(bias_indicators) >= 2:
-            risk_level = "High risk of bias"
-        elif len(bias_indicators) == 1:
-            risk_level = "Medium risk of bias"
-        else:
-            risk_level = "Low risk of bias"
-            
-        results['overall_assessment'][attr] = {
-            'risk_level': risk_level,
-            'bias_indicators': bias_indicators
-        }
-    
-    return results
+    # Every statistic is derived from mergeable per-group counts, so the
+    # in-memory, streaming and sharded paths produce the same results
+    accumulator = accumulate_stats(df, sensitive_attributes, target_column, n_jobs=n_jobs, backend=backend,
+                                   progress=progress)
+    report_progress(progress, 'bias_tests', accumulator.row_count, accumulator.row_count)
+    return detect_bias_from_stats(accumulator, sensitive_attributes)
 
 
 def check_statistical_parity(df, sensitive_attr, target_column):
@@ -321,36 +213,65 @@ def check_statistical_parity(df, sensitive_attr, target_column):
     dict
         Dictionary containing statistical parity results
     """
-    results = {}
-    
-    # Get unique values in sensitive attribute
-    unique_attrs = df[sensitive_attr].unique()
+    # Positive rate for every group in a single grouped scan; sort=False keeps
+    # groups in order of first appearance like Series.unique()
+    positive_rates = df.groupby(
+        sensitive_attr, sort=False, observed=True
+    )[target_column].mean().to_dict()
     
-    # Check parity for each value
-    positive_rates = {}
-    for attr_value in unique_attrs:
-        subset = df[df[sensitive_attr] == attr_value]
-        positive_rate = subset[target_column].mean()
-        positive_rates[attr_value] = positive_rate
+    return summarize_parity(positive_rates)
+
+
+def summarize_dataset(df, target_column=None):
+    """
+    Builds the dataset summary sent to the AI ethics analysis
     
-    # Calculate parity difference (max difference between groups)
-    max_rate = max(positive_rates.values())
-    min_rate = min(positive_rates.values())
-    parity_difference = max_rate - min_rate
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        The dataset to summarize
+    target_column : str, optional
+        Target/outcome column if available
+        
+    Returns:
+    --------
+    dict
+        Columns, shape, types, missing values, sample rows and per-column statistics
+    """
+    df_info = {
+        'columns': list(df.columns),
+        'shape': df.shape,
+        'data_types': {col: str(df[col].dtype) for col in df.columns},
+        'missing_values': {col: int(df[col].isna().sum()) for col in df.columns},
+        'sample_rows': df.head(5).to_dict(orient='records'),
+        'statistics': {}
+    }
     
-    results['positive_rates'] = positive_rates
-    results['parity_difference'] = parity_difference
+    # Add statistics for each column
+    for col in df.columns:
+        if df[col].dtype.kind in 'ifc':  # numeric columns
+            df_info['statistics'][col] = {
+                'mean': float(df[col].mean()),
+                'median': float(df[col].median()),
+                'min': float(df[col].min()),
+                'max': float(df[col].max()),
+                'std': float(df[col].std())
+            }
+        else:  # categorical columns
+            df_info['statistics'][col] = {
+                'unique_values': int(df[col].nunique()),
+                'most_common': df[col].value_counts().nlargest(3).to_dict()
+            }
     
-    # Assess parity
-    if parity_difference <= 0.05:
-        results['assessment'] = "Good statistical parity"
-    elif parity_difference <= 0.1:
-        results['assessment'] = "Moderate statistical parity"
-    else:
-        results['assessment'] = "Poor statistical parity"
+    # Add target column info if available
+    if target_column and target_column in df.columns:
+        df_info['target_column'] = {
+            'name': target_column,
+            'type': str(df[target_column].dtype),
+            'distribution': df[target_column].value_counts().to_dict() if df[target_column].dtype.kind not in 'ifc' else None
+        }
     
-    return results
-
+    return df_info
 
 def perform_ai_ethics_analysis(df, sensitive_attributes, target_column=None, sample_dataset_type=None):
     """
@@ -373,41 +294,8 @@ def perform_ai_ethics_analysis(df, sensitive_attributes, target_column=None, sam
         AI-generated ethics analysis results
     """
     try:
-        # Prepare dataset info for the AI
-        df_info = {
-            'columns': list(df.columns),
-            'shape': df.shape,
-            'data_types': {col: str(df[col].dtype) for col in df.columns},
-            'missing_values': {col: int(df[col].isna().sum()) for col in df.columns},
-            'sample_rows': df.head(5).to_dict(orient='records'),
-            'statistics': {}
-        }
-        
-        # Add statistics for each column
-        for col in df.columns:
-            if df[col].dtype.kind in 'ifc':  # numeric columns
-                df_info['statistics'][col] = {
-                    'mean': float(df[col].mean()),
-                    'median': float(df[col].median()),
-                    'min': float(df[col].min()),
-                    'max': float(df[col].max()),
-                    'std': float(df[col].std())
-                }
-            else:  # categorical columns
-                df_info['statistics'][col] = {
-                    'unique_values': int(df[col].nunique()),
-                    'most_common': df[col].value_counts().nlargest(3).to_dict()
-                }
-        
-        # Add target column info if available
-        if target_column and target_column in df.columns:
-            df_info['target_column'] = {
-                'name': target_column,
-                'type': str(df[target_column].dtype),
-                'distribution': df[target_column].value_counts().to_dict() if df[target_column].dtype.kind not in 'ifc' else None
-            }
-        
         # Call Gemini AI for analysis
+        df_info = summarize_dataset(df, target_column)
         ai_analysis = gemini_ai.analyze_dataset_ethics(df_info, sensitive_attributes, sample_dataset_type)
         return ai_analysis
         
@@ -418,7 +306,28 @@ def perform_ai_ethics_analysis(df, sensitive_attributes, target_column=None, sam
             'message': 'AI-powered ethics analysis could not be completed'
         }
 
-def calculate_fairness_metrics(df, sensitive_attributes, target_column=None, prediction_column=None):
+async def perform_ai_ethics_analysis_async(df, sensitive_attributes, target_column=None, sample_dataset_type=None,
+                                           per_attribute=False):
+    """
+    Async variant of perform_ai_ethics_analysis
+    
+    Meant to run alongside the local bias statistics (see
+    gemini_async.run_alongside). With per_attribute, each sensitive attribute
+    also gets its own analysis; the prompts are sent concurrently.
+    """
+    try:
+        df_info = await asyncio.to_thread(summarize_dataset, df, target_column)
+        return await gemini_async.analyze_dataset_ethics_async(
+            df_info, sensitive_attributes, sample_dataset_type, per_attribute=per_attribute
+        )
+    except Exception as e:
+        return {
+            'error': str(e),
+            'message': 'AI-powered ethics analysis could not be completed'
+        }
+
+def calculate_fairness_metrics(df, sensitive_attributes, target_column=None, prediction_column=None,
+                               n_jobs=None, backend=None, progress=None):
     """
     Calculates fairness metrics for model predictions
     
@@ -432,6 +341,12 @@ def calculate_fairness_metrics(df, sensitive_attributes, target_column=None, pre
         Actual outcome column
     prediction_column : str, optional
         Predicted outcome column
+    n_jobs : int, optional
+        Workers used across sensitive attributes (defaults to BIAS_ANALYSIS_WORKERS)
+    backend : str, optional
+        'thread' or 'process' pool (defaults to BIAS_ANALYSIS_BACKEND)
+    progress : callable, optional
+        Progress hook called with the stage name and rows processed (see dashboard.progress)
         
     Returns:
     --------
@@ -441,6 +356,7 @@ def calculate_fairness_metrics(df, sensitive_attributes, target_column=None, pre
     results = {
         'metrics_by_attribute': {}
     }
+    report_progress(progress, 'fairness_metrics', 0, len(df))
     
     # If no prediction column, we can only do limited analysis
     if target_column is None or prediction_column is None:
@@ -460,83 +376,604 @@ def calculate_fairness_metrics(df, sensitive_attributes, target_column=None, pre
         return results
     
     # Full analysis with target and prediction columns
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_jobs != 1:
+        accumulator = accumulate_stats(df, sensitive_attributes, target_column, prediction_column,
+                                       n_jobs=n_jobs, backend=backend, progress=progress)
+        return calculate_fairness_metrics_from_stats(accumulator, sensitive_attributes)
+    
+    # Outcomes are encoded once as confusion cells and shared by every attribute
+    outcome_cells = encode_confusion_cells(df[target_column], df[prediction_column])
+    
     for attr in sensitive_attributes:
         if attr not in df.columns:
             continue
             
-        attr_results = {}
+        # Confusion counts for every group of the attribute in one pass
+        groups, sample_sizes, counts = confusion_counts_by_group(df[attr], outcome_cells)
+        results['metrics_by_attribute'][attr] = summarize_group_fairness(groups, sample_sizes, counts)
+    
+    report_progress(progress, 'fairness_metrics', len(df), len(df))
+    return results
+
+
+CONFUSION_CELLS = ('tn', 'fp', 'fn', 'tp')
+
+
+def encode_confusion_cells(y_true, y_pred):
+    """
+    Encodes binary outcomes as confusion-matrix cell indices
+    
+    Parameters:
+    -----------
+    y_true : array-like
+        Actual outcomes
+    y_pred : array-like
+        Predicted outcomes
         
-        # Get unique values in sensitive attribute
-        unique_attrs = df[attr].unique()
+    Returns:
+    --------
+    numpy.ndarray or None
+        Cell index per row (2*y_true + y_pred, i.e. 0=TN, 1=FP, 2=FN, 3=TP),
+        or None if the outcomes do not contain exactly two labels
+    """
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    
+    try:
+        # Sorted label set, so the positive label matches sklearn's convention
+        labels = np.union1d(pd.unique(y_true), pd.unique(y_pred))
+    except TypeError:
+        return None
+    
+    if len(labels) != 2:
+        return None
+    
+    positive = labels[1]
+    return 2 * (y_true == positive).astype(np.int64) + (y_pred == positive)
+
+
+def confusion_counts_by_group(attr_values, outcome_cells):
+    """
+    Counts TN/FP/FN/TP for every group of a sensitive attribute in one pass
+    
+    Parameters:
+    -----------
+    attr_values : pandas.Series
+        Values of the sensitive attribute
+    outcome_cells : numpy.ndarray or None
+        Confusion cell index per row from encode_confusion_cells
         
-        # Calculate metrics for each group
-        group_metrics = {}
-        for attr_value in unique_attrs:
-            subset = df[df[attr] == attr_value]
+    Returns:
+    --------
+    tuple
+        (groups, sample_sizes, counts) where counts has shape (n_groups, 4)
+        ordered as CONFUSION_CELLS, or None if outcome_cells is None
+    """
+    codes, uniques = pd.factorize(attr_values, sort=False)
+    groups = uniques.tolist()
+    n_groups = len(groups)
+    
+    # Rows with a missing attribute value have code -1 and belong to no group
+    valid = codes >= 0
+    if not valid.all():
+        codes = codes[valid]
+        if outcome_cells is not None:
+            outcome_cells = outcome_cells[valid]
+    
+    if outcome_cells is None:
+        return groups, np.bincount(codes, minlength=n_groups), None
+    
+    counts = np.bincount(
+        codes * 4 + outcome_cells, minlength=n_groups * 4
+    ).reshape(n_groups, 4)
+    
+    return groups, counts.sum(axis=1), counts
+
+
+def rates_from_confusion_counts(counts):
+    """
+    Derives per-group classification rates from confusion counts
+    
+    Parameters:
+    -----------
+    counts : numpy.ndarray
+        Array of shape (n_groups, 4) ordered as CONFUSION_CELLS
+        
+    Returns:
+    --------
+    dict
+        Metric name mapped to an array with one value per group
+    """
+    tn, fp, fn, tp = counts.astype(float).T
+    
+    def ratio(numerator, denominator):
+        # Zero where the denominator is empty, matching the per-group convention
+        return np.divide(numerator, denominator,
+                         out=np.zeros_like(numerator), where=denominator > 0)
+    
+    return {
+        'true_positive_rate': ratio(tp, tp + fn),
+        'false_positive_rate': ratio(fp, fp + tn),
+        'true_negative_rate': ratio(tn, tn + fp),
+        'false_negative_rate': ratio(fn, fn + tp),
+        'positive_predictive_value': ratio(tp, tp + fp),
+        'accuracy': ratio(tp + tn, tp + tn + fp + fn)
+    }
+
+
+def summarize_distribution(distribution):
+    """
+    Summarizes the distribution of a sensitive attribute
+    
+    Parameters:
+    -----------
+    distribution : dict
+        Share of rows per attribute value
+        
+    Returns:
+    --------
+    dict
+        Distribution with entropy, number of values and imbalance assessment
+    """
+    summary = {
+        'distribution': distribution,
+        'entropy': stats.entropy(list(distribution.values())),
+        'unique_values': len(distribution)
+    }
+    
+    # Add assessment
+    if max(distribution.values()) > 0.8:
+        summary['assessment'] = "Highly imbalanced"
+    elif max(distribution.values()) > 0.6:
+        summary['assessment'] = "Moderately imbalanced"
+    else:
+        summary['assessment'] = "Relatively balanced"
+    
+    return summary
+
+
+def summarize_parity(positive_rates):
+    """
+    Summarizes statistical parity from per-group positive rates
+    
+    Parameters:
+    -----------
+    positive_rates : dict
+        Positive outcome rate per attribute value
+        
+    Returns:
+    --------
+    dict
+        Dictionary containing statistical parity results
+    """
+    results = {}
+    
+    # Calculate parity difference (max difference between groups)
+    max_rate = max(positive_rates.values())
+    min_rate = min(positive_rates.values())
+    parity_difference = max_rate - min_rate
+    
+    results['positive_rates'] = positive_rates
+    results['parity_difference'] = parity_difference
+    
+    # Assess parity
+    if parity_difference <= 0.05:
+        results['assessment'] = "Good statistical parity"
+    elif parity_difference <= 0.1:
+        results['assessment'] = "Moderate statistical parity"
+    else:
+        results['assessment'] = "Poor statistical parity"
+    
+    return results
+
+
+def add_overall_assessment(results, sensitive_attributes):
+    """
+    Adds the overall bias risk assessment for each sensitive attribute
+    
+    Parameters:
+    -----------
+    results : dict
+        Bias detection results, updated in place
+    sensitive_attributes : list
+        Sensitive attributes present in the dataset
+    """
+    for attr in sensitive_attributes:
+        # Check for potential bias
+        bias_indicators = []
+        
+        # Imbalanced distribution
+        if attr in results['attribute_distribution'] and 'assessment' in results['attribute_distribution'][attr]:
+            if results['attribute_distribution'][attr]['assessment'] in ["Highly imbalanced", "Moderately imbalanced"]:
+                bias_indicators.append("Imbalanced distribution")
+        
+        # Correlation with target
+        if attr in results['correlation_with_sensitive']:
+            if 'significant' in results['correlation_with_sensitive'][attr] and results['correlation_with_sensitive'][attr]['significant']:
+                bias_indicators.append("Significant correlation with target")
+        
+        # Statistical parity difference
+        if attr in results['statistical_parity'] and 'parity_difference' in results['statistical_parity'][attr]:
+            if abs(results['statistical_parity'][attr]['parity_difference']) > 0.1:
+                bias_indicators.append("Statistical parity difference exceeds 0.1")
+        
+        # Set overall assessment
+        if len(bias_indicators) >= 2:
+            risk_level = "High risk of bias"
+        elif len(bias_indicators) == 1:
+            risk_level = "Medium risk of bias"
+        else:
+            risk_level = "Low risk of bias"
             
-            # Skip if too few samples
-            if len(subset) < 10:
-                group_metrics[attr_value] = {
-                    'error': 'Too few samples'
-                }
-                continue
+        results['overall_assessment'][attr] = {
+            'risk_level': risk_level,
+            'bias_indicators': bias_indicators
+        }
+
+
+def summarize_group_fairness(groups, sample_sizes, counts):
+    """
+    Builds per-group fairness metrics and disparities for one sensitive attribute
+    
+    Parameters:
+    -----------
+    groups : list
+        Attribute values
+    sample_sizes : numpy.ndarray
+        Rows per group
+    counts : numpy.ndarray or None
+        Confusion counts per group ordered as CONFUSION_CELLS, or None if the
+        outcomes are not binary
+        
+    Returns:
+    --------
+    dict
+        Group metrics, disparities and fairness assessment
+    """
+    attr_results = {}
+    rates = rates_from_confusion_counts(counts) if counts is not None else None
+    
+    # Calculate metrics for each group
+    group_metrics = {}
+    for i, attr_value in enumerate(groups):
+        # Skip if too few samples
+        if sample_sizes[i] < 10:
+            group_metrics[attr_value] = {
+                'error': 'Too few samples'
+            }
+            continue
+        
+        if rates is None:
+            group_metrics[attr_value] = {
+                'error': 'Could not calculate metrics'
+            }
+            continue
+        
+        group_metrics[attr_value] = {
+            'sample_size': int(sample_sizes[i]),
+            **{metric: float(values[i]) for metric, values in rates.items()}
+        }
+    
+    attr_results['group_metrics'] = group_metrics
+    
+    # Calculate disparities
+    if len(group_metrics) >= 2:
+        # Calculate disparities for each metric
+        disparities = {
+            'true_positive_rate': [],
+            'false_positive_rate': [],
+            'accuracy': []
+        }
+        
+        valid_groups = [g for g in group_metrics if 'error' not in group_metrics[g]]
+        
+        if len(valid_groups) >= 2:
+            for metric in disparities:
+                values = [group_metrics[g][metric] for g in valid_groups]
+                max_disparity = max(values) - min(values)
+                disparities[metric] = max_disparity
             
-            # Calculate confusion matrix
-            y_true = subset[target_column]
-            y_pred = subset[prediction_column]
+            attr_results['disparities'] = disparities
             
-            try:
-                tn, fp, fn, tp = confusion_matrix(y_true, y_pred).ravel()
-                
-                # Calculate metrics
-                group_metrics[attr_value] = {
-                    'sample_size': len(subset),
-                    'true_positive_rate': tp / (tp + fn) if (tp + fn) > 0 else 0,
-                    'false_positive_rate': fp / (fp + tn) if (fp + tn) > 0 else 0,
-                    'true_negative_rate': tn / (tn + fp) if (tn + fp) > 0 else 0,
-                    'false_negative_rate': fn / (fn + tp) if (fn + tp) > 0 else 0,
-                    'positive_predictive_value': tp / (tp + fp) if (tp + fp) > 0 else 0,
-                    'accuracy': (tp + tn) / (tp + tn + fp + fn)
-                }
-            except:
-                group_metrics[attr_value] = {
-                    'error': 'Could not calculate metrics'
-                }
-        
-        attr_results['group_metrics'] = group_metrics
-        
-        # Calculate disparities
-        if len(group_metrics) >= 2:
-            # Calculate disparities for each metric
-            disparities = {
-                'true_positive_rate': [],
-                'false_positive_rate': [],
-                'accuracy': []
+            # Overall fairness assessment
+            tpr_disparity = disparities['true_positive_rate']
+            fpr_disparity = disparities['false_positive_rate']
+            
+            if tpr_disparity <= 0.1 and fpr_disparity <= 0.1:
+                fairness_assessment = "Good fairness"
+            elif tpr_disparity <= 0.2 and fpr_disparity <= 0.2:
+                fairness_assessment = "Moderate fairness"
+            else:
+                fairness_assessment = "Poor fairness"
+            
+            attr_results['fairness_assessment'] = fairness_assessment
+    
+    return attr_results
+
+
+def pearson_from_group_moments(x, counts, sums, sum_sqs):
+    """
+    Pearson correlation between a grouped variable and the target from per-group moments
+    
+    Parameters:
+    -----------
+    x : numpy.ndarray
+        Numeric value of each group
+    counts, sums, sum_sqs : numpy.ndarray
+        Count, sum and sum of squares of the target within each group
+        
+    Returns:
+    --------
+    tuple
+        (correlation, p_value) with the same two-sided p-value as scipy.stats.pearsonr
+    """
+    n = counts.sum()
+    if n < 2:
+        raise ValueError("x and y must have length at least 2")
+    
+    mean_x = np.dot(counts, x) / n
+    mean_y = sums.sum() / n
+    dx = x - mean_x
+    
+    # Within-group plus between-group variation keeps the target variance stable
+    group_means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    sxx = np.dot(counts, dx * dx)
+    syy = (sum_sqs - sums * group_means).sum() + np.dot(counts, (group_means - mean_y) ** 2)
+    sxy = np.dot(dx, sums)
+    
+    if sxx <= 0 or syy <= 0:
+        # Constant input, scipy returns NaN as well
+        return float('nan'), float('nan')
+    
+    r = float(np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0))
+    if n == 2:
+        return r, 1.0
+    
+    ab = n / 2 - 1
+    p = float(2 * stats.beta.cdf(-abs(r), ab, ab, loc=-1, scale=2))
+    return r, p
+
+
+def resolve_n_jobs(n_jobs=None):
+    """Worker count for per-attribute analysis; 0 means one per CPU"""
+    if n_jobs is None:
+        n_jobs = settings.BIAS_ANALYSIS_WORKERS
+    return n_jobs
+
+
+def accumulate_stats(df, sensitive_attributes, target_column=None, prediction_column=None,
+                     n_jobs=None, backend=None, progress=None):
+    """
+    Builds the per-group counts for a DataFrame, serially or across a worker pool
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        The dataset to analyze
+    sensitive_attributes : list
+        List of column names that contain sensitive attributes
+    target_column : str, optional
+        Actual outcome column
+    prediction_column : str, optional
+        Predicted outcome column
+    n_jobs : int, optional
+        Workers used across sensitive attributes (defaults to BIAS_ANALYSIS_WORKERS)
+    backend : str, optional
+        'thread' or 'process' pool (defaults to BIAS_ANALYSIS_BACKEND)
+    progress : callable, optional
+        Progress hook called with the stage name and rows processed (see dashboard.progress)
+        
+    Returns:
+    --------
+    FairnessStatsAccumulator
+        Counts for the dataset
+    """
+    report_progress(progress, 'group_statistics', 0, len(df))
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_jobs == 1:
+        accumulator = FairnessStatsAccumulator.from_dataframe(df, sensitive_attributes, target_column, prediction_column)
+    else:
+        backend = backend or settings.BIAS_ANALYSIS_BACKEND
+        accumulator = accumulate_parallel(df, sensitive_attributes, target_column, prediction_column,
+                                          n_jobs=n_jobs or None, backend=backend)
+    report_progress(progress, 'group_statistics', len(df), len(df))
+    return accumulator
+
+
+def detect_bias_from_stats(accumulator, sensitive_attributes):
+    """
+    Derives bias detection results from accumulated per-group counts
+    
+    Parameters:
+    -----------
+    accumulator : FairnessStatsAccumulator
+        Counts for the dataset
+    sensitive_attributes : list
+        List of column names that contain sensitive attributes
+        
+    Returns:
+    --------
+    dict
+        Dictionary containing bias detection results, in the same format as detect_bias_in_data
+    """
+    results = {
+        'dataset_size': accumulator.row_count,
+        'attribute_distribution': {},
+        'correlation_with_sensitive': {},
+        'statistical_parity': {},
+        'overall_assessment': {}
+    }
+    
+    present = accumulator.columns or []
+    available = [attr for attr in sensitive_attributes if attr in present]
+    
+    # Check distribution of sensitive attributes
+    for attr in sensitive_attributes:
+        if attr not in present:
+            results['attribute_distribution'][attr] = {
+                'error': f"Column {attr} not found in dataset"
             }
+            continue
+        
+        results['attribute_distribution'][attr] = summarize_distribution(accumulator.distribution(attr))
+    
+    # If target column provided, check for correlation with sensitive attributes
+    if accumulator.has_target:
+        for attr in available:
+            # For categorical target, check chi-square
+            if accumulator.target_is_categorical:
+                try:
+                    chi2, p, _, _ = stats.chi2_contingency(accumulator.contingency_table(attr))
+                    correlation = {
+                        'method': 'chi_square',
+                        'chi2': chi2,
+                        'p_value': p,
+                        'significant': p < 0.05
+                    }
+                except Exception:
+                    correlation = {
+                        'method': 'chi_square',
+                        'error': 'Could not calculate chi-square'
+                    }
+            # For numerical target, check correlation
+            else:
+                try:
+                    corr, p = pearson_from_group_moments(*accumulator.group_moments(attr))
+                    correlation = {
+                        'method': 'pearson',
+                        'correlation': corr,
+                        'p_value': p,
+                        'significant': p < 0.05
+                    }
+                except Exception:
+                    correlation = {
+                        'method': 'pearson',
+                        'error': 'Could not calculate correlation'
+                    }
             
-            valid_groups = [g for g in group_metrics if 'error' not in group_metrics[g]]
+            results['correlation_with_sensitive'][attr] = correlation
             
-            if len(valid_groups) >= 2:
-                for metric in disparities:
-                    values = [group_metrics[g][metric] for g in valid_groups]
-                    max_disparity = max(values) - min(values)
-                    disparities[metric] = max_disparity
-                
-                attr_results['disparities'] = disparities
-                
-                # Overall fairness assessment
-                tpr_disparity = disparities['true_positive_rate']
-                fpr_disparity = disparities['false_positive_rate']
-                
-                if tpr_disparity <= 0.1 and fpr_disparity <= 0.1:
-                    fairness_assessment = "Good fairness"
-                elif tpr_disparity <= 0.2 and fpr_disparity <= 0.2:
-                    fairness_assessment = "Moderate fairness"
-                else:
-                    fairness_assessment = "Poor fairness"
-                
-                attr_results['fairness_assessment'] = fairness_assessment
+            # Calculate statistical parity if binary target
+            if accumulator.target_unique_count() == 2:
+                try:
+                    results['statistical_parity'][attr] = summarize_parity(accumulator.positive_rates(attr))
+                except Exception as e:
+                    results['statistical_parity'][attr] = {
+                        'error': str(e)
+                    }
+    
+    # Overall assessment
+    add_overall_assessment(results, available)
+    
+    return results
+
+
+def calculate_fairness_metrics_from_stats(accumulator, sensitive_attributes):
+    """
+    Derives fairness metrics from accumulated per-group counts
+    
+    Parameters:
+    -----------
+    accumulator : FairnessStatsAccumulator
+        Counts for the dataset
+    sensitive_attributes : list
+        List of column names that contain sensitive attributes
+        
+    Returns:
+    --------
+    dict
+        Dictionary containing fairness metrics, in the same format as calculate_fairness_metrics
+    """
+    results = {
+        'metrics_by_attribute': {}
+    }
+    
+    present = accumulator.columns or []
+    available = [attr for attr in sensitive_attributes if attr in present]
+    
+    # If no prediction column, we can only do limited analysis
+    if accumulator.target_column is None or accumulator.prediction_column is None:
+        for attr in available:
+            results['metrics_by_attribute'][attr] = {
+                'note': 'Limited analysis - prediction or target column not provided',
+                'distribution': accumulator.distribution(attr)
+            }
         
-        results['metrics_by_attribute'][attr] = attr_results
+        return results
+    
+    for column in (accumulator.target_column, accumulator.prediction_column):
+        if column not in present:
+            raise KeyError(column)
+    
+    for attr in available:
+        groups, sample_sizes, counts = accumulator.confusion_counts(attr)
+        results['metrics_by_attribute'][attr] = summarize_group_fairness(groups, sample_sizes, counts)
     
     return results
+
+
+def detect_bias_in_csv(csv_file, sensitive_attributes, target_column=None, sample_dataset_type=None,
+                       chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """
+    Streaming variant of detect_bias_in_data that reads a CSV file in chunks
+    
+    Memory is bounded by the number of groups rather than the number of rows.
+    
+    Parameters:
+    -----------
+    csv_file : str or file-like
+        Path or open file containing the CSV data
+    sensitive_attributes : list
+        List of column names that contain sensitive attributes
+    target_column : str, optional
+        Target/outcome column if available
+    sample_dataset_type : str, optional
+        Type of dataset being analyzed (e.g., 'hiring_dataset', 'loan_approval')
+    chunksize : int
+        Number of rows read per chunk
+    progress : callable, optional
+        Progress hook called after every chunk (see dashboard.progress)
+        
+    Returns:
+    --------
+    dict
+        Dictionary containing bias detection results
+    """
+    accumulator = FairnessStatsAccumulator.from_csv(
+        csv_file, sensitive_attributes, target_column, chunksize=chunksize, progress=progress
+    )
+    report_progress(progress, 'bias_tests', accumulator.row_count, accumulator.row_count)
+    return detect_bias_from_stats(accumulator, sensitive_attributes)
+
+
+def calculate_fairness_metrics_from_csv(csv_file, sensitive_attributes, target_column=None,
+                                        prediction_column=None, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """
+    Streaming variant of calculate_fairness_metrics that reads a CSV file in chunks
+    
+    Parameters:
+    -----------
+    csv_file : str or file-like
+        Path or open file containing the CSV data
+    sensitive_attributes : list
+        List of column names that contain sensitive attributes
+    target_column : str, optional
+        Actual outcome column
+    prediction_column : str, optional
+        Predicted outcome column
+    chunksize : int
+        Number of rows read per chunk
+    progress : callable, optional
+        Progress hook called after every chunk (see dashboard.progress)
+        
+    Returns:
+    --------
+    dict
+        Dictionary containing fairness metrics
+    """
+    accumulator = FairnessStatsAccumulator.from_csv(
+        csv_file, sensitive_attributes, target_column, prediction_column, chunksize=chunksize,
+        progress=progress
+    )
+    return calculate_fairness_metrics_from_stats(accumulator, sensitive_attributes)
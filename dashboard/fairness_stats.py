@@ -0,0 +1,595 @@
+"""
+Mergeable per-group counters for bias and fairness statistics
+Lets large datasets be analyzed chunk by chunk, or shard by shard across
+processes and machines, with memory bounded by the number of groups
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+
+import numpy as np
+import pandas as pd
+
+from .progress import report_progress
+
+# Rows per chunk when streaming a CSV file
+DEFAULT_CHUNKSIZE = 100000
+
+# Beyond this many distinct target values the target is treated as continuous
+# and no contingency tables are kept
+MAX_TARGET_LEVELS = 1000
+
+
+class FairnessStatsAccumulator:
+    """
+    Per-group counters from which bias and fairness statistics are derived
+
+    Keeps, for every sensitive attribute:
+    - value counts per group
+    - count, sum and sum of squares of a numeric target per group
+    - a contingency table of group against target value
+    - confusion counts of target against prediction per group
+
+    Accumulators built on separate shards combine with merge(), and
+    to_dict()/from_dict() convert them to and from plain JSON-safe data
+    so partial results can be shipped between processes or machines.
+    """
+
+    def __init__(self, sensitive_attributes, target_column=None, prediction_column=None):
+        self.sensitive_attributes = list(dict.fromkeys(sensitive_attributes))
+        self.target_column = target_column
+        self.prediction_column = prediction_column
+
+        self.row_count = 0
+        self.columns = None
+
+        self.value_counts = {attr: {} for attr in self.sensitive_attributes}
+        self.target_moments = {attr: {} for attr in self.sensitive_attributes}
+        self.contingency = {attr: {} for attr in self.sensitive_attributes}
+        self.confusion = {attr: {} for attr in self.sensitive_attributes}
+
+        self.target_levels = {}
+        self.target_missing = 0
+        self.target_is_categorical = False
+
+        self.outcome_labels = set()
+        self.outcome_missing = False
+
+    @classmethod
+    def from_dataframe(cls, df, sensitive_attributes, target_column=None, prediction_column=None):
+        """
+        Builds an accumulator from an in-memory DataFrame
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            The dataset
+        sensitive_attributes : list
+            List of column names that contain sensitive attributes
+        target_column : str, optional
+            Actual outcome column
+        prediction_column : str, optional
+            Predicted outcome column
+
+        Returns:
+        --------
+        FairnessStatsAccumulator
+            Accumulator holding the counts for the DataFrame
+        """
+        accumulator = cls(sensitive_attributes, target_column, prediction_column)
+        accumulator.update(df)
+        return accumulator
+
+    @classmethod
+    def from_csv(cls, csv_file, sensitive_attributes, target_column=None, prediction_column=None,
+                 chunksize=DEFAULT_CHUNKSIZE, progress=None):
+        """
+        Builds an accumulator by reading a CSV file in chunks
+
+        Parameters:
+        -----------
+        csv_file : str or file-like
+            Path or open file containing the CSV data
+        sensitive_attributes : list
+            List of column names that contain sensitive attributes
+        target_column : str, optional
+            Actual outcome column
+        prediction_column : str, optional
+            Predicted outcome column
+        chunksize : int
+            Number of rows read per chunk
+        progress : callable, optional
+            Progress hook called with the rows read after every chunk
+
+        Returns:
+        --------
+        FairnessStatsAccumulator
+            Accumulator holding the counts for the whole file
+        """
+        accumulator = cls(sensitive_attributes, target_column, prediction_column)
+
+        # Only the columns the statistics need are parsed
+        needed = set(accumulator.sensitive_attributes)
+        needed.update(col for col in (target_column, prediction_column) if col)
+
+        reader = pd.read_csv(csv_file, chunksize=chunksize, usecols=lambda col: col in needed)
+        for chunk in reader:
+            accumulator.update(chunk)
+            report_progress(progress, 'reading_csv', accumulator.row_count)
+
+        return accumulator
+
+    @property
+    def available_attributes(self):
+        """Sensitive attributes present in the data"""
+        columns = self.columns or []
+        return [attr for attr in self.sensitive_attributes if attr in columns]
+
+    @property
+    def has_target(self):
+        return bool(self.target_column) and self.target_column in (self.columns or [])
+
+    @property
+    def has_outcomes(self):
+        return self.has_target and bool(self.prediction_column) and self.prediction_column in self.columns
+
+    def update(self, chunk):
+        """
+        Adds the counts of a DataFrame chunk
+
+        Parameters:
+        -----------
+        chunk : pandas.DataFrame
+            Rows to add
+        """
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+
+        self.row_count += len(chunk)
+        attrs = self.available_attributes
+
+        for attr in attrs:
+            _add_counts(self.value_counts[attr], chunk[attr].value_counts(sort=False))
+
+        if self.has_target:
+            self._update_target(chunk, attrs)
+
+        if self.has_outcomes:
+            self._update_confusion(chunk, attrs)
+
+    def _update_target(self, chunk, attrs):
+        target = chunk[self.target_column]
+
+        if target.dtype == 'object' or target.dtype == 'category':
+            self.target_is_categorical = True
+
+        self.target_missing += int(target.isna().sum())
+
+        if self.target_levels is not None:
+            levels = target.value_counts(sort=False)
+            if len(levels) <= MAX_TARGET_LEVELS:
+                _add_counts(self.target_levels, levels)
+            if len(levels) > MAX_TARGET_LEVELS or len(self.target_levels) > MAX_TARGET_LEVELS:
+                self._drop_target_levels()
+
+        moments = None
+        if target.dtype.kind in 'biuf':
+            y = target.astype(float)
+            moments = pd.DataFrame({
+                'count': y.notna().astype(np.int64),
+                'sum': y,
+                'sum_sq': y * y
+            })
+
+        for attr in attrs:
+            if self.contingency is not None:
+                _add_counts(
+                    self.contingency[attr],
+                    chunk.groupby([attr, self.target_column], sort=False, observed=True).size()
+                )
+
+            if moments is not None:
+                _add_moments(
+                    self.target_moments[attr],
+                    moments.groupby(chunk[attr], sort=False, observed=True).sum()
+                )
+
+    def _update_confusion(self, chunk, attrs):
+        if self.confusion is None:
+            return
+
+        y_true = chunk[self.target_column]
+        y_pred = chunk[self.prediction_column]
+
+        self.outcome_missing = self.outcome_missing or bool(y_true.isna().any() or y_pred.isna().any())
+        self.outcome_labels.update(y_true.dropna().unique().tolist())
+        self.outcome_labels.update(y_pred.dropna().unique().tolist())
+
+        if self.outcome_label_count() > 2:
+            # Confusion rates are only defined for binary outcomes
+            self.confusion = None
+            return
+
+        for attr in attrs:
+            _add_counts(
+                self.confusion[attr],
+                chunk.groupby([attr, self.target_column, self.prediction_column],
+                              sort=False, observed=True).size()
+            )
+
+    def _drop_target_levels(self):
+        # Continuous target: contingency tables would grow with the rows
+        self.target_levels = None
+        self.contingency = None
+
+    def merge(self, other):
+        """
+        Combines the counts of two accumulators
+
+        Merging is associative, so partial results from any number of shards
+        can be combined in any grouping. Shards should be merged in data order
+        for ties in value counts to keep their order of first appearance.
+
+        Parameters:
+        -----------
+        other : FairnessStatsAccumulator
+            Accumulator built with the same attributes and columns
+
+        Returns:
+        --------
+        FairnessStatsAccumulator
+            New accumulator holding the counts of both
+        """
+        if (self.sensitive_attributes != other.sensitive_attributes
+                or self.target_column != other.target_column
+                or self.prediction_column != other.prediction_column):
+            raise ValueError("Cannot merge accumulators built for different attributes or columns")
+
+        merged = FairnessStatsAccumulator.from_dict(self.to_dict())
+
+        if other.columns is not None:
+            columns = merged.columns or []
+            merged.columns = columns + [col for col in other.columns if col not in columns]
+
+        merged.row_count += other.row_count
+        merged.target_missing += other.target_missing
+        merged.target_is_categorical = merged.target_is_categorical or other.target_is_categorical
+        merged.outcome_labels |= other.outcome_labels
+        merged.outcome_missing = merged.outcome_missing or other.outcome_missing
+
+        for attr in merged.sensitive_attributes:
+            _merge_counts(merged.value_counts[attr], other.value_counts[attr])
+            for group, moments in other.target_moments[attr].items():
+                if group in merged.target_moments[attr]:
+                    merged.target_moments[attr][group] = [
+                        a + b for a, b in zip(merged.target_moments[attr][group], moments)
+                    ]
+                else:
+                    merged.target_moments[attr][group] = list(moments)
+
+        if merged.target_levels is None or other.target_levels is None:
+            merged._drop_target_levels()
+        else:
+            _merge_counts(merged.target_levels, other.target_levels)
+            if len(merged.target_levels) > MAX_TARGET_LEVELS:
+                merged._drop_target_levels()
+            else:
+                for attr in merged.sensitive_attributes:
+                    _merge_counts(merged.contingency[attr], other.contingency[attr])
+
+        if merged.confusion is None or other.confusion is None or merged.outcome_label_count() > 2:
+            merged.confusion = None
+        else:
+            for attr in merged.sensitive_attributes:
+                _merge_counts(merged.confusion[attr], other.confusion[attr])
+
+        return merged
+
+    def to_dict(self):
+        """
+        Converts the accumulator to JSON-safe data
+
+        Group keys may be numbers or tuples, so every counter is stored as a
+        list of [key, value] pairs.
+
+        Returns:
+        --------
+        dict
+            Serializable representation accepted by from_dict()
+        """
+        def pairs(counter):
+            return [[list(key) if isinstance(key, tuple) else key, value]
+                    for key, value in counter.items()]
+
+        def per_attr(counters):
+            if counters is None:
+                return None
+            return {attr: pairs(counter) for attr, counter in counters.items()}
+
+        return {
+            'sensitive_attributes': list(self.sensitive_attributes),
+            'target_column': self.target_column,
+            'prediction_column': self.prediction_column,
+            'row_count': self.row_count,
+            'columns': list(self.columns) if self.columns is not None else None,
+            'value_counts': per_attr(self.value_counts),
+            'target_moments': per_attr(self.target_moments),
+            'contingency': per_attr(self.contingency),
+            'confusion': per_attr(self.confusion),
+            'target_levels': pairs(self.target_levels) if self.target_levels is not None else None,
+            'target_missing': self.target_missing,
+            'target_is_categorical': self.target_is_categorical,
+            'outcome_labels': sorted(self.outcome_labels, key=repr),
+            'outcome_missing': self.outcome_missing
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds an accumulator from the output of to_dict()
+
+        Parameters:
+        -----------
+        data : dict
+            Serialized accumulator
+
+        Returns:
+        --------
+        FairnessStatsAccumulator
+            The restored accumulator
+        """
+        def counter(items, tuple_keys=False):
+            return {tuple(key) if tuple_keys else key: list(value) if isinstance(value, list) else value
+                    for key, value in items}
+
+        def per_attr(counters, tuple_keys=False):
+            if counters is None:
+                return None
+            return {attr: counter(items, tuple_keys) for attr, items in counters.items()}
+
+        accumulator = cls(data['sensitive_attributes'], data['target_column'], data['prediction_column'])
+        accumulator.row_count = data['row_count']
+        accumulator.columns = list(data['columns']) if data['columns'] is not None else None
+        accumulator.value_counts = per_attr(data['value_counts'])
+        accumulator.target_moments = per_attr(data['target_moments'])
+        accumulator.contingency = per_attr(data['contingency'], tuple_keys=True)
+        accumulator.confusion = per_attr(data['confusion'], tuple_keys=True)
+        accumulator.target_levels = counter(data['target_levels']) if data['target_levels'] is not None else None
+        accumulator.target_missing = data['target_missing']
+        accumulator.target_is_categorical = data['target_is_categorical']
+        accumulator.outcome_labels = set(data['outcome_labels'])
+        accumulator.outcome_missing = data['outcome_missing']
+        return accumulator
+
+    def target_unique_count(self):
+        """Number of distinct target values, counting missing values as one"""
+        if self.target_levels is None:
+            return MAX_TARGET_LEVELS + 1
+        return len(self.target_levels) + (1 if self.target_missing else 0)
+
+    def outcome_label_count(self):
+        """Number of distinct labels across target and prediction, counting missing values as one"""
+        return len(self.outcome_labels) + (1 if self.outcome_missing else 0)
+
+    def group_sizes(self, attr):
+        """Rows per group in order of first appearance"""
+        return dict(self.value_counts[attr])
+
+    def distribution(self, attr):
+        """
+        Share of rows per group, ordered like Series.value_counts(normalize=True)
+        """
+        counts = self.value_counts[attr]
+        total = sum(counts.values())
+
+        # sorted() is stable, so ties keep their order of first appearance
+        ordered = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        return {value: count / total for value, count in ordered}
+
+    def contingency_table(self, attr):
+        """
+        Contingency table of group against target value, ordered like pandas.crosstab
+
+        Returns:
+        --------
+        numpy.ndarray
+            Counts with one row per group and one column per target value
+        """
+        if self.contingency is None:
+            raise ValueError("Target has too many distinct values for a contingency table")
+
+        cells = self.contingency[attr]
+        rows = sorted({group for group, _ in cells})
+        cols = sorted({level for _, level in cells})
+        row_index = {group: i for i, group in enumerate(rows)}
+        col_index = {level: j for j, level in enumerate(cols)}
+
+        table = np.zeros((len(rows), len(cols)), dtype=np.int64)
+        for (group, level), count in cells.items():
+            table[row_index[group], col_index[level]] += count
+
+        return table
+
+    def group_moments(self, attr):
+        """
+        Numeric group values with per-group target moments
+
+        Non-numeric group values are label encoded by sorted rank, like LabelEncoder
+
+        Returns:
+        --------
+        tuple
+            (x, counts, sums, sum_sqs) arrays with one entry per group
+        """
+        moments = self.target_moments[attr]
+        groups = list(moments)
+
+        if all(isinstance(group, (int, float, np.number)) for group in groups):
+            x = np.array(groups, dtype=float)
+        else:
+            ranks = {value: i for i, value in enumerate(sorted(self.value_counts[attr]))}
+            x = np.array([ranks[group] for group in groups], dtype=float)
+
+        values = np.array(list(moments.values()), dtype=float).reshape(-1, 3)
+        return x, values[:, 0], values[:, 1], values[:, 2]
+
+    def positive_rates(self, attr):
+        """
+        Mean target value per group, ordered like DataFrame.groupby(sort=False)
+        """
+        if self.target_is_categorical or not self.target_moments[attr]:
+            raise TypeError(f"Target column {self.target_column} must be numeric to compute positive rates")
+
+        moments = self.target_moments[attr]
+        return {
+            group: moments[group][1] / moments[group][0] if moments[group][0] else float('nan')
+            for group in self.value_counts[attr] if group in moments
+        }
+
+    def confusion_counts(self, attr):
+        """
+        Confusion counts per group
+
+        Returns:
+        --------
+        tuple
+            (groups, sample_sizes, counts) where counts has shape (n_groups, 4)
+            ordered TN, FP, FN, TP, or None if the outcomes are not binary
+        """
+        sizes = self.value_counts[attr]
+        groups = list(sizes)
+        sample_sizes = np.array([sizes[group] for group in groups], dtype=np.int64)
+
+        if self.confusion is None or self.outcome_label_count() != 2:
+            return groups, sample_sizes, None
+
+        # Sorted labels, so the positive label matches sklearn's convention
+        positive = sorted(self.outcome_labels)[1]
+        group_index = {group: i for i, group in enumerate(groups)}
+
+        counts = np.zeros((len(groups), 4), dtype=np.int64)
+        for (group, y_true, y_pred), count in self.confusion[attr].items():
+            counts[group_index[group], 2 * (y_true == positive) + (y_pred == positive)] += count
+
+        return groups, sample_sizes, counts
+
+
+def merge_accumulators(accumulators):
+    """
+    Merges partial accumulators in order
+
+    Parameters:
+    -----------
+    accumulators : iterable
+        FairnessStatsAccumulator instances, in data order
+
+    Returns:
+    --------
+    FairnessStatsAccumulator
+        Accumulator holding the counts of all parts
+    """
+    return reduce(FairnessStatsAccumulator.merge, accumulators)
+
+
+def combine_attribute_accumulators(parts, sensitive_attributes, columns):
+    """
+    Joins accumulators built on the same rows for disjoint sets of attributes
+
+    Parameters:
+    -----------
+    parts : list
+        FairnessStatsAccumulator instances sharing rows, target and prediction columns
+    sensitive_attributes : list
+        All sensitive attributes, in result order
+    columns : list
+        Columns of the underlying dataset
+
+    Returns:
+    --------
+    FairnessStatsAccumulator
+        Accumulator equivalent to one built for every attribute at once
+    """
+    first = parts[0]
+    combined = FairnessStatsAccumulator(sensitive_attributes, first.target_column, first.prediction_column)
+    combined.columns = list(columns)
+    combined.row_count = first.row_count
+
+    # Target and outcome level state only depends on the rows, so every part agrees
+    combined.target_levels = first.target_levels
+    combined.target_missing = first.target_missing
+    combined.target_is_categorical = first.target_is_categorical
+    combined.outcome_labels = set(first.outcome_labels)
+    combined.outcome_missing = first.outcome_missing
+    if first.contingency is None:
+        combined.contingency = None
+    if first.confusion is None:
+        combined.confusion = None
+
+    for part in parts:
+        for attr in part.sensitive_attributes:
+            combined.value_counts[attr] = part.value_counts[attr]
+            combined.target_moments[attr] = part.target_moments[attr]
+            if combined.contingency is not None:
+                combined.contingency[attr] = part.contingency[attr]
+            if combined.confusion is not None:
+                combined.confusion[attr] = part.confusion[attr]
+
+    return combined
+
+
+def accumulate_csv_shards(csv_paths, sensitive_attributes, target_column=None, prediction_column=None,
+                          max_workers=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Builds one accumulator per CSV shard in a process pool and merges them
+
+    Parameters:
+    -----------
+    csv_paths : list
+        Paths of CSV shards sharing the same header, in data order
+    sensitive_attributes : list
+        List of column names that contain sensitive attributes
+    target_column : str, optional
+        Actual outcome column
+    prediction_column : str, optional
+        Predicted outcome column
+    max_workers : int, optional
+        Number of worker processes (defaults to the number of CPUs)
+    chunksize : int
+        Number of rows read per chunk within each shard
+
+    Returns:
+    --------
+    FairnessStatsAccumulator
+        Accumulator holding the counts of all shards
+    """
+    build = partial(
+        FairnessStatsAccumulator.from_csv,
+        sensitive_attributes=sensitive_attributes,
+        target_column=target_column,
+        prediction_column=prediction_column,
+        chunksize=chunksize
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return merge_accumulators(executor.map(build, csv_paths))
+
+
+def _merge_counts(totals, counts):
+    """Adds a dict of counts into a dict of totals"""
+    for key, count in counts.items():
+        totals[key] = totals.get(key, 0) + count
+
+
+def _add_counts(totals, counts):
+    """Adds a pandas Series of counts into a dict of totals"""
+    for key, count in zip(counts.index.tolist(), counts.tolist()):
+        totals[key] = totals.get(key, 0) + count
+
+
+def _add_moments(totals, moments):
+    """Adds a DataFrame of per-group moments into a dict of [count, sum, sum_sq] totals"""
+    for key, row in zip(moments.index.tolist(), moments.to_numpy(dtype=float).tolist()):
+        if key in totals:
+            totals[key] = [a + b for a, b in zip(totals[key], row)]
+        else:
+            totals[key] = row
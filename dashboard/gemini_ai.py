@@ -3,16 +3,176 @@ Google Gemini integration for AI ethics analysis
 Provides AI-powered insights for model bias, transparency, and governance
 """
 
+import itertools
 import json
-import google.generativeai as genai
+import threading
+from google.api_core import exceptions as google_exceptions
 from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
 
-# Initialize Gemini API with key from Django settings
-GOOGLE_GEMINI_API_KEY = settings.GOOGLE_GEMINI_API_KEY
-MODEL_NAME = settings.GEMINI_MODEL_NAME
+from .ai_cache import get_default_cache, prompt_cache_key
+from .llm_backends import get_backend
+from .prompt_builder import DATASET_ETHICS_SECTIONS, build_dataset_ethics_prompt
+from .resilience import CircuitBreaker, CircuitOpenError, retry_with_backoff
+from .structured_output import SectionParser, parse_sections, response_format_instructions
 
-# Configure the Gemini API
-genai.configure(api_key=GOOGLE_GEMINI_API_KEY)
+# Prompts are answered by the backend selected with LLM_BACKEND (see llm_backends);
+# the Gemini client is only configured once a prompt is sent
+
+# Upstream errors worth retrying; anything else fails the call at once
+RETRYABLE_ERRORS = (
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.GatewayTimeout,
+    TimeoutError,
+    ConnectionError
+)
+
+# Raised while the circuit breaker skips Gemini calls
+AIUnavailableError = CircuitOpenError
+
+# Sections of each structured response (see structured_output.response_format_instructions)
+TRANSPARENCY_SECTIONS = {
+    "explainability_assessment": ("An assessment of this model's explainability", "explainability"),
+    "key_features_analysis": ("Key features driving model decisions and their ethical implications", "key features"),
+    "transparency_gaps": ("Transparency gaps that should be addressed", "transparency gaps"),
+    "improvement_recommendations": ("Recommendations for improving model explainability", "recommendations"),
+    "communication_strategies": ("Stakeholder communication strategies for explaining this model", "communication")
+}
+
+GOVERNANCE_SECTIONS = {
+    "governance_framework": ("Customized governance framework for this context", "governance framework"),
+    "documentation_requirements": ("Documentation requirements and templates", "documentation"),
+    "testing_protocols": ("Testing and validation protocols", "testing"),
+    "monitoring_procedures": ("Monitoring and audit procedures", "monitoring"),
+    "roles_responsibilities": ("Roles and responsibilities for ethical oversight", "roles")
+}
+
+FAIRNESS_SECTIONS = {
+    "metrics_interpretation": ("Interpretation of these fairness metrics in plain language", "interpretation"),
+    "disparate_impact": ("Assessment of disparate impact across sensitive groups", "disparate impact"),
+    "standards_comparison": ("Comparison to ethical and regulatory standards", "standards"),
+    "fairness_recommendations": ("Specific recommendations to improve fairness", "recommendations"),
+    "business_implications": ("Business implications of these fairness results", "implications")
+}
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker():
+    """Returns the process-wide circuit breaker guarding Gemini calls"""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                failure_threshold=settings.GEMINI_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.GEMINI_BREAKER_RESET_SECONDS,
+                name='gemini'
+            )
+        return _breaker
+
+
+@receiver(setting_changed)
+def reset_circuit_breaker(sender, setting, **kwargs):
+    """Start from a closed breaker when its settings change (e.g. in tests)"""
+    global _breaker
+    if setting.startswith('GEMINI_BREAKER_'):
+        with _breaker_lock:
+            _breaker = None
+
+
+def call_model(prompt):
+    """
+    Sends a prompt to the LLM backend and returns the response text
+    
+    Each attempt is bounded by GEMINI_REQUEST_TIMEOUT and transient errors
+    are retried up to GEMINI_MAX_RETRIES times with exponential backoff. A
+    call that still fails counts against the circuit breaker; while it is
+    open, AIUnavailableError is raised without contacting Gemini so callers
+    can return their local results straight away.
+    """
+    backend = get_backend()
+    
+    return get_circuit_breaker().call(lambda: retry_with_backoff(
+        lambda: backend.generate(prompt, timeout=settings.GEMINI_REQUEST_TIMEOUT),
+        retries=settings.GEMINI_MAX_RETRIES,
+        base_delay=settings.GEMINI_RETRY_BASE_DELAY,
+        max_delay=settings.GEMINI_RETRY_MAX_DELAY,
+        retry_on=RETRYABLE_ERRORS
+    ))
+
+
+def generate_text(prompt):
+    """
+    Returns the model's response text for a prompt
+    
+    Responses are served from the prompt cache when possible, and identical
+    prompts in flight at the same time share one upstream call.
+    """
+    cache = get_default_cache()
+    if cache is None:
+        return call_model(prompt)
+    
+    key = prompt_cache_key(get_backend().cache_namespace, prompt)
+    text, _ = cache.get_or_generate(key, lambda: call_model(prompt))
+    return text
+
+
+def stream_text(prompt):
+    """
+    Yields the model's response text for a prompt in pieces as it is generated
+    
+    A cached response is yielded whole, and a streamed response is cached once
+    complete. Opening the stream gets the same deadline, retries and circuit
+    breaker as call_model; once text has arrived a failure is not retried.
+    """
+    backend = get_backend()
+    cache = get_default_cache()
+    key = prompt_cache_key(backend.cache_namespace, prompt)
+    
+    if cache is not None:
+        text, tier = cache.get(key)
+        if tier is not None:
+            yield text
+            return
+    
+    breaker = get_circuit_breaker()
+    if not breaker.allow_request():
+        raise AIUnavailableError(f"{breaker.name} is unavailable; skipping the call")
+    
+    def open_stream():
+        # Pull the first piece so connection errors surface here and can be retried
+        pieces = iter(backend.stream(prompt, timeout=settings.GEMINI_REQUEST_TIMEOUT))
+        return itertools.chain([next(pieces, '')], pieces)
+    
+    received = []
+    try:
+        pieces = retry_with_backoff(
+            open_stream,
+            retries=settings.GEMINI_MAX_RETRIES,
+            base_delay=settings.GEMINI_RETRY_BASE_DELAY,
+            max_delay=settings.GEMINI_RETRY_MAX_DELAY,
+            retry_on=RETRYABLE_ERRORS
+        )
+        for piece in pieces:
+            if piece:
+                received.append(piece)
+                yield piece
+    except GeneratorExit:
+        # The client went away while the upstream was answering
+        breaker.record_success()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    
+    breaker.record_success()
+    if cache is not None:
+        cache.put(key, ''.join(received))
 
 def analyze_dataset_ethics(df_info, sensitive_attributes, sample_dataset_type=None):
     """
@@ -32,39 +192,17 @@ def analyze_dataset_ethics(df_info, sensitive_attributes, sample_dataset_type=No
     dict
         Analysis results including ethical insights
     """
-    # Prepare the prompt with dataset information
-    prompt = f"""
-    Analyze this dataset for potential ethical issues and bias:
-    
-    Dataset Info: {json.dumps(df_info, indent=2)}
-    
-    Sensitive Attributes: {', '.join(sensitive_attributes)}
-    
-    Dataset Type: {sample_dataset_type if sample_dataset_type else 'Not specified'}
-    
-    Please provide:
-    1. Potential ethical concerns in this dataset
-    2. Bias patterns that might exist related to sensitive attributes
-    3. Data representation issues (missing groups, imbalanced classes)
-    4. Recommendations for mitigating these issues
-    5. Ethical considerations for model deployment
-    
-    Format your response as a detailed ethics analysis suitable for a business audience.
-    """
+    # Prepare a compact prompt within the token budget
+    prompt, prompt_stats = build_dataset_ethics_prompt(
+        df_info, sensitive_attributes, sample_dataset_type, settings.GEMINI_PROMPT_TOKEN_BUDGET
+    )
     
     # Generate AI response
-    model = genai.GenerativeModel(MODEL_NAME)
-    response = model.generate_content(prompt)
+    response_text = generate_text(prompt)
     
     # Process and structure the response
-    analysis = {
-        "ethical_concerns": extract_section(response.text, "ethical concerns"),
-        "bias_patterns": extract_section(response.text, "bias patterns"),
-        "representation_issues": extract_section(response.text, "representation issues"),
-        "recommendations": extract_section(response.text, "recommendations"),
-        "deployment_considerations": extract_section(response.text, "deployment"),
-        "full_analysis": response.text
-    }
+    analysis = parse_sections(response_text, DATASET_ETHICS_SECTIONS, "full_analysis")
+    analysis["prompt"] = prompt_stats
     
     return analysis
 
@@ -92,31 +230,16 @@ def generate_transparency_insights(model_info, feature_importances):
     
     Feature Importances: {json.dumps(feature_importances, indent=2)}
     
-    Please provide:
-    1. An assessment of this model's explainability
-    2. Key features driving model decisions and their ethical implications
-    3. Transparency gaps that should be addressed
-    4. Recommendations for improving model explainability
-    5. Stakeholder communication strategies for explaining this model
+    Write actionable transparency insights for business stakeholders.
     
-    Format your response as actionable transparency insights for business stakeholders.
+    {response_format_instructions(TRANSPARENCY_SECTIONS)}
     """
     
     # Generate AI response
-    model = genai.GenerativeModel(MODEL_NAME)
-    response = model.generate_content(prompt)
+    response_text = generate_text(prompt)
     
     # Process and structure the response
-    insights = {
-        "explainability_assessment": extract_section(response.text, "explainability"),
-        "key_features_analysis": extract_section(response.text, "key features"),
-        "transparency_gaps": extract_section(response.text, "transparency gaps"),
-        "improvement_recommendations": extract_section(response.text, "recommendations"),
-        "communication_strategies": extract_section(response.text, "communication"),
-        "full_insights": response.text
-    }
-    
-    return insights
+    return parse_sections(response_text, TRANSPARENCY_SECTIONS, "full_insights")
 
 def create_governance_recommendations(industry, regulatory_requirements, model_risk_level):
     """
@@ -136,39 +259,37 @@ def create_governance_recommendations(industry, regulatory_requirements, model_r
     dict
         Customized governance recommendations
     """
-    # Prepare the prompt with governance information
-    prompt = f"""
+    # Generate AI response
+    response_text = generate_text(governance_prompt(industry, regulatory_requirements, model_risk_level))
+    
+    # Process and structure the response
+    return parse_sections(response_text, GOVERNANCE_SECTIONS, "full_recommendations")
+
+def stream_governance_recommendations(industry, regulatory_requirements, model_risk_level):
+    """
+    Streaming variant of create_governance_recommendations
+    
+    Yields (event, data) pairs as described in stream_sections.
+    """
+    return stream_sections(
+        governance_prompt(industry, regulatory_requirements, model_risk_level),
+        GOVERNANCE_SECTIONS,
+        "full_recommendations"
+    )
+
+def governance_prompt(industry, regulatory_requirements, model_risk_level):
+    """Prompt for customized AI governance recommendations"""
+    return f"""
     Create AI governance recommendations for:
     
     Industry: {industry}
     Regulatory Requirements: {', '.join(regulatory_requirements)}
     Model Risk Level: {model_risk_level}
     
-    Please provide:
-    1. Customized governance framework for this context
-    2. Documentation requirements and templates
-    3. Testing and validation protocols
-    4. Monitoring and audit procedures
-    5. Roles and responsibilities for ethical oversight
+    Write an actionable governance plan for business implementation.
     
-    Format your response as an actionable governance plan for business implementation.
+    {response_format_instructions(GOVERNANCE_SECTIONS)}
     """
-    
-    # Generate AI response
-    model = genai.GenerativeModel(MODEL_NAME)
-    response = model.generate_content(prompt)
-    
-    # Process and structure the response
-    recommendations = {
-        "governance_framework": extract_section(response.text, "governance framework"),
-        "documentation_requirements": extract_section(response.text, "documentation"),
-        "testing_protocols": extract_section(response.text, "testing"),
-        "monitoring_procedures": extract_section(response.text, "monitoring"),
-        "roles_responsibilities": extract_section(response.text, "roles"),
-        "full_recommendations": response.text
-    }
-    
-    return recommendations
 
 def analyze_fairness_metrics(metrics_data, model_type, sensitive_groups):
     """
@@ -188,67 +309,56 @@ def analyze_fairness_metrics(metrics_data, model_type, sensitive_groups):
     dict
         Fairness analysis and recommendations
     """
-    # Prepare the prompt with metrics information
-    prompt = f"""
+    # Generate AI response
+    response_text = generate_text(fairness_metrics_prompt(metrics_data, model_type, sensitive_groups))
+    
+    # Process and structure the response
+    return parse_sections(response_text, FAIRNESS_SECTIONS, "full_analysis")
+
+def stream_fairness_metrics_analysis(metrics_data, model_type, sensitive_groups):
+    """
+    Streaming variant of analyze_fairness_metrics
+    
+    Yields (event, data) pairs as described in stream_sections.
+    """
+    return stream_sections(
+        fairness_metrics_prompt(metrics_data, model_type, sensitive_groups),
+        FAIRNESS_SECTIONS,
+        "full_analysis"
+    )
+
+def fairness_metrics_prompt(metrics_data, model_type, sensitive_groups):
+    """Prompt for a business-friendly interpretation of fairness metrics"""
+    return f"""
     Analyze these fairness metrics and provide business-friendly interpretation:
     
     Metrics Data: {json.dumps(metrics_data, indent=2)}
     Model Type: {model_type}
     Sensitive Groups: {', '.join(sensitive_groups)}
     
-    Please provide:
-    1. Interpretation of these fairness metrics in plain language
-    2. Assessment of disparate impact across sensitive groups
-    3. Comparison to ethical and regulatory standards
-    4. Specific recommendations to improve fairness
-    5. Business implications of these fairness results
+    Write an actionable fairness analysis for non-technical stakeholders.
     
-    Format your response as an actionable fairness analysis for non-technical stakeholders.
+    {response_format_instructions(FAIRNESS_SECTIONS)}
     """
-    
-    # Generate AI response
-    model = genai.GenerativeModel(MODEL_NAME)
-    response = model.generate_content(prompt)
-    
-    # Process and structure the response
-    analysis = {
-        "metrics_interpretation": extract_section(response.text, "interpretation"),
-        "disparate_impact": extract_section(response.text, "disparate impact"),
-        "standards_comparison": extract_section(response.text, "standards"),
-        "fairness_recommendations": extract_section(response.text, "recommendations"),
-        "business_implications": extract_section(response.text, "implications"),
-        "full_analysis": response.text
-    }
-    
-    return analysis
 
-def extract_section(text, section_keyword):
+def stream_sections(prompt, sections, full_key):
+    """
+    Streams a response and its sections as they are generated
+    
+    Yields:
+    -------
+    tuple
+        ('delta', text) for every piece of generated text,
+        ('section', {'name': ..., 'text': ...}) as soon as a section is complete,
+        and finally ('done', result) with the same dict parse_sections returns
     """
-    Extracts a section from the AI response text
+    parser = SectionParser(sections)
+    for piece in stream_text(prompt):
+        yield 'delta', piece
+        for name, text in parser.feed(piece):
+            yield 'section', {'name': name, 'text': text}
     
-    Parameters:
-    -----------
-    text : str
-        Full AI response text
-    section_keyword : str
-        Keyword to identify the section
-        
-    Returns:
-    --------
-    str
-        Extracted section text
-    """
-    paragraphs = text.split('\n\n')
-    
-    for i, paragraph in enumerate(paragraphs):
-        if section_keyword.lower() in paragraph.lower():
-            # Try to return this paragraph and the following one
-            if i < len(paragraphs) - 1:
-                return paragraph + '\n\n' + paragraphs[i+1]
-            return paragraph
-    
-    # If section not clearly identified, return a general extract
-    words = text.split()
-    if len(words) > 100:
-        return ' '.join(words[:100]) + '...'
-    return text
\ No newline at end of file
+    for name, text in parser.close():
+        yield 'section', {'name': name, 'text': text}
+    
+    yield 'done', parser.result(full_key)
@@ -0,0 +1,140 @@
+"""
+Asynchronous variants of the Google Gemini calls
+Lets AI requests run while the local statistics are computed and fans out
+independent prompts with a concurrency limit and per-call timeouts
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+
+from django.conf import settings
+
+from . import gemini_ai
+
+
+async def call_ai(func, *args, timeout=None, semaphore=None, **kwargs):
+    """
+    Runs a blocking gemini_ai function on a worker thread
+
+    Parameters:
+    -----------
+    func : callable
+        Function from gemini_ai (or any blocking callable)
+    timeout : float, optional
+        Seconds to wait for the result; defaults to GEMINI_CALL_TIMEOUT
+    semaphore : asyncio.Semaphore, optional
+        Limits how many calls run at once
+
+    Raises asyncio.TimeoutError when the call takes longer than the timeout.
+    The thread is not interrupted, so a late response still reaches the
+    response cache for the next request.
+    """
+    timeout = settings.GEMINI_CALL_TIMEOUT if timeout is None else timeout
+    call = functools.partial(func, *args, **kwargs)
+
+    if semaphore is None:
+        return await asyncio.wait_for(asyncio.to_thread(call), timeout)
+    async with semaphore:
+        return await asyncio.wait_for(asyncio.to_thread(call), timeout)
+
+
+async def gather_ai_calls(calls, max_concurrency=None, timeout=None):
+    """
+    Runs independent AI calls concurrently
+
+    Parameters:
+    -----------
+    calls : list
+        (func, args, kwargs) tuples
+    max_concurrency : int, optional
+        Most calls in flight at once; defaults to GEMINI_MAX_CONCURRENCY
+    timeout : float, optional
+        Per-call timeout in seconds; defaults to GEMINI_CALL_TIMEOUT
+
+    Returns:
+    --------
+    list
+        Results in the order of calls; a failed or timed out call yields an
+        error dict like the other AI helpers return
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.GEMINI_MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(call_ai(func, *args, timeout=timeout, semaphore=semaphore, **kwargs) for func, args, kwargs in calls),
+        return_exceptions=True
+    )
+    return [ai_error(result) if isinstance(result, BaseException) else result for result in results]
+
+
+def ai_error(error):
+    """Error result for an AI call that failed or timed out"""
+    if isinstance(error, asyncio.TimeoutError):
+        message = 'AI analysis timed out'
+    else:
+        message = str(error)
+    return {
+        'error': message,
+        'message': 'AI-powered analysis could not be completed'
+    }
+
+
+async def analyze_dataset_ethics_async(df_info, sensitive_attributes, sample_dataset_type=None,
+                                       per_attribute=False, max_concurrency=None, timeout=None):
+    """
+    Async variant of gemini_ai.analyze_dataset_ethics
+
+    With per_attribute, one extra prompt per sensitive attribute is sent
+    alongside the overall analysis and the results are returned under
+    'attribute_analyses'.
+    """
+    calls = [(gemini_ai.analyze_dataset_ethics, (df_info, sensitive_attributes, sample_dataset_type), {})]
+    if per_attribute:
+        calls.extend(
+            (gemini_ai.analyze_dataset_ethics, (df_info, [attr], sample_dataset_type), {})
+            for attr in sensitive_attributes
+        )
+
+    analysis, *attribute_analyses = await gather_ai_calls(calls, max_concurrency, timeout)
+    if per_attribute and 'error' not in analysis:
+        analysis['attribute_analyses'] = dict(zip(sensitive_attributes, attribute_analyses))
+    return analysis
+
+
+async def generate_transparency_insights_async(model_info, feature_importances, timeout=None):
+    """Async variant of gemini_ai.generate_transparency_insights"""
+    return await call_ai(gemini_ai.generate_transparency_insights, model_info, feature_importances,
+                         timeout=timeout)
+
+
+async def create_governance_recommendations_async(industry, regulatory_requirements, model_risk_level,
+                                                  timeout=None):
+    """Async variant of gemini_ai.create_governance_recommendations"""
+    return await call_ai(gemini_ai.create_governance_recommendations, industry, regulatory_requirements,
+                         model_risk_level, timeout=timeout)
+
+
+async def analyze_fairness_metrics_async(metrics_data, model_type, sensitive_groups, timeout=None):
+    """Async variant of gemini_ai.analyze_fairness_metrics"""
+    return await call_ai(gemini_ai.analyze_fairness_metrics, metrics_data, model_type, sensitive_groups,
+                         timeout=timeout)
+
+
+def run_alongside(local, ai_coroutine):
+    """
+    Runs local() on the calling thread while an AI coroutine runs on its own event loop
+
+    The local work keeps the caller's thread (and database connection), so
+    the total time is roughly the longer of the two rather than their sum.
+
+    Returns:
+    --------
+    tuple
+        (local result, AI result)
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gemini')
+    try:
+        ai_future = executor.submit(asyncio.run, ai_coroutine)
+        local_result = local()
+        return local_result, ai_future.result()
+    finally:
+        executor.shutdown(wait=False)
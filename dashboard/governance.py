@@ -1,7 +1,16 @@
 """
 AI governance framework templates and utilities
+The templates are built once at import, frozen, and kept pre-serialized with
+an ETag so the API can answer conditional requests without rebuilding them
 """
 
+from datetime import datetime, timezone
+import hashlib
+import os
+from types import MappingProxyType
+
+from .serialization import dumps
+
 def get_governance_template(framework_type):
     """
     Returns a governance framework template based on the specified type
@@ -13,18 +22,33 @@ def get_governance_template(framework_type):
         
     Returns:
     --------
-    dict
-        Governance framework template
+    Mapping
+        Read-only governance framework template (lists are tuples)
     """
-    frameworks = {
-        'general': get_general_governance_framework(),
-        'industry': get_industry_specific_framework(),
-        'regulatory': get_regulatory_compliance_framework(),
-        'fairness': get_fairness_governance_framework(),
-        'privacy': get_privacy_governance_framework()
-    }
+    return GOVERNANCE_TEMPLATES.get(framework_type, GOVERNANCE_TEMPLATES['general'])
+
+
+def get_governance_template_json(framework_type):
+    """
+    Returns a governance framework template as JSON bytes with its ETag
     
-    return frameworks.get(framework_type, frameworks['general'])
+    Returns:
+    --------
+    tuple
+        (json_bytes, etag) where etag is the quoted strong ETag of the bytes
+    """
+    if framework_type not in GOVERNANCE_TEMPLATE_JSON:
+        framework_type = 'general'
+    return GOVERNANCE_TEMPLATE_JSON[framework_type], GOVERNANCE_TEMPLATE_ETAGS[framework_type]
+
+
+def freeze(value):
+    """Returns a read-only copy of a JSON value: dicts become mapping proxies and lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
 
 
 def get_general_governance_framework():
@@ -914,3 +938,30 @@ def get_privacy_governance_framework():
             'implementation_guidance': 'Align privacy governance with the most stringent applicable regulations, while adapting specific implementation details to each jurisdiction'
         }
     }
+
+
+FRAMEWORK_BUILDERS = {
+    'general': get_general_governance_framework,
+    'industry': get_industry_specific_framework,
+    'regulatory': get_regulatory_compliance_framework,
+    'fairness': get_fairness_governance_framework,
+    'privacy': get_privacy_governance_framework
+}
+
+
+def build_templates():
+    """Builds every template once; returns the frozen templates, their JSON and ETags by type"""
+    templates, template_json, etags = {}, {}, {}
+    for framework_type, build in FRAMEWORK_BUILDERS.items():
+        template = build()
+        templates[framework_type] = freeze(template)
+        template_json[framework_type] = dumps(template)
+        etags[framework_type] = f'"{hashlib.sha256(template_json[framework_type]).hexdigest()[:32]}"'
+    return MappingProxyType(templates), MappingProxyType(template_json), MappingProxyType(etags)
+
+
+GOVERNANCE_TEMPLATES, GOVERNANCE_TEMPLATE_JSON, GOVERNANCE_TEMPLATE_ETAGS = build_templates()
+
+# The templates only change with this file, so its modification time (whole
+# seconds, as in Last-Modified) is the same for every worker of a deployment
+TEMPLATES_LAST_MODIFIED = datetime.fromtimestamp(int(os.path.getmtime(__file__)), tz=timezone.utc)
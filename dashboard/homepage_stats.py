@@ -0,0 +1,50 @@
+"""
+Counters and recent analyses shown on the homepage
+They are cached under a CacheVersion that is bumped whenever an analysis,
+case study or educational resource is saved or deleted, in any process, so
+a homepage hit normally runs a single primary key lookup
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CacheVersion, ModelAnalysis, CaseStudy, EducationalResource
+
+HOMEPAGE_STATS_CACHE_KEY = 'dashboard:homepage_stats'
+RECENT_ANALYSES = 5
+
+
+def get_homepage_stats():
+    """
+    Returns the homepage statistics, computing them on a cache miss
+    
+    Returns:
+    --------
+    dict
+        analyses_count, case_studies_count, resources_count, and
+        recent_analyses: the latest analyses without their results
+    """
+    cache_key = f"{HOMEPAGE_STATS_CACHE_KEY}:{CacheVersion.current(HOMEPAGE_STATS_CACHE_KEY)}"
+    stats = cache.get(cache_key)
+    if stats is None:
+        stats = {
+            'analyses_count': ModelAnalysis.objects.count(),
+            'case_studies_count': CaseStudy.objects.count(),
+            'resources_count': EducationalResource.objects.count(),
+            'recent_analyses': list(
+                ModelAnalysis.objects.only('name', 'model_type', 'created_at', 'has_bias', 'has_transparency')
+                .order_by('-created_at')[:RECENT_ANALYSES]
+            )
+        }
+        cache.set(cache_key, stats, settings.HOMEPAGE_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+@receiver([post_save, post_delete], sender=ModelAnalysis)
+@receiver([post_save, post_delete], sender=CaseStudy)
+@receiver([post_save, post_delete], sender=EducationalResource)
+def invalidate_homepage_stats(sender, **kwargs):
+    """Bumps the statistics version when a counted object changes, so every process recomputes them"""
+    CacheVersion.bump(HOMEPAGE_STATS_CACHE_KEY)
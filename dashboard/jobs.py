@@ -0,0 +1,377 @@
+"""
+Database-backed queue for long-running bias and transparency analyses
+
+Views enqueue an AnalysisJob holding the analysis parameters and the dataset
+as a gzipped CSV in the job row, so workers only need the database; worker processes started by the run_analysis_workers
+management command claim queued jobs, run them and link the resulting
+ModelAnalysis to the job. Claiming is a conditional UPDATE, so it works on
+every database backend without row locks.
+"""
+
+from contextlib import contextmanager
+from datetime import timedelta
+import gzip
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connections
+from django.utils import timezone
+import pandas as pd
+
+from .models import AnalysisJob, ModelAnalysis
+from .analysis import read_uploaded_csv, run_bias_pipeline, run_transparency_pipeline
+from .progress import ProgressTracker, report_progress
+
+# Progress events kept on a job for clients that connect late
+MAX_JOB_EVENTS = 200
+# Minimum seconds between progress writes within the same stage
+PROGRESS_WRITE_INTERVAL = 0.5
+# Bytes copied at a time when a job's dataset is compressed or restored
+DATASET_CHUNK_BYTES = 1024 * 1024
+
+
+def enqueue_job(job_type, payload, data_file=None, df=None, user=None):
+    """
+    Creates a queued analysis job
+
+    Parameters:
+    -----------
+    job_type : str
+        'bias' or 'transparency'
+    payload : dict
+        JSON-serializable analysis parameters
+    data_file : UploadedFile, optional
+        Uploaded CSV dataset
+    df : pandas.DataFrame, optional
+        Dataset built in the request (e.g. from manual input), stored as CSV
+    user : User, optional
+        User who requested the analysis
+
+    Returns:
+    --------
+    AnalysisJob
+        The job; it has already run when ANALYSIS_JOBS_EAGER is set
+    """
+    job = AnalysisJob(job_type=job_type, payload=payload)
+    if user is not None and user.is_authenticated:
+        job.user = user
+
+    if data_file is not None:
+        job.dataset = compress_dataset(data_file)
+    elif df is not None:
+        job.dataset = compress_dataset(ContentFile(df.to_csv(index=False).encode()))
+    job.save()
+
+    if settings.ANALYSIS_JOBS_EAGER:
+        claimed = claim_job(job.pk, worker_name())
+        if claimed is not None:
+            run_job(claimed)
+            job.refresh_from_db()
+
+    return job
+
+
+def compress_dataset(data_file):
+    """Gzips a CSV file into the bytes stored in AnalysisJob.dataset"""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6, mtime=0) as compressed:
+        for chunk in data_file.chunks(DATASET_CHUNK_BYTES):
+            compressed.write(chunk)
+    return buffer.getvalue()
+
+
+@contextmanager
+def open_dataset(job):
+    """
+    Yields a job's dataset as a CSV File
+
+    The CSV is restored to a temporary file rather than memory, so large
+    uploads can still be read in chunks (see read_uploaded_csv).
+    """
+    with tempfile.TemporaryFile() as csv_file:
+        with gzip.GzipFile(fileobj=io.BytesIO(bytes(job.dataset))) as compressed:
+            shutil.copyfileobj(compressed, csv_file, DATASET_CHUNK_BYTES)
+        csv_file.seek(0)
+        yield File(csv_file, name=f"{job.pk}.csv")
+
+
+def worker_name():
+    """Identifies the current worker process"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_job(job_id, worker):
+    """Marks a queued job as running for this worker; returns it, or None if another worker won"""
+    now = timezone.now()
+    claimed = AnalysisJob.objects.filter(pk=job_id, status=AnalysisJob.STATUS_QUEUED).update(
+        status=AnalysisJob.STATUS_RUNNING,
+        worker=worker,
+        started_at=now,
+        heartbeat_at=now,
+        stage='starting',
+        progress=0
+    )
+    if not claimed:
+        return None
+    return AnalysisJob.objects.get(pk=job_id)
+
+
+def claim_next_job(worker):
+    """Claims the oldest queued job, or returns None when the queue is empty"""
+    while True:
+        job_id = (AnalysisJob.objects.filter(status=AnalysisJob.STATUS_QUEUED)
+                  .order_by('created_at').values_list('pk', flat=True).first())
+        if job_id is None:
+            return None
+
+        job = claim_job(job_id, worker)
+        if job is not None:
+            return job
+
+
+def requeue_stale_jobs(stale_after=None):
+    """
+    Returns jobs whose worker stopped sending heartbeats to the queue
+
+    Jobs that already used up ANALYSIS_JOB_MAX_ATTEMPTS are failed instead.
+    """
+    stale_after = stale_after or settings.ANALYSIS_JOB_STALE_SECONDS
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = AnalysisJob.objects.filter(status=AnalysisJob.STATUS_RUNNING, heartbeat_at__lt=cutoff)
+
+    failed = stale.filter(attempts__gte=settings.ANALYSIS_JOB_MAX_ATTEMPTS).update(
+        status=AnalysisJob.STATUS_FAILED,
+        error='Worker stopped responding',
+        finished_at=timezone.now()
+    )
+    requeued = stale.update(status=AnalysisJob.STATUS_QUEUED, stage='', progress=0, worker='')
+    return requeued, failed
+
+
+def progress_reporter(job):
+    """
+    Returns a ProgressTracker that records a job's progress events
+
+    Every event is kept (up to MAX_JOB_EVENTS) in job.events for the events
+    stream, replacing the events of an earlier attempt of a requeued job.
+    Their sequence numbers carry on from that attempt's, so a client resuming
+    from its Last-Event-ID still gets the new ones. Writes are throttled to
+    one per PROGRESS_WRITE_INTERVAL while the stage stays the same; buffered
+    events go out with the next write.
+    """
+    events = []
+    last_write = 0.0
+    last_sequence = max((event['seq'] for event in job.events), default=0)
+
+    def record(event):
+        nonlocal last_write
+        events.append(event)
+        del events[:-MAX_JOB_EVENTS]
+
+        now = time.monotonic()
+        if event['stage'] == job.stage and now - last_write < PROGRESS_WRITE_INTERVAL:
+            return
+        last_write = now
+
+        job.stage = event['stage']
+        if event['fraction'] is not None:
+            job.progress = event['fraction']
+        job.events = list(events)
+        AnalysisJob.objects.filter(pk=job.pk).update(
+            stage=job.stage, progress=job.progress, events=job.events, heartbeat_at=timezone.now()
+        )
+
+    def flush():
+        if events and job.events != events:
+            AnalysisJob.objects.filter(pk=job.pk).update(events=list(events))
+
+    tracker = ProgressTracker(record, sequence=last_sequence)
+    tracker.flush = flush
+    return tracker
+
+
+def touch_heartbeat(job_id):
+    """Marks a running job's worker as alive"""
+    AnalysisJob.objects.filter(pk=job_id, status=AnalysisJob.STATUS_RUNNING).update(heartbeat_at=timezone.now())
+
+
+@contextmanager
+def heartbeat(job, interval=None):
+    """
+    Updates the job's heartbeat every interval seconds while the block runs
+
+    Progress writes also update it, but stages such as the AI analysis or a
+    forest fit can go minutes without one; this keeps such jobs from looking
+    like they lost their worker.
+    """
+    interval = interval or settings.ANALYSIS_JOB_HEARTBEAT_SECONDS
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                touch_heartbeat(job.pk)
+        finally:
+            # Connections are per thread; close the ones this thread opened
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f'job-heartbeat-{job.pk}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job):
+    """Runs a claimed job, records its outcome and deletes its dataset"""
+    AnalysisJob.objects.filter(pk=job.pk).update(attempts=job.attempts + 1)
+    report = progress_reporter(job)
+
+    try:
+        try:
+            handler = JOB_HANDLERS[job.job_type]
+            with heartbeat(job):
+                analysis, message = handler(job, report)
+        except Exception as e:
+            traceback.print_exc()
+            report.flush()
+            AnalysisJob.objects.filter(pk=job.pk).update(
+                status=AnalysisJob.STATUS_FAILED,
+                error=str(e),
+                finished_at=timezone.now()
+            )
+            return
+
+        report('complete', fraction=1)
+        report.flush()
+        AnalysisJob.objects.filter(pk=job.pk).update(
+            status=AnalysisJob.STATUS_SUCCEEDED,
+            analysis=analysis,
+            message=message,
+            stage='complete',
+            progress=1,
+            finished_at=timezone.now()
+        )
+    finally:
+        # The job is finished either way and is never retried, so the dataset
+        # is no longer needed (a crashed worker skips this and the job is requeued)
+        if job.dataset is not None:
+            job.dataset = None
+            AnalysisJob.objects.filter(pk=job.pk).update(dataset=None)
+
+
+def run_bias_job(job, report):
+    """Bias detection job; returns (ModelAnalysis, message)"""
+    payload = job.payload
+    analysis_type = payload['analysis_type']
+    model_analysis = ModelAnalysis(**payload['analysis'])
+
+    report_progress(report, 'loading_data', fraction=0.05)
+    with open_dataset(job) as data_file:
+        if analysis_type == 'dataset':
+            df, stream_file = read_uploaded_csv(data_file)
+        else:
+            df, stream_file = pd.read_csv(data_file), None
+
+        try:
+            bias_results, fairness_metrics = run_bias_pipeline(
+                df, stream_file, payload['sensitive_attributes'], analysis_type,
+                payload.get('sample_dataset_type', ''), progress=report
+            )
+            model_analysis.bias_analysis = bias_results
+            model_analysis.fairness_metrics = fairness_metrics
+            message = "Bias analysis completed successfully."
+        except Exception as e:
+            # Create minimal valid results in case of error
+            error_message = str(e)
+            model_analysis.bias_analysis = {
+                'error': f"Error in analysis: {error_message}",
+                'dataset_size': len(df),
+                'analysis_type': analysis_type
+            }
+            message = f"Analysis completed with errors: {error_message}"
+
+    report_progress(report, 'saving', fraction=0.95)
+    model_analysis.save()
+    return model_analysis, message
+
+
+def run_transparency_job(job, report):
+    """Transparency analysis job; returns (ModelAnalysis, message)"""
+    payload = job.payload
+
+    report_progress(report, 'loading_data', fraction=0.05)
+    with open_dataset(job) as data_file:
+        df = pd.read_csv(data_file)
+
+    explainability_results = run_transparency_pipeline(
+        df, payload['target_column'], payload['model_type'], payload['explanation_level'],
+        payload['analysis_type'], progress=report
+    )
+
+    # Create and save analysis
+    report_progress(report, 'saving', fraction=0.95)
+    model_analysis = ModelAnalysis(
+        name=f"Transparency Analysis - {payload['model_type']}",
+        description=f"Explainability analysis with {payload['explanation_level']} detail",
+        model_type=payload['model_type'],
+        dataset_description=f"Dataset with {len(df)} records, target: {payload['target_column']}",
+        transparency_analysis=explainability_results
+    )
+    model_analysis.save()
+    return model_analysis, "Transparency analysis completed successfully."
+
+
+JOB_HANDLERS = {
+    'bias': run_bias_job,
+    'transparency': run_transparency_job
+}
+
+
+def run_worker(poll_interval=None, max_jobs=None, stop_when_idle=False):
+    """
+    Processes queued jobs until stopped
+
+    Parameters:
+    -----------
+    poll_interval : float
+        Seconds to sleep when the queue is empty
+    max_jobs : int, optional
+        Exit after this many jobs (useful to recycle worker processes)
+    stop_when_idle : bool
+        Exit as soon as the queue is empty
+
+    Returns:
+    --------
+    int
+        Number of jobs processed
+    """
+    poll_interval = poll_interval or settings.ANALYSIS_JOB_POLL_INTERVAL
+    worker = worker_name()
+    processed = 0
+
+    while max_jobs is None or processed < max_jobs:
+        close_old_connections()
+        job = claim_next_job(worker)
+        if job is None:
+            if stop_when_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job)
+        processed += 1
+
+    close_old_connections()
+    return processed
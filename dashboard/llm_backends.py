@@ -0,0 +1,138 @@
+"""
+Language model backends behind the gemini_ai module
+LLM_BACKEND selects Google Gemini or a local stub server (see llm_stub)
+"""
+
+import codecs
+import json
+import threading
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from google.api_core import exceptions as google_exceptions
+
+
+class LLMBackend:
+    """
+    Interface of a text generation backend
+
+    Subclasses implement generate(prompt, timeout) and return the response
+    text. Transient failures should be raised as the google.api_core
+    exception matching their HTTP status, TimeoutError or ConnectionError so
+    gemini_ai retries them.
+    """
+
+    name = 'base'
+    model_name = ''
+
+    def generate(self, prompt, timeout=None):
+        raise NotImplementedError
+
+    def stream(self, prompt, timeout=None):
+        """Yields the response text in pieces; backends that cannot stream yield it whole"""
+        yield self.generate(prompt, timeout)
+
+    @property
+    def cache_namespace(self):
+        """Distinguishes cached responses of different backends and models"""
+        return f"{self.name}:{self.model_name}"
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through the google-generativeai client, configured on first use"""
+
+    name = 'gemini'
+
+    def __init__(self, api_key, model_name):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, timeout=None):
+        request_options = {'timeout': timeout} if timeout else None
+        return self._get_model().generate_content(prompt, request_options=request_options).text
+
+    def stream(self, prompt, timeout=None):
+        request_options = {'timeout': timeout} if timeout else None
+        for chunk in self._get_model().generate_content(prompt, stream=True, request_options=request_options):
+            yield chunk.text
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=self.api_key)
+                self._model = genai.GenerativeModel(self.model_name)
+            return self._model
+
+
+class StubBackend(LLMBackend):
+    """Local HTTP stand-in for Gemini served by the run_llm_stub command"""
+
+    name = 'stub'
+
+    def __init__(self, url, model_name='stub'):
+        self.url = url
+        self.model_name = model_name
+
+    def generate(self, prompt, timeout=None):
+        with self._open(prompt, timeout, stream=False) as response:
+            return json.loads(response.read())['text']
+
+    def stream(self, prompt, timeout=None):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        with self._open(prompt, timeout, stream=True) as response:
+            for data in iter(lambda: response.read1(4096), b''):
+                text = decoder.decode(data)
+                if text:
+                    yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def _open(self, prompt, timeout, stream):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({'prompt': prompt, 'stream': stream}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=timeout)
+        except urllib.error.HTTPError as e:
+            raise google_exceptions.from_http_status(e.code, e.read().decode(errors='replace'))
+        except urllib.error.URLError as e:
+            if isinstance(e.reason, TimeoutError):
+                raise e.reason
+            raise ConnectionError(str(e.reason))
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Returns the process-wide backend selected by LLM_BACKEND"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if settings.LLM_BACKEND == 'stub':
+                _backend = StubBackend(settings.LLM_STUB_URL)
+            elif settings.LLM_BACKEND == 'gemini':
+                _backend = GeminiBackend(settings.GOOGLE_GEMINI_API_KEY, settings.GEMINI_MODEL_NAME)
+            else:
+                raise ValueError(f"Unknown LLM_BACKEND: {settings.LLM_BACKEND}")
+        return _backend
+
+
+@receiver(setting_changed)
+def reset_backend(sender, setting, **kwargs):
+    """Rebuild the backend when its settings change (e.g. in tests)"""
+    global _backend
+    if setting.startswith('LLM_') or setting.startswith('GEMINI_MODEL') or setting == 'GOOGLE_GEMINI_API_KEY':
+        with _backend_lock:
+            _backend = None
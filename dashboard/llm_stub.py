@@ -0,0 +1,196 @@
+"""
+Local HTTP stand-in for the Gemini API
+Serves deterministic responses of a configurable size with injectable latency
+and error rates, for load tests and offline development (LLM_BACKEND=stub)
+"""
+
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+
+from .structured_output import requested_fields
+
+# Headings covering the sections gemini_ai extracts from every kind of prompt
+STUB_SECTIONS = [
+    'Ethical concerns', 'Bias patterns', 'Representation issues', 'Recommendations',
+    'Deployment considerations', 'Explainability assessment', 'Key features', 'Transparency gaps',
+    'Communication strategies', 'Governance framework', 'Documentation requirements',
+    'Testing protocols', 'Monitoring procedures', 'Roles and responsibilities',
+    'Interpretation', 'Disparate impact', 'Standards comparison', 'Business implications'
+]
+
+STUB_WORDS = (
+    'model data fairness group outcome risk review audit metric feature decision bias '
+    'stakeholder policy transparency documentation monitoring threshold impact mitigation'
+).split()
+
+
+def stub_response(prompt, size):
+    """
+    Builds the deterministic response text for a prompt
+
+    The same prompt always yields the same text; its length is close to size
+    characters (never below the section headings themselves). Prompts asking
+    for a JSON object get one with every requested key, each value starting
+    with the key's description; other prompts get paragraphs under headings.
+    """
+    rng = random.Random(hashlib.sha256(prompt.encode()).digest())
+
+    fields = requested_fields(prompt)
+    if fields:
+        per_field = max(1, size // len(fields))
+        return json.dumps({
+            key: f"{description}: {filler_text(rng, per_field - len(key) - len(description) - 10)}"
+            for key, description in fields.items()
+        }, indent=2)
+
+    per_section = max(1, size // len(STUB_SECTIONS))
+    return '\n\n'.join(
+        f"{heading}:\n{filler_text(rng, per_section - len(heading) - 3)}" for heading in STUB_SECTIONS
+    )
+
+
+def filler_text(rng, length):
+    """A sentence of random words about length characters long"""
+    words = []
+    while length > 0:
+        word = rng.choice(STUB_WORDS)
+        words.append(word)
+        length -= len(word) + 1
+    return ' '.join(words) + '.'
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """
+    Answers POST requests carrying {"prompt": ...} with {"text": ...}
+
+    With {"stream": true} the text is sent as plain text, one line at a
+    time, and the connection is closed at the end.
+    """
+
+    def do_POST(self):
+        stub = self.server.stub
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length))
+            prompt = body['prompt']
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {'error': 'Expected a JSON body with a prompt'})
+            return
+
+        delay, fail = stub.next_outcome()
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            self._send(stub.error_status, {'error': 'Injected stub failure'})
+        elif body.get('stream'):
+            self._stream(stub_response(prompt, stub.response_size), stub.chunk_delay)
+        else:
+            self._send(200, {'text': stub_response(prompt, stub.response_size)})
+
+    def _stream(self, text, chunk_delay):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.end_headers()
+        self.close_connection = True
+
+        for i, line in enumerate(text.splitlines(keepends=True)):
+            if i and chunk_delay:
+                time.sleep(chunk_delay)
+            self.wfile.write(line.encode())
+            self.wfile.flush()
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep load tests quiet
+        pass
+
+
+class StubLLMServer:
+    """
+    Threaded stub server
+
+    Parameters:
+    -----------
+    host, port : str, int
+        Address to listen on; port 0 picks a free port
+    response_size : int
+        Approximate characters per response
+    latency : float
+        Seconds every request waits before answering
+    latency_jitter : float
+        Extra wait drawn uniformly from [0, latency_jitter]
+    error_rate : float
+        Fraction of requests answered with error_status
+    error_status : int
+        HTTP status of injected failures (503 by default)
+    chunk_delay : float
+        Seconds between lines of a streamed response
+    seed : int
+        Seeds latency and failure draws, so a run is reproducible
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, response_size=2000, latency=0.0, latency_jitter=0.0,
+                 error_rate=0.0, error_status=503, chunk_delay=0.0, seed=0):
+        self.response_size = response_size
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_delay = chunk_delay
+
+        self.requests = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), StubLLMHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/generate"
+
+    def next_outcome(self):
+        """Draws (delay, fail) for the next request and counts it"""
+        with self._rng_lock:
+            jitter = self._rng.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0
+            fail = self._rng.random() < self.error_rate
+            self.requests += 1
+            self.failures += fail
+        return self.latency + jitter, fail
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def start(self):
+        """Serves requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
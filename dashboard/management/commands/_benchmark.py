@@ -0,0 +1,15 @@
+"""
+Timing helper shared by the benchmark commands
+"""
+
+import time
+
+
+def best_time(func, repeat):
+    """Returns the fastest of repeat calls to func, in seconds (at least one call is made)"""
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
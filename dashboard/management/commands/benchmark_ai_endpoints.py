@@ -0,0 +1,89 @@
+"""
+Load test of the AI-enabled bias API against the local LLM stub, with no network access
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import io
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from dashboard.llm_stub import StubLLMServer
+
+
+class Command(BaseCommand):
+    help = "Benchmarks /api/analyze-bias/ with use_ai_analysis=true against an in-process LLM stub"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Number of API requests')
+        parser.add_argument('--concurrency', type=int, default=4,
+                            help='Requests in flight at once')
+        parser.add_argument('--rows', type=int, default=10000,
+                            help='Rows in the uploaded dataset')
+        parser.add_argument('--response-size', type=int, default=4000,
+                            help='Approximate characters per stub response')
+        parser.add_argument('--latency', type=float, default=0.5,
+                            help='Stub latency in seconds')
+        parser.add_argument('--latency-jitter', type=float, default=0.0)
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Fraction of stub requests that fail')
+        parser.add_argument('--per-attribute', action='store_true',
+                            help='Also request one AI analysis per sensitive attribute')
+        parser.add_argument('--cache', action='store_true',
+                            help='Keep the response cache enabled (identical prompts then hit it)')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(42)
+        rows = options['rows']
+        df = pd.DataFrame({
+            'gender': rng.choice(['male', 'female', 'non_binary'], size=rows),
+            'age_group': rng.choice(['18-30', '31-50', '51+'], size=rows),
+            'approved': rng.integers(0, 2, size=rows)
+        })
+        csv = df.to_csv(index=False).encode()
+        url = reverse('dashboard:analyze_bias')
+
+        def request(_):
+            data_file = io.BytesIO(csv)
+            data_file.name = 'benchmark.csv'
+            start = time.perf_counter()
+            response = Client().post(url, {
+                'data_file': data_file,
+                'sensitive_attributes': 'gender,age_group',
+                'use_ai_analysis': 'true',
+                'per_attribute_analysis': 'true' if options['per_attribute'] else 'false'
+            })
+            return time.perf_counter() - start, response.status_code
+
+        stub = StubLLMServer(
+            response_size=options['response_size'],
+            latency=options['latency'],
+            latency_jitter=options['latency_jitter'],
+            error_rate=options['error_rate']
+        )
+        with stub, override_settings(LLM_BACKEND='stub', LLM_STUB_URL=stub.url,
+                                     GEMINI_CACHE_ENABLED=options['cache']):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                results = list(executor.map(request, range(options['requests'])))
+            wall = time.perf_counter() - start
+
+        latencies = np.array([elapsed for elapsed, _ in results])
+        errors = sum(status != 200 for _, status in results)
+
+        self.stdout.write(
+            f"requests={options['requests']} concurrency={options['concurrency']} rows={rows} "
+            f"stub_latency={options['latency']}s response_size={options['response_size']} "
+            f"error_rate={options['error_rate']}"
+        )
+        self.stdout.write(
+            f"throughput={len(results) / wall:.2f} req/s  "
+            f"p50={np.percentile(latencies, 50):.3f}s  p95={np.percentile(latencies, 95):.3f}s  "
+            f"max={latencies.max():.3f}s  http_errors={errors}  "
+            f"stub_requests={stub.requests} stub_failures={stub.failures}"
+        )
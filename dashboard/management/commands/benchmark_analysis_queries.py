@@ -0,0 +1,160 @@
+"""
+Benchmark for the analysis listing queries with and without their indexes
+"""
+
+from datetime import timedelta
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from dashboard.models import ModelAnalysis, UserActivity
+
+from ._benchmark import best_time
+
+
+class Command(BaseCommand):
+    help = ("Fills the database with synthetic analyses and compares query plans and timings of the "
+            "listing queries with and without the indexes on the has_bias/has_transparency flags. "
+            "Everything is rolled back at the end unless --keep is given.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help='Number of synthetic ModelAnalysis rows')
+        parser.add_argument('--activities', type=int, default=None,
+                            help='Number of synthetic UserActivity rows (default: --rows)')
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Number of synthetic users owning the rows')
+        parser.add_argument('--page-size', type=int, default=10,
+                            help='Rows fetched per listing query')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Number of timed repetitions (best time is reported)')
+        parser.add_argument('--no-plans', action='store_true',
+                            help='Only print timings')
+        parser.add_argument('--keep', action='store_true',
+                            help='Keep the synthetic rows')
+
+    def handle(self, *args, **options):
+        if not connection.features.can_rollback_ddl:
+            self.stderr.write("This database cannot roll back DDL; the before timings need the indexes dropped")
+            return
+
+        with transaction.atomic():
+            user = self.populate(options)
+
+            # Measure in a savepoint so the dropped indexes come back
+            with transaction.atomic():
+                after = self.measure(self.queries(user), options, 'after')
+                self.drop_indexes()
+                before = self.measure(self.queries(user), options, 'before')
+                transaction.set_rollback(True)
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        self.stdout.write(f"\n{'query':<24} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+        for label in after:
+            speedup = before[label]['seconds'] / after[label]['seconds'] if after[label]['seconds'] else float('inf')
+            self.stdout.write(
+                f"{label:<24} {before[label]['seconds'] * 1000:>12.2f} "
+                f"{after[label]['seconds'] * 1000:>12.2f} {speedup:>7.1f}x"
+            )
+
+        if not options['no_plans']:
+            for label in after:
+                self.stdout.write(f"\n== {label} (before) ==\n{before[label]['plan']}")
+                self.stdout.write(f"== {label} (after) ==\n{after[label]['plan']}")
+
+    def populate(self, options):
+        """Bulk-creates the synthetic users, analyses and activities; returns the busiest user"""
+        rng = random.Random(42)
+        rows = options['rows']
+        activities = options['activities'] if options['activities'] is not None else rows
+        batch_size = options['batch_size']
+        now = timezone.now()
+
+        User.objects.bulk_create(
+            [User(username=f"benchmark-user-{i}") for i in range(options['users'])],
+            batch_size=batch_size
+        )
+        users = list(User.objects.filter(username__startswith='benchmark-user-').values_list('pk', flat=True))
+
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for _ in range(min(batch_size, rows - offset)):
+                bias = rng.random() < 0.4
+                transparency = not bias and rng.random() < 0.5
+                batch.append(ModelAnalysis(
+                    name='Synthetic analysis',
+                    description='',
+                    model_type='classification',
+                    dataset_description='',
+                    created_at=now - timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+                    user_id=rng.choice(users),
+                    # Results live in AnalysisResult and do not affect the listings;
+                    # bulk_create skips save(), so set the flags directly
+                    has_bias=bias,
+                    has_transparency=transparency
+                ))
+            ModelAnalysis.objects.bulk_create(batch)
+
+        for offset in range(0, activities, batch_size):
+            UserActivity.objects.bulk_create([
+                UserActivity(
+                    user_id=rng.choice(users),
+                    activity_type='analysis_created',
+                    description='Synthetic activity',
+                    created_at=now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+                )
+                for _ in range(min(batch_size, activities - offset))
+            ])
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(f"Created {rows} analyses and {activities} activities in {time.perf_counter() - start:.1f}s")
+
+        return users[0]
+
+    def queries(self, user):
+        """The listing queries run by the bias detection, transparency and profile pages"""
+        analyses = ModelAnalysis.objects.all()
+        bias, transparency = analyses.filter(has_bias=True), analyses.filter(has_transparency=True)
+
+        return {
+            'bias listing': bias.order_by('-created_at'),
+            'bias count': bias.order_by(),
+            'transparency listing': transparency.order_by('-created_at'),
+            'profile analyses': analyses.filter(user_id=user).order_by('-created_at'),
+            'profile activities': UserActivity.objects.filter(user_id=user).order_by('-created_at')
+        }
+
+    def measure(self, queries, options, tag):
+        results = {}
+        for label, queryset in queries.items():
+            if label.endswith('count'):
+                run, plan = queryset.count, self.explain(queryset.values('pk'), tag)
+            else:
+                page = queryset[:options['page_size']]
+                run, plan = (lambda page=page: list(page.all())), self.explain(page, tag)
+
+            results[label] = {'seconds': best_time(run, options['repeat']), 'plan': plan}
+        return results
+
+    def explain(self, queryset, tag):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            # The tag keeps SQLite from reusing a plan compiled before the indexes were dropped
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql} -- {tag}", params)
+            return '\n'.join(' '.join(map(str, row)) for row in cursor.fetchall())
+
+    def drop_indexes(self):
+        """Drops the indexes added for the listings (inside the caller's transaction)"""
+        with connection.cursor() as cursor:
+            for model in (ModelAnalysis, UserActivity):
+                for index in model._meta.indexes:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
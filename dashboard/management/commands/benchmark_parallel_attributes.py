@@ -0,0 +1,68 @@
+"""
+Benchmark for per-attribute parallelism in bias detection as the worker count grows
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from dashboard.bias_detection import detect_bias_in_data, calculate_fairness_metrics
+
+from ._benchmark import best_time
+
+
+class Command(BaseCommand):
+    help = "Benchmarks detect_bias_in_data and calculate_fairness_metrics across worker counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help='Number of synthetic rows')
+        parser.add_argument('--attributes', type=int, default=20,
+                            help='Number of sensitive attributes')
+        parser.add_argument('--groups', type=int, default=50,
+                            help='Distinct values per sensitive attribute')
+        parser.add_argument('--workers', type=str, default=None,
+                            help='Comma separated worker counts (defaults to 1,2,4,... up to the CPU count)')
+        parser.add_argument('--backend', choices=['thread', 'process'], default='process',
+                            help='Worker pool type')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Number of timed repetitions (best time is reported)')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(42)
+        rows = options['rows']
+
+        data = {
+            f'attribute_{i}': rng.integers(0, options['groups'], size=rows).astype(str)
+            for i in range(options['attributes'])
+        }
+        data['approved'] = rng.integers(0, 2, size=rows)
+        data['predicted'] = rng.integers(0, 2, size=rows)
+        df = pd.DataFrame(data)
+        attrs = [f'attribute_{i}' for i in range(options['attributes'])]
+
+        if options['workers']:
+            worker_counts = [int(w) for w in options['workers'].split(',') if w.strip()]
+        else:
+            worker_counts = [1]
+            while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+                worker_counts.append(worker_counts[-1] * 2)
+
+        def run(n_jobs):
+            detect_bias_in_data(df, attrs, 'approved', n_jobs=n_jobs, backend=options['backend'])
+            calculate_fairness_metrics(df, attrs, 'approved', 'predicted',
+                                       n_jobs=n_jobs, backend=options['backend'])
+
+        self.stdout.write(
+            f"rows={rows} attributes={options['attributes']} groups={options['groups']} "
+            f"backend={options['backend']} cpus={os.cpu_count()}"
+        )
+        self.stdout.write(f"{'workers':>8} {'time (s)':>10} {'speedup':>8}")
+
+        baseline = None
+        for n_jobs in worker_counts:
+            elapsed = best_time(lambda: run(n_jobs), options['repeat'])
+            baseline = baseline or elapsed
+            self.stdout.write(f"{n_jobs:>8} {elapsed:>10.3f} {baseline / elapsed:>7.2f}x")
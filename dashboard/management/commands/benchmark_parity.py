@@ -0,0 +1,68 @@
+"""
+Benchmark for statistical parity computation as group cardinality grows
+"""
+
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from dashboard.bias_detection import check_statistical_parity
+
+from ._benchmark import best_time
+
+
+def masked_statistical_parity(df, sensitive_attr, target_column):
+    """
+    Reference implementation that filters the DataFrame once per group
+    """
+    positive_rates = {}
+    for attr_value in df[sensitive_attr].unique():
+        subset = df[df[sensitive_attr] == attr_value]
+        positive_rates[attr_value] = subset[target_column].mean()
+    return positive_rates
+
+
+class Command(BaseCommand):
+    help = "Benchmarks check_statistical_parity against per-group masking for increasing group counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help='Number of synthetic rows')
+        parser.add_argument('--groups', type=str, default='2,10,100,1000',
+                            help='Comma separated list of group counts to test')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Number of timed repetitions (best time is reported)')
+        parser.add_argument('--skip-masked', action='store_true',
+                            help='Do not time the per-group masking reference')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(42)
+        rows = options['rows']
+        group_counts = [int(g) for g in options['groups'].split(',') if g.strip()]
+
+        self.stdout.write(f"rows={rows}")
+        self.stdout.write(f"{'groups':>8} {'grouped (s)':>12} {'masked (s)':>12} {'speedup':>8}")
+
+        for n_groups in group_counts:
+            df = pd.DataFrame({
+                'location': rng.integers(0, n_groups, size=rows).astype(str),
+                'approved': rng.integers(0, 2, size=rows),
+            })
+
+            grouped = best_time(
+                lambda: check_statistical_parity(df, 'location', 'approved'),
+                options['repeat']
+            )
+
+            if options['skip_masked']:
+                self.stdout.write(f"{n_groups:>8} {grouped:>12.4f} {'-':>12} {'-':>8}")
+                continue
+
+            masked = best_time(
+                lambda: masked_statistical_parity(df, 'location', 'approved'),
+                options['repeat']
+            )
+            self.stdout.write(
+                f"{n_groups:>8} {grouped:>12.4f} {masked:>12.4f} {masked / grouped:>7.1f}x"
+            )
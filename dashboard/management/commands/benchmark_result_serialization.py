@@ -0,0 +1,91 @@
+"""
+Benchmark for persisting and returning a large bias result: the former
+dumps/loads round trip against the single-pass to_json and the shared encoder
+"""
+
+import json
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+
+from dashboard import serialization
+from dashboard.serialization import ResultJsonResponse, dumps, to_json
+
+from ._benchmark import best_time
+
+
+class NumpyEncoder(DjangoJSONEncoder):
+    """The encoder the results used to be round-tripped and returned with"""
+    def default(self, obj):
+        if isinstance(obj, np.integer):
+            return int(obj)
+        elif isinstance(obj, np.floating):
+            return float(obj)
+        elif isinstance(obj, np.ndarray):
+            return obj.tolist()
+        return super().default(obj)
+
+
+class Command(BaseCommand):
+    help = ("Times saving and returning a bias result with --groups groups per attribute, "
+            "before and after the single-pass result normalizer")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--groups', type=int, default=10_000,
+                            help='Groups per sensitive attribute')
+        parser.add_argument('--attributes', type=int, default=2,
+                            help='Number of sensitive attributes')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of timed repetitions (best time is reported)')
+
+    def handle(self, *args, **options):
+        result = self.build_result(options['groups'], options['attributes'])
+
+        def save_before():
+            # dumps/loads round trip, then the encode done on save
+            loaded = json.loads(json.dumps(result, cls=NumpyEncoder))
+            return json.dumps(loaded, separators=(',', ':')).encode()
+
+        def save_after():
+            return dumps(to_json(result))
+
+        def respond_before():
+            return JsonResponse({'success': True, 'bias_results': result}, encoder=NumpyEncoder)
+
+        def respond_after():
+            return ResultJsonResponse({'success': True, 'bias_results': result})
+
+        self.stdout.write(
+            f"groups={options['groups']} attributes={options['attributes']} "
+            f"size={len(save_after()) / 1024:.0f}KB orjson={'yes' if serialization.orjson else 'no'}"
+        )
+        self.stdout.write(f"{'path':<10} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+        for label, before, after in (('save', save_before, save_after), ('response', respond_before, respond_after)):
+            before_time = best_time(before, options['repeat'])
+            after_time = best_time(after, options['repeat'])
+            self.stdout.write(
+                f"{label:<10} {before_time * 1000:>12.2f} {after_time * 1000:>12.2f} "
+                f"{before_time / after_time:>7.1f}x"
+            )
+
+    @staticmethod
+    def build_result(groups, attributes):
+        """A detect_bias_in_data shaped result whose per-group values are NumPy scalars"""
+        rng = np.random.default_rng(42)
+        result = {'dataset_size': np.int64(groups * 100), 'attribute_distribution': {}, 'statistical_parity': {}}
+        for i in range(attributes):
+            attr = f'attribute_{i}'
+            counts = rng.integers(1, 200, size=groups)
+            rates = rng.random(groups)
+            result['attribute_distribution'][attr] = {
+                f'group_{g}': counts[g] / counts.sum() for g in range(groups)
+            }
+            result['statistical_parity'][attr] = {
+                'group_rates': {f'group_{g}': rates[g] for g in range(groups)},
+                'group_counts': {f'group_{g}': counts[g] for g in range(groups)},
+                'parity_difference': rates.max() - rates.min(),
+                'rates': rates
+            }
+        return result
@@ -0,0 +1,18 @@
+"""
+Seeds an empty database with the demonstration analyses, case studies and resources
+"""
+
+from django.core.management.base import BaseCommand
+
+from dashboard.sample_data import populate_sample_data
+
+
+class Command(BaseCommand):
+    help = ("Loads the sample analyses, case studies and educational resources "
+            "unless the database already has all three")
+
+    def handle(self, *args, **options):
+        if populate_sample_data():
+            self.stdout.write(self.style.SUCCESS("Sample data has been loaded"))
+        else:
+            self.stdout.write("Sample data already present; nothing loaded")
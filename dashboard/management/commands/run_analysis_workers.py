@@ -0,0 +1,66 @@
+"""
+Starts local worker processes that run queued bias and transparency analyses
+"""
+
+import multiprocessing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_process(poll_interval, max_jobs, stop_when_idle):
+    """Entry point of a worker process"""
+    import django
+    django.setup()
+
+    from dashboard.jobs import run_worker
+    run_worker(poll_interval=poll_interval, max_jobs=max_jobs, stop_when_idle=stop_when_idle)
+
+
+class Command(BaseCommand):
+    help = "Runs worker processes that process the analysis job queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.ANALYSIS_JOB_WORKERS,
+                            help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=settings.ANALYSIS_JOB_POLL_INTERVAL,
+                            help='Seconds an idle worker waits before checking the queue again')
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help='Jobs each worker runs before exiting')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        from dashboard.jobs import requeue_stale_jobs, run_worker
+
+        requeued, failed = requeue_stale_jobs()
+        if requeued or failed:
+            self.stdout.write(f"Requeued {requeued} stale job(s), failed {failed}")
+
+        worker_args = (options['poll_interval'], options['max_jobs'], options['once'])
+        workers = max(1, options['workers'])
+
+        if workers == 1:
+            processed = run_worker(*worker_args)
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)"))
+            return
+
+        # Children must not share the parent's database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker_process, args=worker_args, daemon=False)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {workers} analysis workers")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
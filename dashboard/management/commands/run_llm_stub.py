@@ -0,0 +1,51 @@
+"""
+Serves the local Gemini stand-in used with LLM_BACKEND=stub
+"""
+
+from django.core.management.base import BaseCommand
+
+from dashboard.llm_stub import StubLLMServer
+
+
+class Command(BaseCommand):
+    help = "Runs a local LLM stub server with deterministic responses and injectable latency and errors"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--response-size', type=int, default=2000,
+                            help='Approximate characters per response')
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help='Seconds each request waits before answering')
+        parser.add_argument('--latency-jitter', type=float, default=0.0,
+                            help='Extra random wait of up to this many seconds')
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Fraction of requests answered with an error')
+        parser.add_argument('--error-status', type=int, default=503,
+                            help='HTTP status of injected errors')
+        parser.add_argument('--chunk-delay', type=float, default=0.0,
+                            help='Seconds between lines of streamed responses')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed for latency and error draws')
+
+    def handle(self, *args, **options):
+        stub = StubLLMServer(
+            host=options['host'],
+            port=options['port'],
+            response_size=options['response_size'],
+            latency=options['latency'],
+            latency_jitter=options['latency_jitter'],
+            error_rate=options['error_rate'],
+            error_status=options['error_status'],
+            chunk_delay=options['chunk_delay'],
+            seed=options['seed']
+        )
+        self.stdout.write(f"LLM stub listening on {stub.url} (set LLM_BACKEND=stub LLM_STUB_URL={stub.url})")
+
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.httpd.server_close()
+            self.stdout.write(f"Served {stub.requests} request(s), {stub.failures} injected failure(s)")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_analysisjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisjob',
+            name='events',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
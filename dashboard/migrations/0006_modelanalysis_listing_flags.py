@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-18 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_listing_flags(apps, schema_editor):
+    ModelAnalysis = apps.get_model('dashboard', 'ModelAnalysis')
+    ModelAnalysis.objects.filter(bias_analysis__isnull=False).update(has_bias=True)
+    ModelAnalysis.objects.filter(transparency_analysis__isnull=False).update(has_transparency=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_analysisjob_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='has_bias',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='has_transparency',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(set_listing_flags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='modelanalysis',
+            index=models.Index(condition=models.Q(('has_bias', True)), fields=['-created_at'], name='analysis_bias_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelanalysis',
+            index=models.Index(condition=models.Q(('has_transparency', True)), fields=['-created_at'], name='analysis_transparency_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelanalysis',
+            index=models.Index(fields=['user', '-created_at'], name='dashboard_m_user_id_d88006_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['user', '-created_at'], name='dashboard_u_user_id_5b711f_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 04:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_modelanalysis_listing_flags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='summary',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.CreateModel(
+            name='AnalysisResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('bias_analysis', 'Bias Analysis'), ('transparency_analysis', 'Transparency Analysis'), ('fairness_metrics', 'Fairness Metrics')], max_length=30)),
+                ('codec', models.CharField(max_length=10)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+                ('analysis', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='dashboard.modelanalysis')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('analysis', 'kind'), name='unique_analysis_result_kind')],
+            },
+        ),
+    ]
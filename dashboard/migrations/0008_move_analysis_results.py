@@ -0,0 +1,104 @@
+# Generated by Django 5.2 on 2026-10-18 04:35
+
+import gzip
+import json
+
+from django.db import migrations
+
+# Frozen copies of the result_store helpers as they were when the results
+# were moved, so this migration does the same whatever the app code becomes
+
+RESULT_KINDS = ('bias_analysis', 'transparency_analysis', 'fairness_metrics')
+TOP_FEATURES = 5
+
+
+def compress_result(value):
+    data = json.dumps(value, separators=(',', ':')).encode()
+    return gzip.compress(data, compresslevel=6, mtime=0), len(data)
+
+
+def decompress_result(data, codec):
+    data = bytes(data)
+    if codec == 'zstd':
+        import zstandard
+        return json.loads(zstandard.ZstdDecompressor().decompress(data))
+    return json.loads(gzip.decompress(data))
+
+
+def summarize_result(kind, value):
+    if not isinstance(value, dict):
+        return {}
+
+    summary = {}
+    if 'error' in value:
+        summary['error'] = value['error']
+
+    if kind == 'bias_analysis':
+        summary['dataset_size'] = value.get('dataset_size')
+        summary['risk_levels'] = {
+            attr: assessment.get('risk_level')
+            for attr, assessment in (value.get('overall_assessment') or {}).items()
+        }
+        parity = {
+            attr: result['parity_difference']
+            for attr, result in (value.get('statistical_parity') or {}).items()
+            if isinstance(result, dict) and isinstance(result.get('parity_difference'), (int, float))
+        }
+        summary['parity_difference'] = parity
+        summary['max_parity_difference'] = max(map(abs, parity.values()), default=None)
+
+    elif kind == 'transparency_analysis':
+        importance = value.get('feature_importance') or {}
+        top_features = importance.get('top_features')
+        if top_features is None:
+            scores = {name: score for name, score in importance.items() if isinstance(score, (int, float))}
+            top_features = sorted(scores, key=scores.get, reverse=True)
+        summary['top_features'] = list(top_features)[:TOP_FEATURES]
+        summary['complexity_level'] = (value.get('model_complexity') or {}).get('complexity_level')
+
+    elif kind == 'fairness_metrics':
+        summary['fairness_assessment'] = {
+            attr: metrics.get('fairness_assessment')
+            for attr, metrics in (value.get('metrics_by_attribute') or {}).items()
+            if isinstance(metrics, dict) and 'fairness_assessment' in metrics
+        }
+
+    return summary
+
+
+def move_results_out(apps, schema_editor):
+    """Compresses the inline JSON results into AnalysisResult rows and summarizes them"""
+    ModelAnalysis = apps.get_model('dashboard', 'ModelAnalysis')
+    AnalysisResult = apps.get_model('dashboard', 'AnalysisResult')
+
+    for analysis in ModelAnalysis.objects.iterator(chunk_size=200):
+        summary = {}
+        for kind in RESULT_KINDS:
+            value = getattr(analysis, kind)
+            summary[kind] = summarize_result(kind, value)
+            if value is not None:
+                data, size = compress_result(value)
+                AnalysisResult.objects.create(analysis=analysis, kind=kind, codec='gzip', data=data, size=size)
+        ModelAnalysis.objects.filter(pk=analysis.pk).update(summary=summary)
+
+
+def move_results_back(apps, schema_editor):
+    ModelAnalysis = apps.get_model('dashboard', 'ModelAnalysis')
+    AnalysisResult = apps.get_model('dashboard', 'AnalysisResult')
+
+    for result in AnalysisResult.objects.iterator(chunk_size=200):
+        ModelAnalysis.objects.filter(pk=result.analysis_id).update(
+            **{result.kind: decompress_result(result.data, result.codec)}
+        )
+    AnalysisResult.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_analysisresult'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_results_out, move_results_back),
+    ]
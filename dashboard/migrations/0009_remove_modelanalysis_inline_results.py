@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 04:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_move_analysis_results'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='modelanalysis',
+            name='bias_analysis',
+        ),
+        migrations.RemoveField(
+            model_name='modelanalysis',
+            name='fairness_metrics',
+        ),
+        migrations.RemoveField(
+            model_name='modelanalysis',
+            name='transparency_analysis',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_cacheversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisjob',
+            name='dataset',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
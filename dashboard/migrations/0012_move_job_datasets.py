@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-18 09:13
+
+import gzip
+
+from django.core.files.base import ContentFile
+from django.db import migrations
+
+# Frozen copy of the jobs helper as it was when the datasets were moved, so
+# this migration does the same whatever the app code becomes
+
+
+def compress_dataset(data):
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def move_datasets_in(apps, schema_editor):
+    AnalysisJob = apps.get_model('dashboard', 'AnalysisJob')
+    for job in AnalysisJob.objects.exclude(data_file='').only('pk', 'data_file').iterator():
+        try:
+            with job.data_file.open('rb') as data_file:
+                job.dataset = compress_dataset(data_file.read())
+        except OSError:
+            # Files the web process kept on a disk this process cannot see
+            continue
+        job.save(update_fields=['dataset'])
+        job.data_file.delete(save=False)
+
+
+def move_datasets_out(apps, schema_editor):
+    AnalysisJob = apps.get_model('dashboard', 'AnalysisJob')
+    for job in AnalysisJob.objects.filter(dataset__isnull=False).only('pk', 'dataset').iterator():
+        job.data_file.save(f"{job.pk}.csv", ContentFile(gzip.decompress(bytes(job.dataset))), save=False)
+        job.dataset = None
+        job.save(update_fields=['data_file', 'dataset'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0011_analysisjob_dataset'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_datasets_in, move_datasets_out),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 09:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0012_move_job_datasets'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='analysisjob',
+            name='data_file',
+        ),
+    ]
@@ -0,0 +1,251 @@
+"""
+Content-addressed cache of fitted surrogate models
+Keeps recently used models in memory and spills them to disk under MEDIA_ROOT
+"""
+
+from collections import OrderedDict
+import gzip
+import hashlib
+import os
+import pickle
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+# Bumped whenever the surrogate model definition changes, invalidating old entries
+CACHE_VERSION = 1
+
+# Disk entries are gzipped pickles; '.joblib' files of earlier versions are only trimmed
+DISK_SUFFIX = '.pickle.gz'
+LEGACY_DISK_SUFFIXES = ('.joblib',)
+
+
+def make_cache_key(X, y, model_type, **model_params):
+    """
+    Builds a content hash for a surrogate model
+
+    Parameters:
+    -----------
+    X : numpy.ndarray
+        Preprocessed feature matrix
+    y : numpy.ndarray
+        Target vector
+    model_type : str
+        Type of model (classification, regression)
+    **model_params
+        Hyperparameters that change the fitted model
+
+    Returns:
+    --------
+    str
+        Hex SHA-256 digest identifying the model
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}|{model_type}|{sorted(model_params.items())}".encode())
+
+    for array in (X, y):
+        array = np.asarray(array)
+        digest.update(f"|{array.dtype.str}|{array.shape}|".encode())
+        if array.dtype.kind == 'O':
+            digest.update(pickle.dumps(array.tolist(), protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            digest.update(np.ascontiguousarray(array).data)
+
+    return digest.hexdigest()
+
+
+class SurrogateModelCache:
+    """
+    Two-tier LRU cache of fitted models keyed by content hash
+
+    The memory tier holds model objects up to max_bytes (measured by their
+    pickled size). When disk_dir is set, every stored model is also written
+    there, from the same pickle, and the directory is trimmed to
+    disk_max_bytes, oldest first.
+    """
+
+    def __init__(self, max_bytes, disk_dir=None, disk_max_bytes=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns (model, tier) for a key, where tier is 'memory', 'disk' or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], 'memory'
+
+        entry = self._load_from_disk(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        model, nbytes = entry
+        with self._lock:
+            self.disk_hits += 1
+            self._store_in_memory(key, model, nbytes)
+        return model, 'disk'
+
+    def put(self, key, model):
+        """Stores a fitted model under a key"""
+        # Pickled once: the size of the memory entry and the disk entry's content
+        payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._store_in_memory(key, model, len(payload))
+
+        self._write_to_disk(key, payload)
+
+    def clear(self):
+        """Empties the memory tier"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self):
+        """Bytes currently held in the memory tier"""
+        return self._size
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _store_in_memory(self, key, model, nbytes):
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[1]
+
+        # Models larger than the whole memory budget only live on disk
+        if nbytes > self.max_bytes:
+            return
+
+        self._entries[key] = (model, nbytes)
+        self._size += nbytes
+
+        while self._size > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._size -= evicted_bytes
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}{DISK_SUFFIX}")
+
+    def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with gzip.open(path, 'rb') as f:
+                payload = f.read()
+            model = pickle.loads(payload)
+        except Exception:
+            # Partially written or unreadable entries are dropped
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        # Mark as recently used for disk eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return model, len(payload)
+
+    def _write_to_disk(self, key, payload):
+        if not self.disk_dir:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp_path, 'wb', compresslevel=3) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._trim_disk()
+
+    def _trim_disk(self):
+        if not self.disk_max_bytes:
+            return
+
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith((DISK_SUFFIX,) + LEGACY_DISK_SUFFIXES):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Returns the process-wide cache configured by the SURROGATE_CACHE_* settings,
+    or None when caching is disabled
+    """
+    global _default_cache
+
+    if not settings.SURROGATE_CACHE_ENABLED:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SurrogateModelCache(
+                max_bytes=settings.SURROGATE_CACHE_MAX_BYTES,
+                disk_dir=settings.SURROGATE_CACHE_DISK_DIR,
+                disk_max_bytes=settings.SURROGATE_CACHE_DISK_MAX_BYTES
+            )
+        return _default_cache
+
+
+@receiver(setting_changed)
+def reset_default_cache(sender, setting, **kwargs):
+    """Rebuild the default cache when its settings change (e.g. in tests)"""
+    global _default_cache
+    if setting.startswith('SURROGATE_CACHE_'):
+        with _default_cache_lock:
+            _default_cache = None
@@ -1,9 +1,14 @@
-from django.db import models
+import uuid
+
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from .result_store import RESULT_KINDS, compress_result, decompress_result, summarize_result
+
 class UserProfile(models.Model):
     """Extended user profile for AI Ethics Platform users"""
     
@@ -41,10 +46,31 @@ class UserActivity(models.Model):
     class Meta:
         verbose_name_plural = "User Activities"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'])
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.activity_type}"
 
+def stored_result(kind):
+    """
+    Property exposing one kind of AnalysisResult as a plain JSON value
+    
+    The result is read (and decompressed) on first access; values assigned
+    to it are written when the analysis is saved.
+    """
+    def get(self):
+        if kind not in self._results:
+            self.load_results(kind)
+        return self._results[kind]
+    
+    def set(self, value):
+        self._results[kind] = value
+        self._changed_results.add(kind)
+    
+    return property(get, set, doc=f"The {kind.replace('_', ' ')} of this analysis, or None")
+
 class ModelAnalysis(models.Model):
     """Model for storing AI model analysis results"""
     
@@ -84,13 +110,201 @@ class ModelAnalysis(models.Model):
     # Link to user if authenticated
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='model_analyses')
     
-    # Analysis results stored as JSON
-    bias_analysis = models.JSONField(null=True, blank=True)
-    transparency_analysis = models.JSONField(null=True, blank=True)
-    fairness_metrics = models.JSONField(null=True, blank=True)
+    # Analysis results, stored compressed in AnalysisResult and loaded on demand
+    bias_analysis = stored_result('bias_analysis')
+    transparency_analysis = stored_result('transparency_analysis')
+    fairness_metrics = stored_result('fairness_metrics')
+    
+    # Kept in step with the results by save(): whether they are set, which
+    # listings filter on, and a summary of each (see result_store.summarize_result)
+    has_bias = models.BooleanField(default=False, editable=False)
+    has_transparency = models.BooleanField(default=False, editable=False)
+    summary = models.JSONField(default=dict, blank=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            # Partial indexes: SQLite cannot use (has_bias, created_at) for a bare
+            # boolean filter, and rows without results are never listed
+            models.Index(fields=['-created_at'], condition=models.Q(has_bias=True), name='analysis_bias_listing_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(has_transparency=True),
+                         name='analysis_transparency_list_idx'),
+            models.Index(fields=['user', '-created_at'])
+        ]
     
     def __str__(self):
         return self.name
+    
+    @property
+    def _results(self):
+        return self.__dict__.setdefault('_result_cache', {})
+    
+    @property
+    def _changed_results(self):
+        return self.__dict__.setdefault('_changed_result_kinds', set())
+    
+    def load_results(self, *kinds):
+        """
+        Reads results from storage in one query; returns them as {kind: value}
+        
+        Kinds already loaded or assigned are not read again. Kinds without a
+        stored result are None.
+        """
+        kinds = kinds or RESULT_KINDS
+        missing = [kind for kind in kinds if kind not in self._results]
+        if missing:
+            stored = {}
+            if self.pk is not None:
+                stored = {
+                    result.kind: decompress_result(result.data, result.codec)
+                    for result in AnalysisResult.objects.filter(analysis=self, kind__in=missing)
+                }
+            for kind in missing:
+                self._results[kind] = stored.get(kind)
+        return {kind: self._results[kind] for kind in kinds}
+    
+    def save(self, *args, **kwargs):
+        changed = sorted(self._changed_results)
+        summary = dict(self.summary)
+        for kind in changed:
+            summary[kind] = summarize_result(kind, self._results[kind])
+        self.summary = summary
+        if 'bias_analysis' in changed:
+            self.has_bias = self._results['bias_analysis'] is not None
+        if 'transparency_analysis' in changed:
+            self.has_transparency = self._results['transparency_analysis'] is not None
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields) - set(RESULT_KINDS)
+            if changed:
+                update_fields |= {'summary', 'has_bias', 'has_transparency'}
+            kwargs['update_fields'] = update_fields
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            for kind in changed:
+                value = self._results[kind]
+                if value is None:
+                    AnalysisResult.objects.filter(analysis=self, kind=kind).delete()
+                    continue
+                data, size = compress_result(value, settings.ANALYSIS_RESULT_CODEC)
+                AnalysisResult.objects.update_or_create(
+                    analysis=self, kind=kind,
+                    defaults={'codec': settings.ANALYSIS_RESULT_CODEC, 'data': data, 'size': size}
+                )
+        self._changed_results.clear()
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._results.clear()
+        self._changed_results.clear()
+
+class AnalysisResult(models.Model):
+    """Compressed JSON result of a ModelAnalysis (see result_store)"""
+    
+    KINDS = [
+        ('bias_analysis', 'Bias Analysis'),
+        ('transparency_analysis', 'Transparency Analysis'),
+        ('fairness_metrics', 'Fairness Metrics')
+    ]
+    
+    analysis = models.ForeignKey(ModelAnalysis, on_delete=models.CASCADE, related_name='results')
+    kind = models.CharField(max_length=30, choices=KINDS)
+    codec = models.CharField(max_length=10)
+    data = models.BinaryField()
+    # Size of the uncompressed JSON in bytes
+    size = models.PositiveIntegerField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['analysis', 'kind'], name='unique_analysis_result_kind')
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} of analysis {self.analysis_id}"
+
+class AnalysisJob(models.Model):
+    """Queued bias or transparency analysis run by a background worker"""
+    
+    JOB_TYPES = [
+        ('bias', 'Bias Detection'),
+        ('transparency', 'Transparency Analysis')
+    ]
+    
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUSES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed')
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job_type = models.CharField(max_length=20, choices=JOB_TYPES)
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_QUEUED)
+    
+    # Analysis parameters and the uploaded (or manually built) dataset, a
+    # gzipped CSV kept in the row so every worker can read it (see jobs)
+    payload = models.JSONField(default=dict)
+    dataset = models.BinaryField(null=True, blank=True)
+    
+    # Progress reported by the worker
+    stage = models.CharField(max_length=50, blank=True)
+    progress = models.FloatField(default=0)
+    events = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='analysis_jobs')
+    analysis = models.ForeignKey(ModelAnalysis, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'])
+        ]
+    
+    def __str__(self):
+        return f"{self.get_job_type_display()} job {self.id} ({self.status})"
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+class CacheVersion(models.Model):
+    """
+    Version counter shared by all processes
+    
+    Values cached per process are stored under the current version, so
+    bumping it invalidates them everywhere at the cost of one lookup.
+    """
+    
+    key = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+    
+    @classmethod
+    def current(cls, key):
+        return cls.objects.filter(key=key).values_list('version', flat=True).first() or 0
+    
+    @classmethod
+    def bump(cls, key):
+        if not cls.objects.filter(key=key).update(version=models.F('version') + 1):
+            _, created = cls.objects.get_or_create(key=key, defaults={'version': 1})
+            if not created:
+                cls.objects.filter(key=key).update(version=models.F('version') + 1)
 
 class CaseStudy(models.Model):
     """Model for storing AI ethics case studies"""
@@ -0,0 +1,147 @@
+"""
+Parallel accumulation of fairness statistics across sensitive attributes
+Each attribute is counted by its own worker in a thread or process pool
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+import pandas as pd
+
+from .fairness_stats import FairnessStatsAccumulator, combine_attribute_accumulators
+
+BACKENDS = ('thread', 'process')
+
+
+def accumulate_parallel(df, sensitive_attributes, target_column=None, prediction_column=None,
+                        n_jobs=None, backend='thread'):
+    """
+    Builds a FairnessStatsAccumulator with one worker per sensitive attribute
+
+    The thread backend shares the DataFrame directly. The process backend
+    places the needed columns in shared memory once (non-numeric columns as
+    integer codes) so workers read them without copying or pickling rows.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        The dataset
+    sensitive_attributes : list
+        List of column names that contain sensitive attributes
+    target_column : str, optional
+        Actual outcome column
+    prediction_column : str, optional
+        Predicted outcome column
+    n_jobs : int, optional
+        Number of workers (defaults to the number of CPUs)
+    backend : str
+        'thread' or 'process'
+
+    Returns:
+    --------
+    FairnessStatsAccumulator
+        Accumulator equivalent to FairnessStatsAccumulator.from_dataframe
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}, expected one of {', '.join(BACKENDS)}")
+
+    sensitive_attributes = list(dict.fromkeys(sensitive_attributes))
+    attrs = [attr for attr in sensitive_attributes if attr in df.columns]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(attrs))
+
+    if n_jobs <= 1:
+        return FairnessStatsAccumulator.from_dataframe(df, sensitive_attributes, target_column, prediction_column)
+
+    if backend == 'thread':
+        build = partial(_accumulate_attribute, df, target_column=target_column,
+                        prediction_column=prediction_column)
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            parts = list(executor.map(build, attrs))
+    else:
+        outcome_columns = [col for col in (target_column, prediction_column) if col and col in df.columns]
+        with SharedColumns(df, attrs + outcome_columns) as shared:
+            build = partial(_accumulate_shared_attribute, shared.specs,
+                            target_column=target_column, prediction_column=prediction_column)
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                parts = list(executor.map(build, attrs))
+
+    return combine_attribute_accumulators(parts, sensitive_attributes, df.columns)
+
+
+class SharedColumns:
+    """
+    Context manager that copies DataFrame columns into shared memory blocks
+
+    Numeric columns are shared as-is. Other columns are factorized so only
+    their integer codes are shared, with the (small) list of distinct values
+    sent to workers alongside the block name.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = list(dict.fromkeys(columns))
+        self.specs = {}
+        self._blocks = []
+
+    def __enter__(self):
+        try:
+            for col in self.columns:
+                series = self.df[col]
+                if series.dtype.kind in 'biuf':
+                    values, uniques = series.to_numpy(), None
+                else:
+                    values, uniques = pd.factorize(series, sort=False)
+
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+                self.specs[col] = (block.name, values.dtype.str, len(values), uniques)
+        except Exception:
+            self._release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._release()
+        return False
+
+    def _release(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def _accumulate_attribute(df, attr, target_column=None, prediction_column=None):
+    accumulator = FairnessStatsAccumulator([attr], target_column, prediction_column)
+    accumulator.update(df)
+    return accumulator
+
+
+def _accumulate_shared_attribute(specs, attr, target_column=None, prediction_column=None):
+    columns = [attr] + [col for col in (target_column, prediction_column) if col in specs]
+    blocks = [shared_memory.SharedMemory(name=specs[col][0]) for col in columns]
+
+    try:
+        return _accumulate_attribute(_frame_from_blocks(specs, columns, blocks), attr,
+                                     target_column, prediction_column)
+    finally:
+        # The frame viewing the blocks is gone once the call above returns
+        for block in blocks:
+            block.close()
+
+
+def _frame_from_blocks(specs, columns, blocks):
+    data = {}
+    for col, block in zip(columns, blocks):
+        _, dtype, length, uniques = specs[col]
+        values = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)
+        if uniques is None:
+            data[col] = values
+        else:
+            # Categories keep the first-appearance order of factorize
+            data[col] = pd.Categorical.from_codes(values, categories=uniques)
+    return pd.DataFrame(data, copy=False)
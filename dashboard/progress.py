@@ -0,0 +1,47 @@
+"""
+Progress reporting for long-running analyses
+
+Analysis functions accept an optional ``progress`` callable and call it as
+``progress(stage, rows_processed=None, total_rows=None, fraction=None)``
+whenever they enter a stage or finish a chunk of rows. A ProgressTracker is
+such a callable: it stamps each call with the elapsed time and hands the
+resulting event to a callback.
+"""
+
+import time
+
+
+class ProgressTracker:
+    """
+    Turns progress calls into numbered events
+
+    Each event is a dict with the stage name, rows processed and total rows
+    (None when not applicable), the fraction of the whole analysis complete
+    (None when unknown), seconds elapsed since the tracker was created and a
+    sequence number, counted on from the given last sequence number.
+    """
+
+    def __init__(self, callback=None, sequence=0):
+        self.callback = callback
+        self.start = time.perf_counter()
+        self.sequence = sequence
+
+    def __call__(self, stage, rows_processed=None, total_rows=None, fraction=None):
+        self.sequence += 1
+        event = {
+            'seq': self.sequence,
+            'stage': stage,
+            'rows_processed': None if rows_processed is None else int(rows_processed),
+            'total_rows': None if total_rows is None else int(total_rows),
+            'fraction': fraction,
+            'elapsed': round(time.perf_counter() - self.start, 3)
+        }
+        if self.callback is not None:
+            self.callback(event)
+        return event
+
+
+def report_progress(progress, stage, rows_processed=None, total_rows=None, fraction=None):
+    """Calls a progress hook if one was given"""
+    if progress is not None:
+        progress(stage, rows_processed=rows_processed, total_rows=total_rows, fraction=fraction)
@@ -0,0 +1,162 @@
+"""
+Compact prompt construction for the AI ethics analysis
+Keeps dataset prompts within a token budget on wide datasets
+"""
+
+import json
+import math
+
+from .structured_output import response_format_instructions
+
+# Rough characters per token for English text and compact JSON
+CHARS_PER_TOKEN = 4
+MAX_SAMPLE_ROWS = 5
+# Columns besides the sensitive attributes and target shown in sample rows
+SAMPLE_ROW_EXTRA_COLUMNS = 5
+
+# Result keys with the (description, keyword) the model is asked for and
+# plain-text answers are searched by
+DATASET_ETHICS_SECTIONS = {
+    "ethical_concerns": ("Potential ethical concerns in this dataset", "ethical concerns"),
+    "bias_patterns": ("Bias patterns that might exist related to sensitive attributes", "bias patterns"),
+    "representation_issues": ("Data representation issues (missing groups, imbalanced classes)", "representation issues"),
+    "recommendations": ("Recommendations for mitigating these issues", "recommendations"),
+    "deployment_considerations": ("Ethical considerations for model deployment", "deployment")
+}
+
+DATASET_ETHICS_INSTRUCTIONS = (
+    "Write a detailed ethics analysis suitable for a business audience.\n"
+    + response_format_instructions(DATASET_ETHICS_SECTIONS)
+)
+
+
+def estimate_tokens(text):
+    """Estimates the number of tokens in a text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def compact_json(value):
+    """Serializes a value without whitespace"""
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def column_detail(name, df_info):
+    """One line describing a column with its statistics"""
+    dtype = df_info.get('data_types', {}).get(name, '')
+    missing = df_info.get('missing_values', {}).get(name, 0)
+    stats = df_info.get('statistics', {}).get(name, {})
+    return f"- {name} ({dtype}, missing={missing}): {compact_json(stats)}"
+
+
+def column_summary(name, df_info):
+    """One line naming a column and its type"""
+    return f"- {name} ({df_info.get('data_types', {}).get(name, '')})"
+
+
+def build_dataset_ethics_prompt(df_info, sensitive_attributes, sample_dataset_type=None, token_budget=None):
+    """
+    Builds the dataset ethics prompt within a token budget
+
+    Sensitive attributes and the target column are always described in full
+    and come first. Sample rows follow, restricted to those columns and a few
+    others. The remaining columns are then listed by name and type in dataset
+    order while they fit the budget, the rest only counted; whatever budget
+    is left adds statistics to the listed columns, again in dataset order.
+
+    Parameters:
+    -----------
+    df_info : dict
+        Dataset summary from bias_detection.summarize_dataset
+    sensitive_attributes : list
+        Sensitive attribute columns
+    sample_dataset_type : str, optional
+        Type of dataset being analyzed
+    token_budget : int, optional
+        Estimated tokens the prompt may use; None for no limit
+
+    Returns:
+    --------
+    tuple
+        (prompt, prompt_stats) where prompt_stats records the estimated tokens,
+        characters and how many columns were detailed, summarized or dropped
+    """
+    columns = list(df_info.get('columns', []))
+    target = (df_info.get('target_column') or {}).get('name')
+    priority = [col for col in sensitive_attributes if col in columns]
+    if target in columns and target not in priority:
+        priority.append(target)
+    others = [col for col in columns if col not in priority]
+
+    shape = df_info.get('shape') or (0, len(columns))
+    header = (
+        "Analyze this dataset for potential ethical issues and bias.\n\n"
+        f"Dataset: {shape[0]} rows, {shape[1]} columns\n"
+        f"Dataset Type: {sample_dataset_type or 'Not specified'}\n"
+        f"Sensitive Attributes: {', '.join(sensitive_attributes)}\n"
+    )
+    if target:
+        target_info = df_info['target_column']
+        header += f"Target: {target} ({target_info.get('type')}), distribution {compact_json(target_info.get('distribution'))}\n"
+
+    sections = [header, "Key columns:\n" + '\n'.join(column_detail(col, df_info) for col in priority)]
+    footer = '\n' + DATASET_ETHICS_INSTRUCTIONS
+    used = estimate_tokens('\n'.join(sections) + footer)
+
+    def fits(text):
+        return token_budget is None or used + estimate_tokens(text) + 1 <= token_budget
+
+    # Sample rows over the key columns and a few others, as many rows as fit
+    sample_columns = priority + others[:SAMPLE_ROW_EXTRA_COLUMNS]
+    sample_rows = [
+        [row.get(col) for col in sample_columns]
+        for row in df_info.get('sample_rows', [])[:MAX_SAMPLE_ROWS]
+    ]
+    while sample_rows:
+        sample_text = f"Sample rows {compact_json(sample_columns)}:\n" + '\n'.join(map(compact_json, sample_rows))
+        if fits(sample_text):
+            sections.append(sample_text)
+            used += estimate_tokens(sample_text) + 1
+            break
+        sample_rows.pop()
+
+    if others:
+        # Room for the section heading and the omitted-columns note
+        used += estimate_tokens(f"Other columns:\n(+{len(others)} more columns omitted)") + 2
+
+    # Name as many of the other columns as fit, then give them statistics in order
+    lines = {}
+    for col in others:
+        line = column_summary(col, df_info)
+        if not fits(line):
+            break
+        lines[col] = line
+        used += estimate_tokens(line) + 1
+
+    detailed = 0
+    for col in lines:
+        line = column_detail(col, df_info)
+        extra = estimate_tokens(line) - estimate_tokens(lines[col])
+        if token_budget is not None and used + extra > token_budget:
+            break
+        lines[col] = line
+        used += extra
+        detailed += 1
+
+    dropped = len(others) - len(lines)
+    if others:
+        other_text = "Other columns:\n" + '\n'.join(lines.values())
+        if dropped:
+            other_text += f"\n(+{dropped} more columns omitted)"
+        sections.append(other_text)
+
+    prompt = '\n\n'.join(sections) + '\n' + footer
+    prompt_stats = {
+        'estimated_tokens': estimate_tokens(prompt),
+        'characters': len(prompt),
+        'token_budget': token_budget,
+        'columns_detailed': len(priority) + detailed,
+        'columns_summarized': len(lines) - detailed,
+        'columns_dropped': dropped,
+        'sample_rows': len(sample_rows)
+    }
+    return prompt, prompt_stats
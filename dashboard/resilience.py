@@ -0,0 +1,145 @@
+"""
+Retries and a circuit breaker for calls to external AI services
+"""
+
+from collections import Counter
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit breaker is open"""
+
+
+def retry_with_backoff(func, retries, base_delay, max_delay, retry_on=(Exception,), sleep=time.sleep):
+    """
+    Calls func, retrying failures with exponential backoff
+
+    Parameters:
+    -----------
+    func : callable
+        Called without arguments
+    retries : int
+        Retries after the first attempt
+    base_delay : float
+        Seconds to wait before the first retry; doubled for each further retry
+    max_delay : float
+        Upper bound on a single wait
+    retry_on : tuple
+        Exception types worth retrying; anything else is raised at once
+    sleep : callable
+        Used to wait between attempts
+
+    Each wait is drawn between half and all of its backoff step (jitter) so
+    that callers which failed together do not retry together.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except retry_on:
+            if attempt == retries:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt)
+            sleep(delay * random.uniform(0.5, 1))
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service until it has had time to recover
+
+    The breaker is closed while calls succeed. After failure_threshold
+    consecutive failures it opens and allow_request() returns False for
+    reset_timeout seconds. Then it is half-open: one trial call is let
+    through; success closes the breaker and failure opens it again.
+
+    transitions counts how often the breaker moved into each state and
+    rejected counts the calls it turned away.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold, reset_timeout, name='circuit', clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+        self.transitions = Counter()
+        self.rejected = 0
+
+    def allow_request(self):
+        """Returns whether a call may go ahead now"""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Records a successful call"""
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        """Records a failed call"""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = self.clock()
+                self._transition(self.OPEN)
+
+    def call(self, func):
+        """Calls func through the breaker, raising CircuitOpenError while it is open"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable; skipping the call")
+        try:
+            result = func()
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def metrics(self):
+        """Current state and counters, e.g. for a health endpoint"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'opened': self.transitions[self.OPEN],
+                'closed': self.transitions[self.CLOSED],
+                'half_opened': self.transitions[self.HALF_OPEN],
+                'rejected': self.rejected
+            }
+
+    def _transition(self, state):
+        self.state = state
+        self.transitions[state] += 1
+        # Counted in transitions for the status endpoint; an opening circuit is also worth a warning
+        level = logging.WARNING if state == self.OPEN else logging.INFO
+        logger.log(level, "Circuit breaker %s is now %s", self.name, state)
@@ -0,0 +1,106 @@
+"""
+Compressed storage for the JSON results of a ModelAnalysis
+Results live in AnalysisResult rows, one per kind, and are only decompressed
+when read; the analysis row keeps a small summary for listings and filters
+"""
+
+import gzip
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .serialization import dumps
+
+# Result kinds, named after the ModelAnalysis attributes that expose them
+RESULT_KINDS = ('bias_analysis', 'transparency_analysis', 'fairness_metrics')
+
+CODECS = ('gzip', 'zstd')
+TOP_FEATURES = 5
+
+
+def _zstd():
+    # zstd needs the optional zstandard package; gzip works everywhere
+    try:
+        import zstandard
+    except ImportError:
+        raise ImproperlyConfigured("ANALYSIS_RESULT_CODEC='zstd' requires the zstandard package")
+    return zstandard
+
+
+def compress_result(value, codec='gzip'):
+    """Serializes a JSON result compactly and compresses it with codec"""
+    data = dumps(value)
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0), len(data)
+    if codec == 'zstd':
+        return _zstd().ZstdCompressor(level=6).compress(data), len(data)
+    raise ImproperlyConfigured(f"Unknown analysis result codec: {codec}")
+
+
+def decompress_result(data, codec):
+    """Inverse of compress_result"""
+    data = bytes(data)
+    if codec == 'gzip':
+        return json.loads(gzip.decompress(data))
+    if codec == 'zstd':
+        return json.loads(_zstd().ZstdDecompressor().decompress(data))
+    raise ValueError(f"Unknown analysis result codec: {codec}")
+
+
+def summarize_result(kind, value):
+    """
+    The few values of a result that listings show or filter on
+
+    Parameters:
+    -----------
+    kind : str
+        One of RESULT_KINDS
+    value : dict or None
+        The full result
+
+    Returns:
+    --------
+    dict
+        Risk levels and parity differences per attribute for bias analyses,
+        top features and complexity for transparency analyses, fairness
+        assessments per attribute for fairness metrics; empty for no result
+    """
+    if not isinstance(value, dict):
+        return {}
+
+    summary = {}
+    if 'error' in value:
+        summary['error'] = value['error']
+
+    if kind == 'bias_analysis':
+        summary['dataset_size'] = value.get('dataset_size')
+        summary['risk_levels'] = {
+            attr: assessment.get('risk_level')
+            for attr, assessment in (value.get('overall_assessment') or {}).items()
+        }
+        parity = {
+            attr: result['parity_difference']
+            for attr, result in (value.get('statistical_parity') or {}).items()
+            if isinstance(result, dict) and isinstance(result.get('parity_difference'), (int, float))
+        }
+        summary['parity_difference'] = parity
+        summary['max_parity_difference'] = max(map(abs, parity.values()), default=None)
+
+    elif kind == 'transparency_analysis':
+        importance = value.get('feature_importance') or {}
+        top_features = importance.get('top_features')
+        if top_features is None:
+            # Older results map features straight to scores
+            scores = {name: score for name, score in importance.items() if isinstance(score, (int, float))}
+            top_features = sorted(scores, key=scores.get, reverse=True)
+        summary['top_features'] = list(top_features)[:TOP_FEATURES]
+        summary['complexity_level'] = (value.get('model_complexity') or {}).get('complexity_level')
+
+    elif kind == 'fairness_metrics':
+        summary['fairness_assessment'] = {
+            attr: metrics.get('fairness_assessment')
+            for attr, metrics in (value.get('metrics_by_attribute') or {}).items()
+            if isinstance(metrics, dict) and 'fairness_assessment' in metrics
+        }
+
+    return summary
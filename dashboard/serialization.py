@@ -0,0 +1,101 @@
+"""
+JSON conversion of analysis results
+to_json turns results built with NumPy into native JSON types in one pass, and
+dumps / ResultJsonResponse encode them for storage and the API, using orjson
+when it is installed
+"""
+
+from collections.abc import Mapping
+import json
+
+import numpy as np
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Exact types that are already native JSON values
+_NATIVE_TYPES = {str, int, float, bool, type(None)}
+# NumPy dtype kinds whose tolist() holds only native JSON values
+_NATIVE_DTYPE_KINDS = set('biuf')
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _json_key(key):
+    # Same text json.dumps would write for the key, also for NumPy scalars;
+    # keys json cannot write (tuples, timestamps, ...) use their str()
+    if isinstance(key, np.generic):
+        key = key.item()
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
+def to_json(value):
+    """
+    Converts a result to native JSON types in a single pass
+
+    NumPy scalars and arrays become Python numbers and lists, tuples become
+    lists, read-only mappings become dicts, dict keys become strings, and the types DjangoJSONEncoder knows
+    (datetimes, decimals, UUIDs, ...) become strings.
+
+    Parameters:
+    -----------
+    value : object
+        The result, usually a dict of dicts built by the analysis functions
+
+    Returns:
+    --------
+    object
+        An equal value made of dict, list, str, int, float, bool and None only
+    """
+    kind = type(value)
+    if kind in _NATIVE_TYPES:
+        return value
+    if isinstance(value, np.generic):
+        value = value.item()
+        return value if type(value) in _NATIVE_TYPES else to_json(value)
+    if isinstance(value, (dict, Mapping)):
+        return {
+            key if type(key) is str else _json_key(key): item if type(item) in _NATIVE_TYPES else to_json(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [item if type(item) in _NATIVE_TYPES else to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in _NATIVE_DTYPE_KINDS:
+            return value.tolist()
+        return to_json(value.tolist())
+    for native in (bool, int, float, str):
+        # Subclasses such as IntEnum
+        if isinstance(value, native):
+            return native(value)
+    return _django_encoder.default(value)
+
+
+def dumps(value):
+    """
+    Encodes a result as compact JSON bytes
+
+    NumPy values are accepted. With orjson installed, NaN and infinite floats
+    are written as null; the json fallback writes NaN/Infinity like json.dumps.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Types orjson does not know, e.g. NumPy scalar keys or Decimal
+            return orjson.dumps(to_json(value))
+    return json.dumps(to_json(value), separators=(',', ':')).encode()
+
+
+class ResultJsonResponse(HttpResponse):
+    """JsonResponse for analysis results, encoded with dumps"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
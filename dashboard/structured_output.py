@@ -0,0 +1,229 @@
+"""
+Structured JSON responses from the language model
+Prompts ask for one JSON object with a string field per section. SectionParser
+reads all sections in a single pass, can be fed a streaming response piece by
+piece and tolerates truncated JSON or plain-text answers.
+"""
+
+import json
+from json.decoder import scanstring
+
+RESPONSE_FORMAT_HEADER = "Respond with a single JSON object and nothing else"
+
+# Characters that can complete a value the parser is waiting on
+_VALUE_TERMINATORS = '":,}'
+_decoder = json.JSONDecoder(strict=False)
+
+
+def response_format_instructions(sections):
+    """
+    Instructions asking for a JSON object with one string field per section
+
+    Parameters:
+    -----------
+    sections : dict
+        Maps result keys to (description, keyword) pairs; the description
+        tells the model what to write, the keyword finds the section in
+        plain-text answers
+    """
+    schema = {key: description for key, (description, _) in sections.items()}
+    return f"{RESPONSE_FORMAT_HEADER}, using these keys with a string value each:\n{json.dumps(schema, indent=2)}"
+
+
+def requested_fields(prompt):
+    """Returns the {key: description} schema a prompt asks for, or None for free-text prompts"""
+    start = prompt.find(RESPONSE_FORMAT_HEADER)
+    if start == -1:
+        return None
+    brace = prompt.find('{', start)
+    if brace == -1:
+        return None
+    try:
+        fields, _ = _decoder.raw_decode(prompt, brace)
+    except ValueError:
+        return None
+    return fields if isinstance(fields, dict) else None
+
+
+def section_text(value):
+    """Turns a JSON value into section text (models sometimes answer with lists)"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return '\n'.join(section_text(item) for item in value)
+    if isinstance(value, dict):
+        return '\n'.join(f"{key}: {section_text(item)}" for key, item in value.items())
+    return str(value)
+
+
+def sections_from_text(text, sections):
+    """
+    Finds sections in a plain-text answer by keyword, in one pass over its paragraphs
+
+    A section is the first paragraph mentioning its keyword and the paragraph
+    after it. Sections without a match are left out rather than filled with
+    a generic extract.
+    """
+    paragraphs = text.split('\n\n')
+    found = {}
+    for i, paragraph in enumerate(paragraphs):
+        lowered = paragraph.lower()
+        for key, (_, keyword) in sections.items():
+            if key not in found and keyword in lowered:
+                found[key] = '\n\n'.join(paragraphs[i:i + 2])
+        if len(found) == len(sections):
+            break
+    return found
+
+
+def decode_partial_string(text):
+    """Decodes the body of a JSON string cut off before its closing quote"""
+    while True:
+        try:
+            return scanstring(text + '"', 0, False)[0]
+        except ValueError:
+            # Drop an escape sequence the cut left incomplete
+            text = text[:text.rfind('\\')]
+
+
+class SectionParser:
+    """
+    Reads the sections of a structured response, all at once or as it streams in
+
+    feed() scans the new text once and returns the sections whose values it
+    completed; close() resolves whatever is left when the response ends. A
+    response cut off inside a value keeps the text received so far, and one
+    without a JSON object falls back to sections_from_text. format records
+    which of 'json', 'partial_json' or 'text' the response turned out to be.
+
+    Parameters:
+    -----------
+    sections : dict
+        Maps result keys to (description, keyword) pairs, as for
+        response_format_instructions
+    """
+
+    def __init__(self, sections):
+        self.sections = sections
+        self.buffer = ''
+        self.pos = None
+        self.key = None
+        self.values = {}
+        self.finished = False
+        self.waiting = False
+        self.format = None
+        self.text = None
+
+    def feed(self, text):
+        """Adds response text; returns the (name, text) sections completed by it"""
+        self.buffer += text
+        if self.finished or (self.waiting and not any(c in text for c in _VALUE_TERMINATORS)):
+            return []
+
+        if self.pos is None:
+            start = self.buffer.find('{', len(self.buffer) - len(text))
+            if start == -1:
+                return []
+            self.pos = start + 1
+
+        ready = []
+        self.waiting = False
+        buffer = self.buffer
+        while not self.finished:
+            pos = self._skip(self.pos, ' \t\r\n,' if self.key is None else ' \t\r\n')
+            if pos == len(buffer):
+                break
+            try:
+                if self.key is None:
+                    self._read_key(pos)
+                else:
+                    self._read_value(pos, ready)
+            except ValueError:
+                # Incomplete until more text arrives
+                self.waiting = True
+                break
+        return ready
+
+    def close(self):
+        """Marks the response complete; returns the sections not yet emitted"""
+        self.text = self.buffer
+        ready = []
+        if self.finished and self.format is None:
+            self.format = 'json'
+        elif self.values or self.key is not None:
+            self.format = 'partial_json'
+            pos = self._skip(self.pos, ' \t\r\n')
+            if self.key is not None and self.buffer.startswith('"', pos):
+                self._store(self.key, decode_partial_string(self.buffer[pos + 1:]), ready)
+        else:
+            self.format = 'text'
+            for key, value in sections_from_text(self.buffer, self.sections).items():
+                self._store(key, value, ready)
+
+        self.finished = True
+        for key in self.sections:
+            if key not in self.values:
+                self._store(key, '', ready)
+        return ready
+
+    def result(self, full_key):
+        """
+        All sections as a dict, once closed
+
+        full_key holds the raw response when it was not complete JSON, since
+        the sections may then miss part of it; otherwise it is None so the
+        text is not stored twice.
+        """
+        result = {key: self.values.get(key, '') for key in self.sections}
+        result[full_key] = None if self.format == 'json' else self.text
+        return result
+
+    def _skip(self, pos, characters):
+        while pos < len(self.buffer) and self.buffer[pos] in characters:
+            pos += 1
+        return pos
+
+    def _read_key(self, pos):
+        if self.buffer[pos] == '}':
+            self.finished = True
+            return
+        if self.buffer[pos] != '"':
+            # Not the flat object we asked for; keep what was read
+            self.format = 'partial_json'
+            self.finished = True
+            return
+        key, end = scanstring(self.buffer, pos + 1, False)
+        colon = self._skip(end, ' \t\r\n')
+        if colon == len(self.buffer):
+            raise ValueError("Incomplete key")
+        if self.buffer[colon] != ':':
+            self.format = 'partial_json'
+            self.finished = True
+            return
+        self.key, self.pos = key, colon + 1
+
+    def _read_value(self, pos, ready):
+        if self.buffer[pos] == '"':
+            value, end = scanstring(self.buffer, pos + 1, False)
+        else:
+            value, end = _decoder.raw_decode(self.buffer, pos)
+            if end == len(self.buffer):
+                # A number may still be growing
+                raise ValueError("Incomplete value")
+        self._store(self.key, value, ready)
+        self.key, self.pos = None, end
+
+    def _store(self, key, value, ready):
+        if key in self.sections and key not in self.values:
+            self.values[key] = section_text(value)
+            ready.append((key, self.values[key]))
+
+
+def parse_sections(text, sections, full_key):
+    """Parses a complete response into a dict of its sections (see SectionParser.result)"""
+    parser = SectionParser(sections)
+    parser.feed(text)
+    parser.close()
+    return parser.result(full_key)
@@ -1,7 +1,55 @@
-from django.test import TestCase, Client
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from .models import ModelAnalysis, CaseStudy, EducationalResource
+from unittest import mock
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from .homepage_stats import HOMEPAGE_STATS_CACHE_KEY
+from .models import ModelAnalysis, AnalysisResult, CacheVersion, CaseStudy, EducationalResource, AnalysisJob
+from .bias_detection import (
+    check_statistical_parity, calculate_fairness_metrics, detect_bias_in_data,
+    detect_bias_in_csv, calculate_fairness_metrics_from_csv,
+    detect_bias_from_stats, calculate_fairness_metrics_from_stats, summarize_dataset
+)
+from .ai_cache import AIResponseCache, prompt_cache_key
+from .governance import GOVERNANCE_TEMPLATES, get_governance_template
+from .fairness_stats import FairnessStatsAccumulator, merge_accumulators
+from .jobs import claim_job, claim_next_job, progress_reporter, requeue_stale_jobs, run_worker
+from .model_cache import SurrogateModelCache, make_cache_key
+from .progress import ProgressTracker
+from .prompt_builder import build_dataset_ethics_prompt, estimate_tokens
+from .llm_stub import StubLLMServer, stub_response
+from .resilience import CircuitBreaker, CircuitOpenError, retry_with_backoff
+from .result_store import compress_result, decompress_result
+from .serialization import ResultJsonResponse, dumps, to_json
+from . import serialization
+from .structured_output import SectionParser, parse_sections, requested_fields, response_format_instructions
+from .transparency import (
+    analyze_model_explainability, analyze_feature_interactions, compute_shap_explanations,
+    fit_adaptive_surrogate_model, fit_surrogate_model, preprocess_data, stratified_order,
+    tree_interaction_strengths
+)
+from .tree_shap import tree_shap_values
+from . import gemini_ai
+from . import gemini_async
+import asyncio
+import gzip
+import io
+import itertools
 import json
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from sklearn.metrics import confusion_matrix
+from sklearn.preprocessing import LabelEncoder
+import scipy.stats as stats
 
 class DashboardViewsTest(TestCase):
     
@@ -31,6 +79,44 @@ class DashboardViewsTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'dashboard/index.html')
     
+    def test_index_stats_cached_until_changed(self):
+        """Test the homepage counters are cached and refreshed when a counted object is saved"""
+        cache.clear()
+        ModelAnalysis.objects.create(name="Scoring model", description="", model_type='classification',
+                                     dataset_description="", bias_analysis={'dataset_size': 10})
+        response = self.client.get(reverse('dashboard:index'))
+        self.assertEqual((response.context['analyses_count'], response.context['case_studies_count'],
+                          response.context['resources_count']), (1, 1, 1))
+        self.assertContains(response, "Scoring model")
+        
+        # Only the version lookup
+        with self.assertNumQueries(1):
+            self.client.get(reverse('dashboard:index'))
+        
+        CaseStudy.objects.create(title="Second", category="privacy", summary="", detailed_description="",
+                                 key_lessons="")
+        self.assertEqual(self.client.get(reverse('dashboard:index')).context['case_studies_count'], 2)
+        
+        # A change saved by another process (here bypassing signals) shows up once it bumps the version
+        CaseStudy.objects.bulk_create([CaseStudy(title="Third", category="privacy", summary="",
+                                                 detailed_description="", key_lessons="")])
+        self.assertEqual(self.client.get(reverse('dashboard:index')).context['case_studies_count'], 2)
+        CacheVersion.bump(HOMEPAGE_STATS_CACHE_KEY)
+        self.assertEqual(self.client.get(reverse('dashboard:index')).context['case_studies_count'], 3)
+    
+    def test_load_sample_data_command(self):
+        """Test sample data is loaded by the command, never by the homepage"""
+        ModelAnalysis.objects.all().delete()
+        CaseStudy.objects.all().delete()
+        EducationalResource.objects.all().delete()
+        self.client.get(reverse('dashboard:index'))
+        self.assertFalse(CaseStudy.objects.exists())
+        
+        call_command('load_sample_data', stdout=io.StringIO())
+        self.assertTrue(ModelAnalysis.objects.exists())
+        self.assertTrue(CaseStudy.objects.exists())
+        self.assertTrue(EducationalResource.objects.exists())
+    
     def test_bias_detection_view(self):
         """Test the bias detection view loads correctly"""
         response = self.client.get(reverse('dashboard:bias_detection'))
@@ -56,3 +142,1172 @@ class DashboardViewsTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'dashboard/case_studies.html')
         self.assertContains(response, "Facial Recognition Bias")
+
+
+class AnalysisListingTest(TestCase):
+
+    def setUp(self):
+        for i in range(13):
+            ModelAnalysis.objects.create(
+                name=f"Analysis {i}", description="", model_type='classification', dataset_description="",
+                bias_analysis={'attribute_distribution': {'gender': {'marker-value': 1}}},
+                fairness_metrics={'gender': {'disparate_impact': 0.9}}
+            )
+    
+    def test_listing_flags_follow_results(self):
+        """Test has_bias and has_transparency track the JSON results on every save"""
+        analysis = ModelAnalysis.objects.get(name='Analysis 0')
+        self.assertTrue(analysis.has_bias)
+        self.assertFalse(analysis.has_transparency)
+        
+        analysis.transparency_analysis = {'feature_importance': {}}
+        analysis.save(update_fields=['transparency_analysis'])
+        analysis = ModelAnalysis.objects.get(pk=analysis.pk)
+        self.assertTrue(analysis.has_bias)
+        self.assertTrue(analysis.has_transparency)
+        
+        analysis.bias_analysis = None
+        analysis.save()
+        self.assertFalse(ModelAnalysis.objects.get(pk=analysis.pk).has_bias)
+        self.assertFalse(AnalysisResult.objects.filter(analysis=analysis, kind='bias_analysis').exists())
+    
+    def test_results_stored_compressed(self):
+        """Test results are compressed into AnalysisResult rows and read back only when accessed"""
+        bias = {
+            'dataset_size': 200,
+            'statistical_parity': {'gender': {'parity_difference': -0.3}, 'age': {'parity_difference': 0.1}},
+            'overall_assessment': {'gender': {'risk_level': 'High'}},
+            'attribute_distribution': {'gender': {'male': 0.5, 'female': 0.5}},
+            'rows': [{'group': 'g', 'rate': 0.5}] * 500
+        }
+        analysis = ModelAnalysis.objects.get(name='Analysis 0')
+        analysis.bias_analysis = bias
+        analysis.save()
+        
+        stored = AnalysisResult.objects.get(analysis=analysis, kind='bias_analysis')
+        self.assertEqual(stored.size, len(json.dumps(bias, separators=(',', ':'))))
+        self.assertLess(len(stored.data), stored.size // 10)
+        self.assertEqual(decompress_result(stored.data, stored.codec), bias)
+        
+        with self.assertNumQueries(1):
+            analysis = ModelAnalysis.objects.get(pk=analysis.pk)
+            self.assertEqual(analysis.summary['bias_analysis']['risk_levels'], {'gender': 'High'})
+            self.assertEqual(analysis.summary['bias_analysis']['max_parity_difference'], 0.3)
+        with self.assertNumQueries(1):
+            self.assertEqual(analysis.load_results(), {
+                'bias_analysis': bias,
+                'transparency_analysis': None,
+                'fairness_metrics': {'gender': {'disparate_impact': 0.9}}
+            })
+            self.assertEqual(analysis.bias_analysis, bias)
+    
+    def test_gzip_is_deterministic(self):
+        """Test identical results compress to identical bytes"""
+        value = {'b': [1, 2, 3], 'a': 'text'}
+        self.assertEqual(compress_result(value), compress_result(value))
+        self.assertEqual(compress_result(value)[1], len('{"b":[1,2,3],"a":"text"}'))
+    
+    @override_settings(ANALYSIS_LIST_PAGE_SIZE=5)
+    def test_listing_paginated_without_results(self):
+        """Test the bias page lists one page of analyses without their JSON results"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard:bias_detection'), {'page': 3})
+        page = response.context['completed_analyses']
+        
+        self.assertEqual(page.paginator.num_pages, 3)
+        self.assertEqual([analysis.name for analysis in page], ['Analysis 2', 'Analysis 1', 'Analysis 0'])
+        self.assertFalse([query for query in queries if 'dashboard_analysisresult' in query['sql']])
+        self.assertNotContains(response, 'marker-value')
+        self.assertContains(response, reverse('dashboard:analysis_results', args=[page[0].pk]))
+    
+    @override_settings(ANALYSIS_LIST_PAGE_SIZE=5)
+    def test_listing_opens_page_of_linked_analysis(self):
+        """Test ?analysis_id= renders the page holding that analysis"""
+        analysis = ModelAnalysis.objects.get(name='Analysis 6')
+        response = self.client.get(reverse('dashboard:bias_detection'), {'analysis_id': analysis.pk})
+        page = response.context['completed_analyses']
+        self.assertEqual(page.number, 2)
+        self.assertIn(analysis, page)
+        
+        # An explicit page wins; unknown ids fall back to the first page
+        self.assertEqual(self.client.get(reverse('dashboard:bias_detection'),
+                                         {'analysis_id': analysis.pk, 'page': 3}).context['completed_analyses'].number, 3)
+        self.assertEqual(self.client.get(reverse('dashboard:transparency'),
+                                         {'analysis_id': analysis.pk}).context['completed_analyses'].number, 1)
+    
+    def test_results_endpoint(self):
+        """Test an analysis's results are served on their own, optionally limited to some fields"""
+        analysis = ModelAnalysis.objects.first()
+        url = reverse('dashboard:analysis_results', args=[analysis.pk])
+        
+        full = self.client.get(url).json()
+        self.assertEqual(full['bias_analysis'], analysis.bias_analysis)
+        self.assertIsNone(full['transparency_analysis'])
+        self.assertEqual(self.client.get(url, {'fields': 'fairness_metrics'}).json(),
+                         {'id': analysis.pk, 'fairness_metrics': analysis.fairness_metrics})
+        self.assertEqual(self.client.get(url, {'fields': 'user'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('dashboard:analysis_results', args=[0])).status_code, 404)
+
+
+class ResultSerializationTest(TestCase):
+
+    def setUp(self):
+        self.result = {
+            'dataset_size': np.int64(3),
+            'rates': np.array([0.25, 0.5]),
+            'labels': np.array(['a', 'b'], dtype=object),
+            'by_group': {np.int64(1): np.float32(0.5), 2.5: (np.bool_(True), None), None: 'x'}
+        }
+        self.expected = {
+            'dataset_size': 3,
+            'rates': [0.25, 0.5],
+            'labels': ['a', 'b'],
+            'by_group': {'1': 0.5, '2.5': [True, None], 'null': 'x'}
+        }
+
+    def test_to_json_converts_in_one_pass(self):
+        """Test NumPy values, tuples and non-string keys become native JSON types"""
+        converted = to_json(self.result)
+        self.assertEqual(converted, self.expected)
+        self.assertIs(type(converted['dataset_size']), int)
+        self.assertIs(type(converted['by_group']['1']), float)
+        self.assertEqual(json.loads(json.dumps(converted)), self.expected)
+
+    def test_dumps_with_and_without_orjson(self):
+        """Test both encoder paths accept NumPy values and agree"""
+        encoded = dumps(self.result)
+        with mock.patch.object(serialization, 'orjson', None):
+            self.assertEqual(json.loads(dumps(self.result)), json.loads(encoded))
+        self.assertEqual(json.loads(encoded), self.expected)
+
+    def test_result_response(self):
+        """Test ResultJsonResponse returns the encoded result as JSON"""
+        response = ResultJsonResponse({'result': self.result}, status=201)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), {'result': self.expected})
+
+
+class StatisticalParityTest(TestCase):
+
+    def test_positive_rates_per_group(self):
+        """Test grouped positive rates match per-group means"""
+        df = pd.DataFrame({
+            'gender': ['male', 'female', 'male', 'female', 'other', 'male'],
+            'approved': [1, 0, 1, 1, 0, 0]
+        })
+        results = check_statistical_parity(df, 'gender', 'approved')
+        
+        self.assertEqual(list(results['positive_rates']), ['male', 'female', 'other'])
+        self.assertAlmostEqual(results['positive_rates']['male'], 2 / 3)
+        self.assertAlmostEqual(results['positive_rates']['female'], 0.5)
+        self.assertAlmostEqual(results['positive_rates']['other'], 0.0)
+        self.assertAlmostEqual(results['parity_difference'], 2 / 3)
+        self.assertEqual(results['assessment'], "Poor statistical parity")
+
+
+class FairnessMetricsTest(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        size = 500
+        self.df = pd.DataFrame({
+            'gender': rng.choice(['male', 'female', 'non_binary'], size=size),
+            'age_group': rng.choice(['18-25', '26-35', '36+'], size=size),
+            'hired': rng.integers(0, 2, size=size),
+            'predicted': rng.integers(0, 2, size=size)
+        })
+    
+    def test_confusion_kernel_matches_sklearn(self):
+        """Test the grouped confusion kernel against per-group sklearn confusion matrices"""
+        results = calculate_fairness_metrics(self.df, ['gender', 'age_group'], 'hired', 'predicted')
+        
+        for attr in ['gender', 'age_group']:
+            group_metrics = results['metrics_by_attribute'][attr]['group_metrics']
+            self.assertEqual(list(group_metrics), list(self.df[attr].unique()))
+            
+            for group, metrics in group_metrics.items():
+                subset = self.df[self.df[attr] == group]
+                tn, fp, fn, tp = confusion_matrix(subset['hired'], subset['predicted']).ravel()
+                self.assertEqual(metrics['sample_size'], len(subset))
+                self.assertAlmostEqual(metrics['true_positive_rate'], tp / (tp + fn))
+                self.assertAlmostEqual(metrics['false_positive_rate'], fp / (fp + tn))
+                self.assertAlmostEqual(metrics['positive_predictive_value'], tp / (tp + fp))
+                self.assertAlmostEqual(metrics['accuracy'], (tp + tn) / len(subset))
+    
+    def test_non_binary_outcomes(self):
+        """Test multi-class outcomes are reported as errors per group"""
+        df = self.df.assign(predicted=self.df['predicted'] + self.df['hired'])
+        results = calculate_fairness_metrics(df, ['gender'], 'hired', 'predicted')
+        
+        group_metrics = results['metrics_by_attribute']['gender']['group_metrics']
+        for metrics in group_metrics.values():
+            self.assertEqual(metrics, {'error': 'Could not calculate metrics'})
+
+
+class StreamingBiasAnalysisTest(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        size = 2000
+        self.df = pd.DataFrame({
+            'gender': rng.choice(['male', 'female', 'non_binary'], size=size, p=[0.6, 0.3, 0.1]),
+            'location': rng.choice(list('abcdefghij'), size=size),
+            'hired': rng.integers(0, 2, size=size),
+            'predicted': rng.integers(0, 2, size=size),
+            'decision': rng.choice(['accept', 'reject', 'review'], size=size)
+        })
+        self.csv = self.df.to_csv(index=False)
+        self.attrs = ['gender', 'location', 'missing_column']
+    
+    def assertResultsEqual(self, first, second):
+        if isinstance(first, dict):
+            self.assertEqual(set(first), set(second))
+            for key in first:
+                self.assertResultsEqual(first[key], second[key])
+        elif isinstance(first, float):
+            self.assertAlmostEqual(first, second, places=9)
+        else:
+            self.assertEqual(first, second)
+    
+    def test_detect_bias_matches_in_memory(self):
+        """Test chunked bias detection matches the in-memory results"""
+        for target in [None, 'hired', 'decision']:
+            expected = detect_bias_in_data(self.df, self.attrs, target)
+            streamed = detect_bias_in_csv(io.StringIO(self.csv), self.attrs, target, chunksize=300)
+            self.assertResultsEqual(expected, streamed)
+    
+    def test_fairness_metrics_match_in_memory(self):
+        """Test chunked fairness metrics match the in-memory results"""
+        expected = calculate_fairness_metrics(self.df, self.attrs, 'hired', 'predicted')
+        streamed = calculate_fairness_metrics_from_csv(
+            io.StringIO(self.csv), self.attrs, 'hired', 'predicted', chunksize=300
+        )
+        self.assertResultsEqual(expected, streamed)
+    
+    def test_progress_reported_per_chunk(self):
+        """Test chunked bias detection reports the rows read after every chunk"""
+        events = []
+        detect_bias_in_csv(io.StringIO(self.csv), self.attrs, chunksize=300,
+                           progress=ProgressTracker(events.append))
+        
+        rows = [event['rows_processed'] for event in events if event['stage'] == 'reading_csv']
+        self.assertEqual(rows, [300, 600, 900, 1200, 1500, 1800, 2000])
+        self.assertEqual([event['seq'] for event in events], list(range(1, len(events) + 1)))
+        self.assertTrue(all(event['elapsed'] >= 0 for event in events))
+
+
+class FairnessStatsAccumulatorTest(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        size = 1500
+        self.df = pd.DataFrame({
+            'gender': rng.choice(['male', 'female', 'non_binary'], size=size),
+            'age': rng.integers(18, 70, size=size),
+            'hired': rng.integers(0, 2, size=size),
+            'predicted': rng.integers(0, 2, size=size),
+            'decision': rng.choice(['accept', 'reject'], size=size)
+        })
+        self.attrs = ['gender', 'age']
+        self.shards = [
+            FairnessStatsAccumulator.from_dataframe(part, self.attrs, 'hired', 'predicted')
+            for part in (self.df.iloc[start:start + 375] for start in range(0, size, 375))
+        ]
+    
+    def test_merged_shards_match_whole_dataset(self):
+        """Test merging shard accumulators reproduces the single-pass results"""
+        whole = FairnessStatsAccumulator.from_dataframe(self.df, self.attrs, 'hired', 'predicted')
+        merged = merge_accumulators(self.shards)
+        
+        self.assertEqual(merged.to_dict(), whole.to_dict())
+        self.assertEqual(detect_bias_from_stats(merged, self.attrs),
+                         detect_bias_from_stats(whole, self.attrs))
+        self.assertEqual(calculate_fairness_metrics_from_stats(merged, self.attrs),
+                         calculate_fairness_metrics(self.df, self.attrs, 'hired', 'predicted'))
+    
+    def test_merge_is_associative(self):
+        """Test merge order grouping does not change the counts"""
+        a, b, c, d = self.shards
+        left = a.merge(b).merge(c).merge(d)
+        right = a.merge(b.merge(c.merge(d)))
+        self.assertEqual(left.to_dict(), right.to_dict())
+    
+    def test_serialization_round_trip(self):
+        """Test accumulators survive a JSON round trip and still merge"""
+        restored = [FairnessStatsAccumulator.from_dict(json.loads(json.dumps(part.to_dict())))
+                    for part in self.shards]
+        self.assertEqual(merge_accumulators(restored).to_dict(), merge_accumulators(self.shards).to_dict())
+    
+    def test_parallel_backends_match_serial(self):
+        """Test thread and process pools produce the serial results"""
+        attrs = ['gender', 'age', 'missing_column']
+        for target in ['hired', 'decision']:
+            expected = detect_bias_in_data(self.df, attrs, target, n_jobs=1)
+            for backend in ['thread', 'process']:
+                self.assertEqual(detect_bias_in_data(self.df, attrs, target, n_jobs=2, backend=backend), expected)
+        
+        expected = calculate_fairness_metrics(self.df, attrs, 'hired', 'predicted', n_jobs=1)
+        for backend in ['thread', 'process']:
+            self.assertEqual(
+                calculate_fairness_metrics(self.df, attrs, 'hired', 'predicted', n_jobs=2, backend=backend),
+                expected
+            )
+    
+    def test_statistics_match_scipy(self):
+        """Test count-derived correlation and chi-square against direct scipy calls"""
+        results = detect_bias_in_data(self.df, ['gender'], 'hired')
+        encoded = LabelEncoder().fit_transform(self.df['gender'])
+        corr, p = stats.pearsonr(encoded, self.df['hired'])
+        self.assertAlmostEqual(results['correlation_with_sensitive']['gender']['correlation'], corr)
+        self.assertAlmostEqual(results['correlation_with_sensitive']['gender']['p_value'], p)
+        
+        results = detect_bias_in_data(self.df, ['gender'], 'decision')
+        chi2, p, _, _ = stats.chi2_contingency(pd.crosstab(self.df['gender'], self.df['decision']))
+        self.assertAlmostEqual(results['correlation_with_sensitive']['gender']['chi2'], chi2)
+        self.assertAlmostEqual(results['correlation_with_sensitive']['gender']['p_value'], p)
+
+
+class TransparencyAnalysisTest(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        size = 400
+        self.df = pd.DataFrame({
+            'income': rng.normal(50000, 15000, size=size),
+            'age': rng.integers(18, 70, size=size),
+            'region': rng.choice(['north', 'south', 'east'], size=size)
+        })
+        self.df['approved'] = (self.df['income'] > 50000).astype(int)
+    
+    def test_stage_timings_reported(self):
+        """Test the analysis reports a timing for every stage it runs"""
+        results = analyze_model_explainability(self.df, 'approved', 'classification', 'advanced', n_jobs=1)
+        
+        self.assertEqual(results['feature_importance']['top_features'][0], 'income')
+        self.assertIn('potential_interactions', results['feature_interactions'])
+        for stage in ['preprocessing', 'model_training', 'feature_importance',
+                      'feature_interactions', 'shap_values', 'model_limitations']:
+            self.assertIn(stage, results['stage_timings'])
+    
+    def test_progress_reported_per_stage(self):
+        """Test the analysis reports every stage it enters to the progress hook"""
+        events = []
+        analyze_model_explainability(self.df, 'approved', 'classification', 'advanced', n_jobs=1,
+                                     progress=ProgressTracker(events.append))
+        
+        stages = [event['stage'] for event in events]
+        self.assertEqual(stages, ['preprocessing', 'model_training', 'feature_importance', 'model_complexity',
+                                  'feature_interactions', 'shap_values', 'model_limitations'])
+        self.assertEqual(events[0]['total_rows'], len(self.df))
+    
+    def test_surrogate_model_reused_from_cache(self):
+        """Test a repeat analysis of the same data reuses the cached surrogate model"""
+        cache = SurrogateModelCache(max_bytes=64 * 1024 * 1024)
+        
+        first = analyze_model_explainability(self.df, 'approved', n_jobs=1, model_cache=cache)
+        second = analyze_model_explainability(self.df, 'approved', n_jobs=1, model_cache=cache)
+        changed = analyze_model_explainability(self.df.iloc[:300], 'approved', n_jobs=1, model_cache=cache)
+        
+        self.assertEqual(first['model_cache'], 'miss')
+        self.assertEqual(second['model_cache'], 'memory')
+        self.assertEqual(changed['model_cache'], 'miss')
+        self.assertEqual(first['feature_importance'], second['feature_importance'])
+
+    
+    def test_interactions_taken_from_tree_structure(self):
+        """Test an XOR pair is reported as the strongest interaction on every run"""
+        rng = np.random.default_rng(5)
+        X = rng.normal(size=(2000, 4))
+        y = ((X[:, 0] > 0) ^ (X[:, 1] > 0)).astype(int)
+        model = fit_surrogate_model(X, y, n_jobs=1)
+        feature_names = ['a', 'b', 'noise1', 'noise2']
+        
+        first = analyze_feature_interactions(X, y, feature_names, model=model)
+        second = analyze_feature_interactions(X, y, feature_names, model=model)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(sorted(first['potential_interactions'][0]['features']), ['a', 'b'])
+    
+    def test_interaction_strengths_match_path_walk(self):
+        """Test the vectorized forest walk matches a recursive walk of each tree"""
+        rng = np.random.default_rng(6)
+        X = rng.normal(size=(300, 5))
+        y = (X[:, 0] * X[:, 1] + X[:, 2] > 0).astype(int)
+        model = fit_surrogate_model(X, y, n_jobs=1)
+        model.estimators_ = model.estimators_[:5]
+        compared = [2, 0, 1]
+        
+        expected = np.zeros((3, 3))
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            weighted = tree.weighted_n_node_samples * tree.impurity
+            decrease = {
+                node: weighted[node] - weighted[tree.children_left[node]] - weighted[tree.children_right[node]]
+                for node in range(tree.node_count) if tree.children_left[node] >= 0
+            }
+            total = sum(decrease.values())
+            
+            def walk(node, above):
+                if tree.children_left[node] < 0:
+                    return
+                feature = tree.feature[node]
+                if feature in compared:
+                    for other in above:
+                        expected[compared.index(feature), compared.index(other)] += decrease[node] / total / 5
+                    above = above | {feature}
+                walk(tree.children_left[node], above)
+                walk(tree.children_right[node], above)
+            walk(0, frozenset())
+        expected = expected + expected.T
+        np.fill_diagonal(expected, 0)
+        
+        np.testing.assert_allclose(tree_interaction_strengths(model, compared), expected)
+
+    
+    def test_shap_values_add_up_to_predictions(self):
+        """Test TreeSHAP attributions plus the expected value reproduce the forest's output"""
+        rng = np.random.default_rng(7)
+        X = rng.normal(size=(500, 4))
+        X[rng.random(X.shape) < 0.05] = np.nan
+        y = ((np.nan_to_num(X[:, 0]) > 0) ^ (np.nan_to_num(X[:, 1]) > 0)).astype(int)
+        model = fit_surrogate_model(X, y, n_jobs=1)
+        model.estimators_ = model.estimators_[:10]
+        
+        shap_values, expected_value, trees_used = tree_shap_values(model, X[:50])
+        
+        self.assertEqual(trees_used, 10)
+        np.testing.assert_allclose(shap_values.sum(axis=1) + expected_value, model.predict_proba(X[:50]), atol=1e-12)
+        ranking = np.argsort(np.abs(shap_values[:, :, 1]).mean(axis=0))[::-1]
+        self.assertEqual(sorted(ranking[:2]), [0, 1])
+
+    def test_shap_blocks_and_deadline(self):
+        """Test blocks split across leaves match and the deadline is checked between row blocks"""
+        rng = np.random.default_rng(7)
+        X = rng.normal(size=(500, 4))
+        y = ((X[:, 0] > 0) ^ (X[:, 1] > 0)).astype(int)
+        model = fit_surrogate_model(X, y, n_jobs=1)
+        model.estimators_ = model.estimators_[:3]
+
+        shap_values, expected_value, _ = tree_shap_values(model, X[:20])
+        with mock.patch('dashboard.tree_shap.MAX_BLOCK_ELEMENTS', 1):
+            np.testing.assert_allclose(tree_shap_values(model, X[:20])[0], shap_values, atol=1e-12)
+            # One row per block: the first tree stops after its first row
+            partial, partial_expected, trees_used = tree_shap_values(model, X[:20], time_budget=0)
+
+        self.assertEqual(trees_used, 1)
+        self.assertEqual(partial.shape[0], 1)
+        np.testing.assert_allclose(partial.sum(axis=1) + partial_expected, model.estimators_[0].predict_proba(X[:1]), atol=1e-12)
+
+        # A clock ticking once per row block: the first tree gets a third of the
+        # budget, so the rows are cut to what later trees can also explain
+        clock = itertools.count()
+        with mock.patch('dashboard.tree_shap.MAX_BLOCK_ELEMENTS', 1), \
+                mock.patch('dashboard.tree_shap.time.perf_counter', side_effect=lambda: next(clock)):
+            spread, _, trees_used = tree_shap_values(model, X[:100], time_budget=60, min_trees=3)
+
+        self.assertLess(spread.shape[0], 30)
+        self.assertGreaterEqual(trees_used, 2)
+
+    def test_shap_explanations_respect_limits(self):
+        """Test row sampling, per-row caps and the time budget are applied"""
+        X, y, feature_names, _ = preprocess_data(self.df, 'approved')
+        model = fit_surrogate_model(X, y, n_jobs=1)
+        
+        results = compute_shap_explanations(X, feature_names, model, sample_rows=50, explained_rows=3,
+                                            time_budget=None)
+        
+        self.assertEqual(results['rows_sampled'], 50)
+        self.assertEqual(len(results['row_attributions']), 3)
+        self.assertTrue(results['complete'])
+        self.assertEqual(results['top_features'][0], 'income')
+        
+        # No ranking is reported from the few trees an exhausted budget leaves
+        results = compute_shap_explanations(X, feature_names, model, sample_rows=50, time_budget=0)
+        
+        self.assertIn('error', results)
+        self.assertNotIn('top_features', results)
+        self.assertEqual(results['trees_used'], 1)
+        self.assertFalse(results['complete'])
+
+    
+    def test_stratified_order_keeps_class_balance(self):
+        """Test every prefix of the stratified shuffle keeps the class ratio"""
+        y = np.array([0] * 900 + [1] * 100)
+        
+        order = stratified_order(y)
+        
+        self.assertEqual(sorted(order), list(range(len(y))))
+        for size in [10, 100, 500]:
+            self.assertAlmostEqual(y[order[:size]].mean(), 0.1, delta=1 / size)
+    
+    def test_adaptive_sampling_stops_when_ranking_stable(self):
+        """Test adaptive sampling reports the sample it settled on and its stability"""
+        rng = np.random.default_rng(8)
+        X = rng.normal(size=(4000, 3))
+        y = (3 * X[:, 0] + X[:, 1] > 0).astype(int)
+        
+        model, _, sampling = fit_adaptive_surrogate_model(
+            X, y, n_jobs=1, initial_rows=500, stability_threshold=0.8
+        )
+        
+        self.assertEqual(sampling['mode'], 'adaptive')
+        self.assertEqual(sampling['stop_reason'], 'stable')
+        self.assertLess(sampling['sample_size'], len(X))
+        self.assertGreaterEqual(sampling['stability_score'], 0.8)
+        self.assertEqual(sampling['sample_size'], sampling['rounds'][-1]['sample_size'])
+        self.assertEqual(np.argmax(model.feature_importances_), 0)
+        
+        # 500 + 1000 rows would be fitted before stability is known: fit all 1200 at once
+        _, _, sampling = fit_adaptive_surrogate_model(X[:1200], y[:1200], n_jobs=1, initial_rows=500)
+        
+        self.assertEqual(sampling['stop_reason'], 'all_rows')
+        self.assertEqual(sampling['rounds'], [{'sample_size': 1200, 'stability_score': None}])
+
+
+class SurrogateModelCacheTest(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.X = rng.normal(size=(200, 3))
+        self.y = (self.X[:, 0] > 0).astype(int)
+        self.models = [fit_surrogate_model(self.X, self.y, n_jobs=1) for _ in range(3)]
+    
+    def test_cache_key_depends_on_content(self):
+        """Test the key changes with the data and the model type"""
+        key = make_cache_key(self.X, self.y, 'classification')
+        
+        self.assertEqual(key, make_cache_key(self.X.copy(), self.y.copy(), 'classification'))
+        self.assertNotEqual(key, make_cache_key(self.X, 1 - self.y, 'classification'))
+        self.assertNotEqual(key, make_cache_key(self.X, self.y, 'regression'))
+    
+    def test_least_recently_used_model_evicted(self):
+        """Test the memory tier stays under its byte cap by evicting the oldest entry"""
+        model_bytes = len(pickle.dumps(self.models[0]))
+        cache = SurrogateModelCache(max_bytes=int(model_bytes * 2.5))
+        
+        cache.put('a', self.models[0])
+        cache.put('b', self.models[1])
+        cache.get('a')
+        cache.put('c', self.models[2])
+        
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+    
+    def test_disk_tier_survives_memory_eviction(self):
+        """Test models evicted from memory are loaded back from disk"""
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = SurrogateModelCache(max_bytes=1, disk_dir=disk_dir)
+            key = make_cache_key(self.X, self.y, 'classification')
+            cache.put(key, self.models[0])
+            
+            model, tier = cache.get(key)
+            
+            self.assertEqual(tier, 'disk')
+            np.testing.assert_array_equal(model.predict(self.X), self.models[0].predict(self.X))
+            self.assertEqual(SurrogateModelCache(max_bytes=1).get(key), (None, None))
+
+    def test_model_pickled_once_per_put(self):
+        """Test the disk entry is written from the pickle that sizes the memory entry"""
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = SurrogateModelCache(max_bytes=10 ** 9, disk_dir=disk_dir)
+            key = make_cache_key(self.X, self.y, 'classification')
+            with mock.patch('dashboard.model_cache.pickle.dumps', wraps=pickle.dumps) as dumps:
+                cache.put(key, self.models[0])
+
+                reloaded = SurrogateModelCache(max_bytes=10 ** 9, disk_dir=disk_dir)
+                model, tier = reloaded.get(key)
+
+            self.assertEqual(dumps.call_count, 1)
+            self.assertEqual(tier, 'disk')
+            self.assertEqual(reloaded.size, cache.size)
+            np.testing.assert_array_equal(model.predict(self.X), self.models[0].predict(self.X))
+
+
+class AIResponseCacheTest(TestCase):
+
+    def setUp(self):
+        self.disk_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.disk_dir, ignore_errors=True)
+    
+    def make_cache(self, timeout=60):
+        return AIResponseCache(LocMemCache(f'test-{time.perf_counter()}', {}), timeout, disk_dir=self.disk_dir)
+    
+    def test_disk_tier_survives_restart_until_expiry(self):
+        """Test a new process reads responses from disk and drops them once expired"""
+        key = prompt_cache_key('model', 'prompt')
+        self.make_cache().put(key, 'answer')
+        
+        self.assertEqual(self.make_cache().get(key), ('answer', 'disk'))
+        with mock.patch('dashboard.ai_cache.time.time', return_value=time.time() + 120):
+            self.assertEqual(self.make_cache().get(key), (None, None))
+    
+    def test_concurrent_identical_prompts_share_one_call(self):
+        """Test requests for the same prompt wait for the call already in flight"""
+        cache = self.make_cache()
+        calls = []
+        results = []
+        
+        def generate():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'answer'
+        
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_generate('key', generate)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([text for text, _ in results], ['answer'] * 8)
+        self.assertEqual(cache.get_or_generate('key', generate), ('answer', 'memory'))
+        # One count per lookup
+        self.assertEqual((cache.misses, cache.shared, cache.hits), (1, 7, 1))
+    
+    def test_identical_prompts_share_one_call_across_processes(self):
+        """Test caches of different processes sharing a backend wait on the generating one's lease"""
+        backend = LocMemCache(f'test-{time.perf_counter()}', {})
+        caches_ = [AIResponseCache(backend, 60, lease_timeout=5, poll_interval=0.01) for _ in range(2)]
+        calls = []
+        results = []
+        
+        def generate():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'answer'
+        
+        threads = [threading.Thread(target=lambda cache=cache: results.append(cache.get_or_generate('key', generate)))
+                   for cache in caches_]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertCountEqual(results, [('answer', None), ('answer', 'shared')])
+        # A failed holder releases the lease, so the next caller generates
+        with self.assertRaises(RuntimeError):
+            caches_[0].get_or_generate('other', mock.Mock(side_effect=RuntimeError('quota')))
+        self.assertEqual(caches_[1].get_or_generate('other', lambda: 'answer'), ('answer', None))
+    
+    def test_failed_call_not_cached(self):
+        """Test an upstream error reaches the caller and the next request retries"""
+        cache = self.make_cache()
+        
+        with self.assertRaises(RuntimeError):
+            cache.get_or_generate('key', mock.Mock(side_effect=RuntimeError('quota')))
+        self.assertEqual(cache.get_or_generate('key', lambda: 'answer'), ('answer', None))
+    
+    def test_gemini_calls_cached(self):
+        """Test repeated governance prompts reach the model once"""
+        backend = mock.Mock(cache_namespace='mock:model')
+        backend.generate.return_value = 'Governance framework\n\nDetails'
+        
+        with override_settings(GEMINI_CACHE_DISK_DIR=self.disk_dir), \
+                mock.patch.object(gemini_ai, 'get_backend', return_value=backend):
+            first = gemini_ai.create_governance_recommendations('finance', ['GDPR'], 'high')
+            second = gemini_ai.create_governance_recommendations('finance', ['GDPR'], 'high')
+            gemini_ai.create_governance_recommendations('finance', ['GDPR'], 'low')
+        
+        self.assertEqual(first, second)
+        self.assertEqual(backend.generate.call_count, 2)
+
+
+class GeminiAsyncTest(TestCase):
+
+    def test_fan_out_limited_and_timed_out(self):
+        """Test concurrent calls stay under the limit and slow calls become errors"""
+        running = []
+        peak = []
+        lock = threading.Lock()
+        
+        def call(delay):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(delay)
+            with lock:
+                running.pop()
+            return delay
+        
+        calls = [(call, (0.05,), {})] * 6 + [(call, (0.5,), {})]
+        results = asyncio.run(gemini_async.gather_ai_calls(calls, max_concurrency=3, timeout=0.3))
+        
+        self.assertEqual(results[:6], [0.05] * 6)
+        self.assertEqual(results[6]['error'], 'AI analysis timed out')
+        self.assertLessEqual(max(peak), 3)
+    
+    def test_ai_runs_alongside_local_work(self):
+        """Test the AI call overlaps the local computation"""
+        async def ai():
+            await asyncio.sleep(0.3)
+            return 'insights'
+        
+        def local():
+            time.sleep(0.3)
+            return 'statistics'
+        
+        start = time.perf_counter()
+        result = gemini_async.run_alongside(local, ai())
+        
+        self.assertEqual(result, ('statistics', 'insights'))
+        self.assertLess(time.perf_counter() - start, 0.5)
+    
+    def test_per_attribute_analyses(self):
+        """Test per-attribute prompts are added to the overall analysis"""
+        def analyze(df_info, attributes, dataset_type):
+            return {'full_analysis': ','.join(attributes)}
+        
+        with mock.patch.object(gemini_ai, 'analyze_dataset_ethics', side_effect=analyze):
+            analysis = asyncio.run(gemini_async.analyze_dataset_ethics_async(
+                {}, ['gender', 'race'], per_attribute=True
+            ))
+        
+        self.assertEqual(analysis['full_analysis'], 'gender,race')
+        self.assertEqual(analysis['attribute_analyses']['race'], {'full_analysis': 'race'})
+
+
+class ResilienceTest(TestCase):
+
+    def test_retry_backs_off_exponentially(self):
+        """Test transient errors are retried with growing, capped waits"""
+        waits = []
+        func = mock.Mock(side_effect=[TimeoutError(), TimeoutError(), TimeoutError(), 'ok'])
+        
+        result = retry_with_backoff(func, retries=3, base_delay=1, max_delay=3,
+                                    retry_on=(TimeoutError,), sleep=waits.append)
+        
+        self.assertEqual(result, 'ok')
+        for wait, step in zip(waits, [1, 2, 3]):
+            self.assertTrue(step / 2 <= wait <= step)
+        with self.assertRaises(ValueError):
+            retry_with_backoff(mock.Mock(side_effect=ValueError()), retries=3, base_delay=1, max_delay=3,
+                               retry_on=(TimeoutError,), sleep=waits.append)
+        self.assertEqual(len(waits), 3)
+    
+    def test_circuit_breaker_transitions(self):
+        """Test the breaker opens after repeated failures and closes after a successful trial"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        failing = mock.Mock(side_effect=ConnectionError())
+        
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                breaker.call(failing)
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(failing)
+        self.assertEqual(failing.call_count, 2)
+        
+        now[0] = 10
+        self.assertEqual(breaker.call(lambda: 'ok'), 'ok')
+        
+        metrics = breaker.metrics()
+        self.assertEqual(metrics['state'], 'closed')
+        self.assertEqual((metrics['opened'], metrics['half_opened'], metrics['closed']), (1, 1, 1))
+        self.assertEqual(metrics['rejected'], 1)
+    
+    def test_open_breaker_skips_ai_enrichment(self):
+        """Test an unhealthy upstream is skipped and the local results still returned"""
+        url = reverse('dashboard:get_governance_framework', args=['general'])
+        
+        with StubLLMServer(error_rate=1.0) as stub, \
+                override_settings(LLM_BACKEND='stub', LLM_STUB_URL=stub.url, GEMINI_CACHE_ENABLED=False,
+                                  GEMINI_MAX_RETRIES=1, GEMINI_RETRY_BASE_DELAY=0,
+                                  GEMINI_BREAKER_FAILURE_THRESHOLD=2, GEMINI_BREAKER_RESET_SECONDS=60):
+            for _ in range(3):
+                response = self.client.get(url, {'use_ai_analysis': 'true', 'industry': 'finance'}).json()
+            status = self.client.get(reverse('dashboard:ai_status')).json()
+        
+        # Two calls with one retry each opened the breaker; the third never reached the stub
+        self.assertEqual(stub.requests, 4)
+        self.assertIn('framework', response)
+        self.assertIn('unavailable', response['ai_governance_recommendations']['error'])
+        self.assertEqual(status['circuit_breaker']['state'], 'open')
+        self.assertEqual(status['circuit_breaker']['opened'], 1)
+
+
+class GovernanceTemplateTest(TestCase):
+
+    def test_templates_built_once_and_frozen(self):
+        """Test every call returns the same read-only template"""
+        template = get_governance_template('fairness')
+        self.assertIs(template, get_governance_template('fairness'))
+        self.assertIs(get_governance_template('unknown'), GOVERNANCE_TEMPLATES['general'])
+        with self.assertRaises(TypeError):
+            template['title'] = 'Changed'
+        self.assertIsInstance(template['components'], tuple)
+    
+    def test_conditional_requests(self):
+        """Test the template API sends validators and answers repeat requests with 304"""
+        url = reverse('dashboard:get_governance_framework', args=['privacy'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['framework']['title'], get_governance_template('privacy')['title'])
+        self.assertNotEqual(response['ETag'], self.client.get(reverse(
+            'dashboard:get_governance_framework', args=['general']))['ETag'])
+        
+        for headers in ({'If-None-Match': response['ETag']}, {'If-Modified-Since': response['Last-Modified']}):
+            cached = self.client.get(url, headers=headers)
+            self.assertEqual(cached.status_code, 304)
+            self.assertEqual(cached.content, b'')
+            self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': '"stale"'}).status_code, 200)
+
+
+class PromptBuilderTest(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        size = 50
+        data = {f'feature_{i}': rng.normal(size=size) for i in range(300)}
+        data['gender'] = rng.choice(['female', 'male'], size=size)
+        data['approved'] = rng.choice(['yes', 'no'], size=size)
+        self.wide = pd.DataFrame(data)
+    
+    def test_wide_dataset_within_budget(self):
+        """Test a wide dataset is cut down to the budget with sensitive attributes and target first"""
+        df_info = summarize_dataset(self.wide, 'approved')
+        prompt, stats = build_dataset_ethics_prompt(df_info, ['gender'], token_budget=1500)
+        
+        self.assertLessEqual(estimate_tokens(prompt), 1500)
+        self.assertEqual(stats['estimated_tokens'], estimate_tokens(prompt))
+        self.assertGreater(stats['columns_dropped'], 0)
+        self.assertEqual(stats['columns_detailed'] + stats['columns_summarized'] + stats['columns_dropped'], 302)
+        self.assertLess(prompt.index('- gender'), prompt.index('- feature_0'))
+        self.assertLess(prompt.index('- approved'), prompt.index('- feature_0'))
+        self.assertIn('more columns omitted', prompt)
+        self.assertIn('"deployment_considerations"', prompt)
+    
+    def test_narrow_dataset_kept_whole(self):
+        """Test a small dataset keeps every column's statistics and all sample rows"""
+        df_info = summarize_dataset(self.wide[['gender', 'approved', 'feature_0']], 'approved')
+        prompt, stats = build_dataset_ethics_prompt(df_info, ['gender'], token_budget=1500)
+        
+        self.assertEqual(stats['columns_detailed'], 3)
+        self.assertEqual(stats['columns_dropped'], 0)
+        self.assertEqual(stats['sample_rows'], 5)
+    
+    def test_prompt_size_recorded_in_analysis(self):
+        """Test the ethics analysis result reports the prompt it sent"""
+        backend = mock.Mock(cache_namespace='mock:model')
+        backend.generate.return_value = 'Ethical concerns\n\nNone'
+        df_info = summarize_dataset(self.wide, 'approved')
+        
+        with override_settings(GEMINI_CACHE_ENABLED=False, GEMINI_PROMPT_TOKEN_BUDGET=800), \
+                mock.patch.object(gemini_ai, 'get_backend', return_value=backend):
+            analysis = gemini_ai.analyze_dataset_ethics(df_info, ['gender'])
+        
+        sent = backend.generate.call_args[0][0]
+        self.assertEqual(analysis['prompt']['characters'], len(sent))
+        self.assertLessEqual(analysis['prompt']['estimated_tokens'], 800)
+
+
+class StructuredOutputTest(TestCase):
+
+    sections = {
+        'concerns': ('Potential ethical concerns', 'concerns'),
+        'recommendations': ('Recommendations for mitigation', 'recommendations')
+    }
+    
+    def test_prompt_schema_round_trip(self):
+        """Test the stub answers a structured prompt with every requested key"""
+        prompt = 'Analyze this.\n' + response_format_instructions(self.sections)
+        
+        self.assertEqual(requested_fields(prompt), {key: desc for key, (desc, _) in self.sections.items()})
+        self.assertIsNone(requested_fields('Analyze this.'))
+        result = parse_sections(stub_response(prompt, 500), self.sections, 'full')
+        self.assertTrue(result['concerns'].startswith('Potential ethical concerns'))
+        self.assertTrue(result['recommendations'].startswith('Recommendations for mitigation'))
+        self.assertIsNone(result['full'])
+    
+    def test_fenced_json_with_lists(self):
+        """Test JSON wrapped in a code fence, with list values, is parsed"""
+        text = '```json\n{"recommendations": ["Audit", "Retrain"], "concerns": "Skewed labels"}\n```'
+        
+        self.assertEqual(parse_sections(text, self.sections, 'full'), {
+            'concerns': 'Skewed labels', 'recommendations': 'Audit\nRetrain', 'full': None
+        })
+    
+    def test_truncated_json_keeps_partial_section(self):
+        """Test a response cut off inside a value keeps what was received"""
+        parser = SectionParser(self.sections)
+        parser.feed('{"concerns": "Skewed labels", "recommendations": "Audit the \\')
+        parser.close()
+        
+        self.assertEqual(parser.format, 'partial_json')
+        self.assertEqual(parser.values, {'concerns': 'Skewed labels', 'recommendations': 'Audit the'})
+    
+    def test_plain_text_fallback_does_not_duplicate(self):
+        """Test plain-text answers are split by keyword and missing sections stay empty"""
+        text = 'Key concerns:\nSkewed labels\n\nMore detail\n\nClosing remarks'
+        result = parse_sections(text, self.sections, 'full')
+        
+        self.assertEqual(result['concerns'], 'Key concerns:\nSkewed labels\n\nMore detail')
+        self.assertEqual(result['recommendations'], '')
+        self.assertEqual(result['full'], text)
+
+
+class LLMStubTest(TestCase):
+
+    def test_responses_deterministic_and_sized(self):
+        """Test the stub answers a prompt with the same text of about the requested size"""
+        text = stub_response('prompt', 5000)
+        
+        self.assertEqual(text, stub_response('prompt', 5000))
+        self.assertNotEqual(text, stub_response('other prompt', 5000))
+        self.assertAlmostEqual(len(text), 5000, delta=500)
+        self.assertIn('Ethical concerns', text)
+    
+    def test_bias_api_runs_offline(self):
+        """Test the AI-enabled bias API completes against the stub backend"""
+        df = pd.DataFrame({'gender': ['female', 'male'] * 20, 'approved': [0, 1, 1, 1] * 10})
+        data_file = io.BytesIO(df.to_csv(index=False).encode())
+        data_file.name = 'applicants.csv'
+        
+        with StubLLMServer(response_size=3000, latency=0.05) as stub, \
+                override_settings(LLM_BACKEND='stub', LLM_STUB_URL=stub.url, GEMINI_CACHE_ENABLED=False):
+            response = Client().post(reverse('dashboard:analyze_bias'), {
+                'data_file': data_file,
+                'sensitive_attributes': 'gender',
+                'use_ai_analysis': 'true'
+            }).json()
+        
+        self.assertTrue(response['success'])
+        self.assertIn('gender', response['bias_results']['attribute_distribution'])
+        self.assertIn('Bias patterns', response['ai_ethics_analysis']['bias_patterns'])
+        self.assertEqual(stub.requests, 1)
+
+
+class GeminiStreamingTest(TestCase):
+
+    def test_stream_parser_matches_whole_response(self):
+        """Test sections found while streaming equal those parsed from the full response"""
+        text = stub_response(gemini_ai.governance_prompt('finance', ['GDPR'], 'high'), 3000)
+        expected = parse_sections(text, gemini_ai.GOVERNANCE_SECTIONS, 'full_recommendations')
+        
+        for chunk_size in (1, 7, 64, len(text)):
+            parser = SectionParser(gemini_ai.GOVERNANCE_SECTIONS)
+            found = []
+            for i in range(0, len(text), chunk_size):
+                found.extend(parser.feed(text[i:i + chunk_size]))
+            found.extend(parser.close())
+            
+            self.assertEqual(parser.format, 'json')
+            self.assertEqual(parser.result('full_recommendations'), expected)
+            self.assertEqual(dict(found), {k: v for k, v in expected.items() if k != 'full_recommendations'})
+    
+    def test_governance_recommendations_stream(self):
+        """Test the governance API streams the template, text deltas, sections and the result"""
+        url = reverse('dashboard:get_governance_framework', args=['general'])
+        with StubLLMServer(chunk_delay=0.01) as stub, \
+                override_settings(LLM_BACKEND='stub', LLM_STUB_URL=stub.url, GEMINI_CACHE_ENABLED=False):
+            response = self.client.get(url, {'use_ai_analysis': 'true', 'stream': 'true'})
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            events = [event.split('\n') for event in b''.join(response.streaming_content).decode().split('\n\n') if event]
+        
+        names = [lines[0] for lines in events]
+        self.assertEqual(names[0], 'event: framework')
+        self.assertIn('event: delta', names)
+        self.assertEqual(names.count('event: section'), len(gemini_ai.GOVERNANCE_SECTIONS))
+        self.assertEqual(names[-1], 'event: done')
+        result = json.loads(events[-1][1][len('data: '):])
+        self.assertTrue(result['testing_protocols'].startswith('Testing and validation protocols'))
+    
+    def test_stream_reports_failure(self):
+        """Test a failing AI service ends the stream with an error event"""
+        with StubLLMServer(error_rate=1.0) as stub, \
+                override_settings(LLM_BACKEND='stub', LLM_STUB_URL=stub.url, GEMINI_CACHE_ENABLED=False,
+                                  GEMINI_MAX_RETRIES=0):
+            response = self.client.post(
+                reverse('dashboard:analyze_fairness_metrics') + '?stream=true',
+                json.dumps({'metrics_data': {}, 'model_type': 'classifier', 'sensitive_groups': ['gender']}),
+                content_type='application/json'
+            )
+            content = b''.join(response.streaming_content).decode()
+        
+        self.assertNotIn('event: delta', content)
+        self.assertIn('event: error', content)
+
+
+class AnalysisJobTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.enterContext(override_settings(ANALYSIS_JOBS_EAGER=False))
+        # Keep the AI analysis out of the job runs
+        self.enterContext(mock.patch('dashboard.analysis.perform_ai_ethics_analysis_async',
+                                     new=mock.AsyncMock(return_value={'error': 'AI analysis disabled'})))
+        
+        df = pd.DataFrame({
+            'gender': ['female', 'male'] * 20,
+            'approved': [0, 1, 1, 1] * 10
+        })
+        self.csv = df.to_csv(index=False).encode()
+    
+    def post_bias_upload(self, sensitive_attributes='gender'):
+        data_file = io.BytesIO(self.csv)
+        data_file.name = 'applicants.csv'
+        return self.client.post(reverse('dashboard:bias_detection'), {
+            'name': 'Loan model',
+            'description': 'Loan approvals',
+            'model_type': 'classification',
+            'dataset_description': 'Applicants',
+            'analysis_type': 'dataset',
+            'sensitive_attributes': sensitive_attributes,
+            'data_file': data_file
+        })
+    
+    def test_bias_upload_queued_and_processed_by_worker(self):
+        """Test the view only enqueues the analysis and a worker saves the result"""
+        response = self.post_bias_upload()
+        
+        job = AnalysisJob.objects.get()
+        self.assertRedirects(response, f"{reverse('dashboard:bias_detection')}?job={job.pk}",
+                             fetch_redirect_response=False)
+        self.assertEqual(job.status, AnalysisJob.STATUS_QUEUED)
+        self.assertEqual(job.payload['sensitive_attributes'], ['gender'])
+        # Workers read the upload from the job row, not from local files
+        self.assertEqual(gzip.decompress(job.dataset), self.csv)
+        self.assertFalse(ModelAnalysis.objects.exists())
+        
+        page = self.client.get(response['Location'])
+        self.assertContains(page, reverse('dashboard:job_progress', args=[job.pk]))
+        
+        self.assertEqual(run_worker(stop_when_idle=True), 1)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.analysis.name, 'Loan model')
+        self.assertIn('gender', job.analysis.bias_analysis['attribute_distribution'])
+        self.assertIsNone(job.dataset)
+        
+        progress = self.client.get(reverse('dashboard:job_progress', args=[job.pk])).json()
+        self.assertEqual(progress['status'], 'succeeded')
+        self.assertEqual(progress['analysis_id'], job.analysis_id)
+        self.assertEqual(progress['progress'], 1)
+    
+    def test_job_events_streamed(self):
+        """Test the events endpoint streams recorded progress events and a final done event"""
+        self.post_bias_upload()
+        job = AnalysisJob.objects.get()
+        run_worker(stop_when_idle=True)
+        
+        job.refresh_from_db()
+        stages = [event['stage'] for event in job.events]
+        self.assertEqual(stages[0], 'loading_data')
+        self.assertIn('group_statistics', stages)
+        self.assertEqual(stages[-1], 'complete')
+        
+        url = reverse('dashboard:job_events', args=[job.pk])
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body.count('event: progress'), len(job.events))
+        self.assertTrue(body.rstrip().split('\n\n')[-1].startswith('event: done'))
+        self.assertIn('"status": "succeeded"', body)
+        
+        # Reconnecting clients only get the events they have not seen
+        resumed = self.client.get(url, HTTP_LAST_EVENT_ID=str(job.events[-2]['seq']))
+        body = b''.join(resumed.streaming_content).decode()
+        self.assertEqual(body.count('event: progress'), 1)
+    
+    @override_settings(ANALYSIS_EVENTS_STREAM_SECONDS=0, ANALYSIS_EVENTS_POLL_INTERVAL=0)
+    def test_job_events_long_poll(self):
+        """Test an event stream of an unfinished job ends once it has sent the new events"""
+        self.post_bias_upload()
+        job = AnalysisJob.objects.get()
+        job.events = [{'seq': 1, 'stage': 'loading_data'}, {'seq': 2, 'stage': 'bias_statistics'}]
+        job.save()
+        
+        url = reverse('dashboard:job_events', args=[job.pk])
+        body = b''.join(self.client.get(url).streaming_content).decode()
+        self.assertEqual(body.count('event: progress'), 2)
+        self.assertNotIn('event: done', body)
+        
+        # Nothing new: the stream ends empty at the deadline
+        body = b''.join(self.client.get(url, HTTP_LAST_EVENT_ID='2').streaming_content).decode()
+        self.assertEqual(body, 'retry: 1000\n\n')
+    
+    def test_requeued_job_continues_event_sequence(self):
+        """Test a job requeued after its worker died numbers its new events after the old ones"""
+        self.post_bias_upload()
+        job = claim_job(AnalysisJob.objects.get().pk, 'crashed-worker')
+        report = progress_reporter(job)
+        report('loading_data', fraction=0.05)
+        report('group_statistics', fraction=0.5)
+        AnalysisJob.objects.filter(pk=job.pk).update(heartbeat_at=job.heartbeat_at - timedelta(hours=1))
+        
+        self.assertEqual(requeue_stale_jobs(stale_after=60), (1, 0))
+        run_worker(stop_when_idle=True)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.events[0]['seq'], 3)
+        # A browser that saw the crashed attempt's events gets the whole new run
+        url = reverse('dashboard:job_events', args=[job.pk])
+        body = b''.join(self.client.get(url, HTTP_LAST_EVENT_ID='2').streaming_content).decode()
+        self.assertEqual(body.count('event: progress'), len(job.events))
+    
+    def test_job_status_reports_queue_position(self):
+        """Test queued jobs report their place in the queue"""
+        self.post_bias_upload()
+        self.post_bias_upload()
+        second = AnalysisJob.objects.order_by('created_at').last()
+        
+        status = self.client.get(reverse('dashboard:job_status', args=[second.pk])).json()
+        
+        self.assertEqual(status['status'], 'queued')
+        self.assertEqual(status['queue_position'], 2)
+    
+    def test_failed_job_records_error(self):
+        """Test a job whose handler raises is marked failed with the error"""
+        self.post_bias_upload()
+        job = AnalysisJob.objects.get()
+        
+        with mock.patch.dict('dashboard.jobs.JOB_HANDLERS', {'bias': mock.Mock(side_effect=ValueError('boom'))}):
+            run_worker(stop_when_idle=True)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_FAILED)
+        self.assertEqual(job.error, 'boom')
+        self.assertEqual(job.attempts, 1)
+        # The upload is removed for failed jobs too
+        self.assertIsNone(job.dataset)
+    
+    @override_settings(ANALYSIS_JOB_HEARTBEAT_SECONDS=0.01)
+    def test_heartbeat_sent_during_silent_stages(self):
+        """Test a job's heartbeat is updated while its handler reports no progress"""
+        self.post_bias_upload()
+        
+        def slow_handler(job, report):
+            time.sleep(0.2)
+            raise ValueError('boom')
+        
+        with mock.patch.dict('dashboard.jobs.JOB_HANDLERS', {'bias': slow_handler}), \
+                mock.patch('dashboard.jobs.touch_heartbeat') as touch:
+            run_worker(stop_when_idle=True)
+        
+        self.assertGreater(touch.call_count, 2)
+    
+    def test_job_claimed_once(self):
+        """Test a job already claimed by one worker cannot be claimed by another"""
+        self.post_bias_upload()
+        job = AnalysisJob.objects.get()
+        
+        self.assertIsNotNone(claim_job(job.pk, 'worker-1'))
+        self.assertIsNone(claim_job(job.pk, 'worker-2'))
+        self.assertIsNone(claim_next_job('worker-2'))
+    
+    def test_eager_mode_runs_in_request(self):
+        """Test ANALYSIS_JOBS_EAGER finishes the job before redirecting"""
+        with override_settings(ANALYSIS_JOBS_EAGER=True):
+            response = self.post_bias_upload()
+        
+        self.assertRedirects(response, reverse('dashboard:bias_detection'), fetch_redirect_response=False)
+        self.assertEqual(AnalysisJob.objects.get().status, AnalysisJob.STATUS_SUCCEEDED)
+        self.assertEqual(ModelAnalysis.objects.count(), 1)
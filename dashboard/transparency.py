@@ -6,9 +6,69 @@ import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
+import scipy.stats as stats
+from contextlib import contextmanager
 import json
+import time
 
-def analyze_model_explainability(df, target_column, model_type='classification', explanation_level='basic'):
+from .model_cache import make_cache_key
+from .tree_shap import tree_shap_values
+from .progress import report_progress
+
+# Parallel jobs used to fit the surrogate random forest (-1 uses every core)
+DEFAULT_N_JOBS = -1
+
+# Hyperparameters of the surrogate random forest (also part of the model cache key)
+SURROGATE_PARAMS = {'n_estimators': 100, 'random_state': 42}
+
+# Rows sampled for the global SHAP ranking, rows given individual attributions,
+# and seconds of tree traversal allowed per analysis. The sample is cut to the rows
+# SHAP_TREES trees can explain within the budget, and no global ranking is reported
+# from fewer than SHAP_MIN_TREES trees
+SHAP_SAMPLE_ROWS = 200
+SHAP_EXPLAINED_ROWS = 10
+SHAP_TIME_BUDGET = 5.0
+SHAP_TREES = 25
+SHAP_MIN_TREES = 10
+
+# Adaptive sampling starts from this many stratified rows, grows the sample by
+# ADAPTIVE_GROWTH each round, and stops once consecutive importance rankings reach
+# ADAPTIVE_STABILITY_THRESHOLD weighted rank correlation or the time budget is spent
+ADAPTIVE_INITIAL_ROWS = 20000
+ADAPTIVE_GROWTH = 2
+ADAPTIVE_STABILITY_THRESHOLD = 0.9
+ADAPTIVE_TIME_BUDGET = 60.0
+# Quantile bins used to stratify regression targets
+ADAPTIVE_REGRESSION_STRATA = 10
+
+
+@contextmanager
+def stage_timer(timings, stage, progress=None, rows=None):
+    """
+    Records the wall-clock duration of a stage in seconds
+    
+    Parameters:
+    -----------
+    timings : dict
+        Dictionary the duration is stored in
+    stage : str
+        Name of the stage
+    progress : callable, optional
+        Progress hook told when the stage starts
+    rows : int, optional
+        Rows the stage works on
+    """
+    report_progress(progress, stage, 0 if rows is not None else None, rows)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.perf_counter() - start, 4)
+
+
+def analyze_model_explainability(df, target_column, model_type='classification', explanation_level='basic',
+                                 n_jobs=DEFAULT_N_JOBS, model_cache=None, adaptive_sampling=False,
+                                 progress=None):
     """
     Analyzes model explainability
     
@@ -22,6 +82,14 @@ def analyze_model_explainability(df, target_column, model_type='classification',
         Type of model (classification, regression, etc.)
     explanation_level : str
         Level of explanation detail (basic, intermediate, advanced)
+    n_jobs : int
+        Parallel jobs used to fit the surrogate random forest
+    model_cache : SurrogateModelCache, optional
+        Cache of fitted surrogate models reused across analyses of the same data
+    adaptive_sampling : bool
+        Fit on growing stratified subsamples until the importance ranking stabilizes
+    progress : callable, optional
+        Progress hook called as each stage starts (see dashboard.progress)
         
     Returns:
     --------
@@ -32,19 +100,45 @@ def analyze_model_explainability(df, target_column, model_type='classification',
         'feature_importance': {},
         'model_complexity': {},
         'feature_interactions': {},
+        'shap_values': {},
         'model_limitations': [],
-        'recommended_explainability_methods': []
+        'recommended_explainability_methods': [],
+        'stage_timings': {},
+        'model_cache': None,
+        'sampling': {'mode': 'full', 'sample_size': len(df), 'total_rows': len(df)}
     }
+    timings = results['stage_timings']
     
     # Basic preprocessing
-    X, y, feature_names, categorical_features = preprocess_data(df, target_column)
+    with stage_timer(timings, 'preprocessing', progress, len(df)):
+        X, y, feature_names, categorical_features = preprocess_data(df, target_column)
+    
+    # Fit one surrogate model and share it with every downstream stage
+    model = None
+    model_error = None
+    with stage_timer(timings, 'model_training', progress, len(X)):
+        try:
+            if adaptive_sampling:
+                model, results['model_cache'], results['sampling'] = fit_adaptive_surrogate_model(
+                    X, y, model_type, n_jobs=n_jobs, model_cache=model_cache, progress=progress
+                )
+            else:
+                model, results['model_cache'] = load_or_fit_surrogate_model(
+                    X, y, model_type, n_jobs=n_jobs, model_cache=model_cache
+                )
+        except Exception as e:
+            model_error = str(e)
     
     # Generate feature importance
-    feature_importance = generate_feature_importance(X, y, feature_names, model_type)
-    results['feature_importance'] = feature_importance
+    with stage_timer(timings, 'feature_importance', progress):
+        if model is not None:
+            results['feature_importance'] = generate_feature_importance(X, y, feature_names, model_type, model=model)
+        else:
+            results['feature_importance'] = {'error': model_error}
     
     # Analyze model complexity
-    results['model_complexity'] = analyze_model_complexity(df, feature_names, categorical_features)
+    with stage_timer(timings, 'model_complexity', progress):
+        results['model_complexity'] = analyze_model_complexity(df, feature_names, categorical_features)
     
     # Add recommended explainability methods
     if explanation_level == 'basic':
@@ -71,14 +165,241 @@ def analyze_model_explainability(df, target_column, model_type='classification',
     
     # Generate feature interactions for intermediate and advanced levels
     if explanation_level in ['intermediate', 'advanced']:
-        results['feature_interactions'] = analyze_feature_interactions(X, y, feature_names, model_type)
+        with stage_timer(timings, 'feature_interactions', progress):
+            if model is not None:
+                results['feature_interactions'] = analyze_feature_interactions(
+                    X, y, feature_names, model_type, model=model
+                )
+            else:
+                results['feature_interactions'] = {'error': model_error}
+    
+    # Compute SHAP values for the levels that recommend them
+    if explanation_level in ['intermediate', 'advanced']:
+        with stage_timer(timings, 'shap_values', progress, min(len(X), SHAP_SAMPLE_ROWS)):
+            if model is not None:
+                results['shap_values'] = compute_shap_explanations(X, feature_names, model)
+            else:
+                results['shap_values'] = {'error': model_error}
     
     # Add model limitations
-    results['model_limitations'] = identify_model_limitations(model_type, df, feature_names)
+    with stage_timer(timings, 'model_limitations', progress):
+        results['model_limitations'] = identify_model_limitations(model_type, df, feature_names)
     
     return results
 
 
+def fit_surrogate_model(X, y, model_type='classification', n_jobs=DEFAULT_N_JOBS):
+    """
+    Fits the random forest used as a surrogate for explainability analysis
+    
+    Parameters:
+    -----------
+    X : numpy.ndarray
+        Feature matrix
+    y : numpy.ndarray
+        Target vector
+    model_type : str
+        Type of model (classification, regression)
+    n_jobs : int
+        Parallel jobs used to build the trees
+        
+    Returns:
+    --------
+    RandomForestClassifier or RandomForestRegressor
+        The fitted model
+    """
+    if model_type == 'regression':
+        model = RandomForestRegressor(n_jobs=n_jobs, **SURROGATE_PARAMS)
+    else:  # classification or other
+        model = RandomForestClassifier(n_jobs=n_jobs, **SURROGATE_PARAMS)
+    
+    model.fit(X, y)
+    return model
+
+
+def load_or_fit_surrogate_model(X, y, model_type='classification', n_jobs=DEFAULT_N_JOBS, model_cache=None):
+    """
+    Returns a cached surrogate model for this data, fitting and caching it on a miss
+    
+    Parameters:
+    -----------
+    X : numpy.ndarray
+        Feature matrix
+    y : numpy.ndarray
+        Target vector
+    model_type : str
+        Type of model (classification, regression)
+    n_jobs : int
+        Parallel jobs used to build the trees
+    model_cache : SurrogateModelCache, optional
+        Cache to look the model up in; the model is always fitted when omitted
+        
+    Returns:
+    --------
+    tuple
+        (model, cache_status) where cache_status is 'memory', 'disk', 'miss' or None without a cache
+    """
+    if model_cache is None:
+        return fit_surrogate_model(X, y, model_type, n_jobs=n_jobs), None
+    
+    regression = model_type == 'regression'
+    key = make_cache_key(X, y, 'regression' if regression else 'classification', **SURROGATE_PARAMS)
+    model, tier = model_cache.get(key)
+    if model is not None:
+        return model, tier
+    
+    model = fit_surrogate_model(X, y, model_type, n_jobs=n_jobs)
+    model_cache.put(key, model)
+    return model, 'miss'
+
+
+def fit_adaptive_surrogate_model(X, y, model_type='classification', n_jobs=DEFAULT_N_JOBS, model_cache=None,
+                                 initial_rows=ADAPTIVE_INITIAL_ROWS, growth=ADAPTIVE_GROWTH,
+                                 stability_threshold=ADAPTIVE_STABILITY_THRESHOLD,
+                                 time_budget=ADAPTIVE_TIME_BUDGET, progress=None):
+    """
+    Fits surrogate models on growing stratified subsamples until the feature
+    importance ranking stops changing
+    
+    Each round fits on a larger prefix of one stratified shuffle, so every sample
+    contains the previous one. The stability score is the weighted Kendall tau
+    between the importances of the last two rounds, which weights agreement on
+    the top features over reshuffles among near-zero ones. A new round is only
+    started when its projected duration fits in the remaining time budget.
+    Datasets too small for the first two rounds to fit fewer rows than the
+    whole dataset are fitted once on all rows.
+    
+    Parameters:
+    -----------
+    X : numpy.ndarray
+        Feature matrix
+    y : numpy.ndarray
+        Target vector
+    model_type : str
+        Type of model (classification, regression)
+    n_jobs : int
+        Parallel jobs used to build the trees
+    model_cache : SurrogateModelCache, optional
+        Cache to look each round's model up in
+    initial_rows : int
+        Rows in the first subsample
+    growth : float
+        Factor the subsample grows by each round
+    stability_threshold : float
+        Rank correlation between consecutive rounds that ends the search
+    time_budget : float
+        Seconds after which no further round is started
+    progress : callable, optional
+        Progress hook called with the sample size of every round
+        
+    Returns:
+    --------
+    tuple
+        (model, cache_status, sampling) where sampling reports the sample size,
+        stability score and per-round history
+    """
+    start = time.perf_counter()
+    total_rows = len(X)
+    order = stratified_order(y, model_type)
+    
+    sample_size = min(initial_rows, total_rows)
+    if sample_size * (1 + growth) >= total_rows:
+        # Stability needs two rounds, which would cost more than one fit on every row
+        sample_size = total_rows
+    previous_importances = None
+    stability = None
+    history = []
+    
+    while True:
+        round_start = time.perf_counter()
+        report_progress(progress, 'model_training', sample_size, total_rows)
+        if sample_size < total_rows:
+            rows = np.sort(order[:sample_size])
+            X_sample, y_sample = X[rows], y[rows]
+        else:
+            X_sample, y_sample = X, y
+        model, cache_status = load_or_fit_surrogate_model(
+            X_sample, y_sample, model_type, n_jobs=n_jobs, model_cache=model_cache
+        )
+        importances = model.feature_importances_
+        
+        if previous_importances is not None:
+            stability = float(stats.weightedtau(previous_importances, importances)[0])
+            if np.isnan(stability):
+                # Constant importances only correlate when they are identical
+                stability = 1.0 if np.allclose(previous_importances, importances) else 0.0
+        history.append({'sample_size': int(sample_size), 'stability_score': stability})
+        
+        if stability is not None and stability >= stability_threshold:
+            stop_reason = 'stable'
+            break
+        if sample_size >= total_rows:
+            stop_reason = 'all_rows'
+            break
+        next_size = min(int(sample_size * growth), total_rows)
+        now = time.perf_counter()
+        projected = (now - round_start) * next_size / sample_size
+        if now - start + projected > time_budget:
+            stop_reason = 'time_budget'
+            break
+        
+        previous_importances = importances
+        sample_size = next_size
+    
+    sampling = {
+        'mode': 'adaptive',
+        'sample_size': int(sample_size),
+        'total_rows': int(total_rows),
+        'stability_score': stability,
+        'stop_reason': stop_reason,
+        'rounds': history
+    }
+    return model, cache_status, sampling
+
+
+def stratified_order(y, model_type='classification', random_state=SURROGATE_PARAMS['random_state']):
+    """
+    Shuffles row indices so that every prefix keeps the target distribution
+    
+    Parameters:
+    -----------
+    y : numpy.ndarray
+        Target vector
+    model_type : str
+        Type of model; regression targets are stratified by quantile bins
+    random_state : int
+        Seed of the shuffle
+        
+    Returns:
+    --------
+    numpy.ndarray
+        Permutation of row indices
+    """
+    rng = np.random.default_rng(random_state)
+    
+    if model_type == 'regression':
+        values = pd.to_numeric(pd.Series(y), errors='coerce')
+        strata = pd.qcut(values.rank(method='first'), ADAPTIVE_REGRESSION_STRATA, labels=False, duplicates='drop')
+        strata = strata.fillna(-1).to_numpy()
+    else:
+        strata = pd.Series(y).astype(str).to_numpy()
+    codes, _ = pd.factorize(strata)
+    
+    # Rank each row within its shuffled stratum, then interleave strata by relative rank
+    shuffled = rng.permutation(len(codes))
+    shuffled_codes = codes[shuffled]
+    by_stratum = shuffled[np.argsort(shuffled_codes, kind='stable')]
+    stratum_sizes = np.bincount(codes)
+    stratum_starts = np.concatenate([[0], np.cumsum(stratum_sizes)[:-1]])
+    
+    rank = np.empty(len(codes))
+    sorted_codes = codes[by_stratum]
+    rank[by_stratum] = np.arange(len(codes)) - stratum_starts[sorted_codes]
+    relative_rank = (rank + rng.random(len(codes))) / stratum_sizes[codes]
+    
+    return np.argsort(relative_rank, kind='stable')
+
+
 def preprocess_data(df, target_column):
     """
     Preprocesses data for explainability analysis
@@ -127,7 +448,7 @@ def preprocess_data(df, target_column):
     return X, y, feature_names, categorical_features
 
 
-def generate_feature_importance(X, y, feature_names, model_type='classification'):
+def generate_feature_importance(X, y, feature_names, model_type='classification', model=None):
     """
     Generates feature importance scores
     
@@ -141,6 +462,8 @@ def generate_feature_importance(X, y, feature_names, model_type='classification'
         List of feature names
     model_type : str
         Type of model (classification, regression)
+    model : fitted random forest, optional
+        Model to read importances from; one is fitted when not given
         
     Returns:
     --------
@@ -151,12 +474,8 @@ def generate_feature_importance(X, y, feature_names, model_type='classification'
     
     try:
         # Train a random forest model for feature importance
-        if model_type == 'regression':
-            model = RandomForestRegressor(n_estimators=100, random_state=42)
-        else:  # classification or other
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
-        
-        model.fit(X, y)
+        if model is None:
+            model = fit_surrogate_model(X, y, model_type)
         
         # Get feature importance
         importances = model.feature_importances_
@@ -264,7 +583,7 @@ def analyze_model_complexity(df, feature_names, categorical_features):
     return results
 
 
-def analyze_feature_interactions(X, y, feature_names, model_type='classification'):
+def analyze_feature_interactions(X, y, feature_names, model_type='classification', model=None):
     """
     Analyzes potential feature interactions
     
@@ -278,6 +597,8 @@ def analyze_feature_interactions(X, y, feature_names, model_type='classification
         List of feature names
     model_type : str
         Type of model (classification, regression)
+    model : fitted random forest, optional
+        Model to analyze; one is fitted when not given
         
     Returns:
     --------
@@ -288,12 +609,8 @@ def analyze_feature_interactions(X, y, feature_names, model_type='classification
     
     try:
         # Train a random forest model
-        if model_type == 'regression':
-            model = RandomForestRegressor(n_estimators=100, random_state=42)
-        else:  # classification or other
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
-        
-        model.fit(X, y)
+        if model is None:
+            model = fit_surrogate_model(X, y, model_type)
         
         # Get feature importance
         importances = model.feature_importances_
@@ -303,26 +620,17 @@ def analyze_feature_interactions(X, y, feature_names, model_type='classification
         top_indices = indices[:min(10, len(feature_names))]
         top_features = [feature_names[i] for i in top_indices]
         
-        # Identify potential interactions by analyzing trees
+        # Measure how much each feature's splits depend on the other having been split above them
+        strengths = tree_interaction_strengths(model, top_indices)
         potential_interactions = []
         
-        # This is a simplified heuristic for interaction detection
-        # In a real implementation, you would analyze the tree structure
         for i in range(len(top_features)):
             for j in range(i+1, len(top_features)):
-                feature1 = top_features[i]
-                feature2 = top_features[j]
-                
-                # Simulated interaction strength
-                # In practice, you would compute this from the model
-                interaction_strength = np.random.uniform(0, 1) * min(
-                    importances[feature_names.index(feature1)],
-                    importances[feature_names.index(feature2)]
-                )
+                interaction_strength = strengths[i, j]
                 
                 if interaction_strength > 0.01:
                     potential_interactions.append({
-                        'features': [feature1, feature2],
+                        'features': [top_features[i], top_features[j]],
                         'strength': float(interaction_strength)
                     })
         
@@ -344,6 +652,184 @@ def analyze_feature_interactions(X, y, feature_names, model_type='classification
     return results
 
 
+def compute_shap_explanations(X, feature_names, model, sample_rows=SHAP_SAMPLE_ROWS,
+                              explained_rows=SHAP_EXPLAINED_ROWS, time_budget=SHAP_TIME_BUDGET,
+                              min_trees=SHAP_MIN_TREES):
+    """
+    Explains the surrogate model with TreeSHAP on a sample of rows
+    
+    Parameters:
+    -----------
+    X : numpy.ndarray
+        Feature matrix
+    feature_names : list
+        List of feature names
+    model : fitted random forest
+        Model to explain
+    sample_rows : int
+        Rows sampled for the global mean |SHAP| ranking
+    explained_rows : int
+        Rows of the sample returned with individual attributions
+    time_budget : float
+        Seconds after which no further work is started; rows SHAP_TREES trees
+        cannot explain within it are left out of the sample
+    min_trees : int
+        Trees (capped at the forest size) needed to report SHAP values at all
+        
+    Returns:
+    --------
+    dict
+        Dictionary containing global and per-row SHAP results, or an error
+        when fewer than min_trees trees fit in the time budget
+    """
+    results = {}
+    
+    try:
+        # Random order, so rows dropped to fit the time budget leave a random subsample
+        rng = np.random.default_rng(SURROGATE_PARAMS['random_state'])
+        rows = rng.permutation(len(X))[:sample_rows]
+        
+        shap_values, expected_value, trees_used = tree_shap_values(
+            model, X[rows], time_budget=time_budget, min_trees=SHAP_TREES
+        )
+        rows = rows[:len(shap_values)]
+        total_trees = len(model.estimators_)
+        if trees_used < min(min_trees, total_trees):
+            # A few trees of a forest do not rank its features
+            return {
+                'error': f"Only {trees_used} of {total_trees} trees could be explained within the time budget",
+                'rows_sampled': int(len(rows)),
+                'trees_used': int(trees_used),
+                'total_trees': total_trees,
+                'complete': False
+            }
+        
+        # Classifiers explain the probability of the positive class (binary) or
+        # of each row's predicted class (multiclass); the ranking spans all classes
+        if hasattr(model, 'classes_'):
+            global_importance = np.abs(shap_values).mean(axis=0).sum(axis=1)
+            if len(model.classes_) == 2:
+                explained = np.ones(len(rows), dtype=int)
+            else:
+                explained = (shap_values.sum(axis=1) + expected_value).argmax(axis=1)
+        else:
+            global_importance = np.abs(shap_values[:, :, 0]).mean(axis=0)
+            explained = np.zeros(len(rows), dtype=int)
+        
+        ranking = np.argsort(global_importance)[::-1]
+        results['global_importance'] = {
+            feature_names[i]: float(global_importance[i]) for i in ranking
+        }
+        results['top_features'] = [feature_names[i] for i in ranking[:5]]
+        
+        row_attributions = []
+        for position in range(min(explained_rows, len(rows))):
+            output = explained[position]
+            attributions = shap_values[position, :, output]
+            row_attributions.append({
+                'row': int(rows[position]),
+                'output': str(model.classes_[output]) if hasattr(model, 'classes_') else 'prediction',
+                'expected_value': float(expected_value[output]),
+                'prediction': float(expected_value[output] + attributions.sum()),
+                'attributions': {feature_names[i]: float(attributions[i]) for i in ranking}
+            })
+        results['row_attributions'] = row_attributions
+        
+        results['rows_sampled'] = int(len(rows))
+        results['trees_used'] = int(trees_used)
+        results['total_trees'] = total_trees
+        results['complete'] = trees_used == total_trees
+    
+    except Exception as e:
+        results['error'] = str(e)
+    
+    return results
+
+
+def tree_interaction_strengths(model, feature_indices):
+    """
+    Measures pairwise feature interactions from the structure of a fitted forest
+    
+    A split on one feature that happens below a split on another feature on the same
+    decision path is credited to the pair, weighted by the impurity decrease it achieves
+    (normalized per tree as in impurity-based feature importance). All trees are stacked
+    into one node array and walked level by level, so the cost is one vectorized step
+    per tree depth rather than a Python loop over nodes or feature pairs.
+    
+    Parameters:
+    -----------
+    model : fitted random forest
+        Model whose estimators_ are analyzed
+    feature_indices : array-like
+        Column indices of the features to compare
+        
+    Returns:
+    --------
+    numpy.ndarray
+        Symmetric (k, k) matrix of interaction strengths with a zero diagonal
+    """
+    feature_indices = np.asarray(feature_indices, dtype=np.intp)
+    k = len(feature_indices)
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    if k < 2 or not trees:
+        return np.zeros((k, k))
+    
+    # Stack every tree into one node array, offsetting child pointers
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+    left = np.concatenate([
+        np.where(tree.children_left >= 0, tree.children_left + offset, -1)
+        for tree, offset in zip(trees, offsets)
+    ])
+    right = np.concatenate([
+        np.where(tree.children_right >= 0, tree.children_right + offset, -1)
+        for tree, offset in zip(trees, offsets)
+    ])
+    feature = np.concatenate([tree.feature for tree in trees])
+    
+    # Weighted impurity decrease of each split, normalized within its tree
+    weights = []
+    for tree in trees:
+        n_samples = tree.weighted_n_node_samples
+        weighted_impurity = n_samples * tree.impurity
+        is_split = tree.children_left >= 0
+        decrease = np.zeros(tree.node_count)
+        decrease[is_split] = (
+            weighted_impurity[is_split]
+            - weighted_impurity[tree.children_left[is_split]]
+            - weighted_impurity[tree.children_right[is_split]]
+        )
+        total = decrease.sum()
+        weights.append(decrease / total if total > 0 else decrease)
+    weights = np.concatenate(weights) / len(trees)
+    
+    # Position of each split feature among the compared features (-1 when not compared)
+    position = np.full(max(int(feature.max()), int(feature_indices.max())) + 1, -1, dtype=np.intp)
+    position[feature_indices] = np.arange(k)
+    split_position = np.where(feature >= 0, position[np.maximum(feature, 0)], -1)
+    
+    # ancestors[node, p] is True when feature p is split on above the node
+    ancestors = np.zeros((len(feature), k), dtype=bool)
+    frontier = offsets
+    while frontier.size:
+        parents = frontier[left[frontier] >= 0]
+        child_ancestors = ancestors[parents].copy()
+        parent_position = split_position[parents]
+        compared = parent_position >= 0
+        child_ancestors[np.flatnonzero(compared), parent_position[compared]] = True
+        ancestors[left[parents]] = child_ancestors
+        ancestors[right[parents]] = child_ancestors
+        frontier = np.concatenate([left[parents], right[parents]])
+    
+    # Credit each compared split to the compared features above it
+    splits = np.flatnonzero(split_position >= 0)
+    strengths = np.zeros((k, k))
+    np.add.at(strengths, split_position[splits], weights[splits, None] * ancestors[splits])
+    
+    strengths = strengths + strengths.T
+    np.fill_diagonal(strengths, 0)
+    return strengths
+
+
 def identify_model_limitations(model_type, df, feature_names):
     """
     Identifies potential limitations of the model
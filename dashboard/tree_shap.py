@@ -0,0 +1,236 @@
+"""
+Vectorized TreeSHAP for fitted scikit-learn random forests
+Computes exact path-dependent SHAP values without the external shap package
+"""
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+# Upper bound on rows x leaves x path length held in memory at once
+MAX_BLOCK_ELEMENTS = 2_000_000
+
+
+def tree_shap_values(model, X, time_budget=None, min_trees=None):
+    """
+    Computes path-dependent TreeSHAP values for a fitted random forest
+
+    Each leaf contributes a product game over the distinct features on its
+    path: a feature either follows the row (1 when the row reaches the leaf's
+    side of every split on it, 0 otherwise) or follows the training cover
+    fraction of those splits. The Shapley value of such a game comes from the
+    coefficients of prod_j (z_j + o_j t), so every leaf of a tree is handled
+    in one array operation per path position instead of recursing per row.
+
+    Parameters:
+    -----------
+    model : RandomForestClassifier or RandomForestRegressor
+        Fitted forest
+    X : numpy.ndarray
+        Rows to explain, encoded like the training data
+    time_budget : float, optional
+        Seconds after which no further work is started, checked between
+        blocks of rows. The first tree gets time_budget / min_trees of it and
+        only the rows it finishes in that time (at least one block) are
+        explained, so the budget is spread over the forest instead of spent
+        on every row of a few trees; a later tree still running at the
+        deadline is dropped
+    min_trees : int, optional
+        Trees the rows are sized for when time_budget is set (default: all)
+
+    Returns:
+    --------
+    tuple
+        (shap_values, expected_value, trees_used) where shap_values has shape
+        (rows, features, outputs), rows being the leading rows of X that were
+        explained, and outputs are class probabilities for a classifier or the
+        prediction for a regressor
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget is not None else None
+    # Trees compare float32 copies of the features
+    X = np.asarray(X, dtype=np.float32).astype(np.float64)
+    n_rows, n_features = X.shape
+
+    estimators = model.estimators_
+    n_outputs = estimators[0].tree_.value.shape[2]
+    shap_values = np.zeros((n_rows, n_features, n_outputs))
+    expected_value = np.zeros(n_outputs)
+
+    # The first tree's share of the budget decides how many rows are explained
+    first_deadline = None
+    if deadline is not None:
+        min_trees = len(estimators) if min_trees is None else min(max(1, min_trees), len(estimators))
+        first_deadline = start + time_budget / min_trees
+
+    trees_used = 0
+    for estimator in estimators:
+        if trees_used and deadline is not None and time.perf_counter() > deadline:
+            break
+
+        tree_phi, tree_expected, rows_done = _tree_shap(
+            estimator.tree_, X, is_classifier=hasattr(model, 'classes_'),
+            deadline=deadline if trees_used else first_deadline
+        )
+        if rows_done < len(X):
+            if trees_used:
+                break
+            X, shap_values = X[:rows_done], shap_values[:rows_done]
+        shap_values += tree_phi
+        expected_value += tree_expected
+        trees_used += 1
+
+    return shap_values / trees_used, expected_value / trees_used, trees_used
+
+
+def _tree_shap(tree, X, is_classifier, deadline=None):
+    """
+    SHAP values of a single tree for the rows of X
+
+    Returns (phi, expected_value, rows_done); past the deadline no further
+    block of rows is started, so phi only covers the first rows_done rows.
+    """
+    n_rows, n_features = X.shape
+    feature_ids, lower, upper, nan_follows, cover, values = _leaf_paths(tree, is_classifier)
+    n_leaves, depth = feature_ids.shape
+
+    phi = np.zeros((n_rows, n_features, values.shape[1]))
+    expected_value = (values * cover.prod(axis=1)[:, None]).sum(axis=0)
+    if depth == 0:
+        return phi, expected_value, n_rows
+
+    # The Shapley value of path feature d in the leaf's product game is
+    # v (o_d - z_d) * integral_0^1 prod_{k != d} (z_k (1 - u) + o_k u) du,
+    # a polynomial of degree depth - 1 that Gauss-Legendre integrates exactly
+    n_points = (depth + 1) // 2
+    points, point_weights = np.polynomial.legendre.leggauss(n_points)
+    u = (points + 1) / 2
+    point_weights = point_weights / 2
+
+    # Scatters (leaf, path position) columns onto feature columns
+    scatter = sparse.csr_matrix(
+        (np.ones(n_leaves * depth), (np.arange(n_leaves * depth), feature_ids.ravel())),
+        shape=(n_leaves * depth, n_features)
+    )
+    # Arrays are laid out as (path position, quadrature point, row, leaf)
+    z = cover.T[:, None, None, :]
+    u = u[None, :, None, None]
+
+    # Blocks of rows x leaves; deep trees whose paths alone exceed the bound
+    # for a single row are split across leaves as well
+    per_leaf = depth * n_points
+    block_leaves = max(1, min(n_leaves, MAX_BLOCK_ELEMENTS // per_leaf))
+    block_rows = max(1, MAX_BLOCK_ELEMENTS // (block_leaves * per_leaf))
+    for start in range(0, n_rows, block_rows):
+        if start and deadline is not None and time.perf_counter() > deadline:
+            return phi[:start], expected_value, start
+        rows = X[start:start + block_rows]
+
+        for leaf_start in range(0, n_leaves, block_leaves):
+            leaves = slice(leaf_start, leaf_start + block_leaves)
+            leaf_ids = feature_ids[leaves]
+
+            # follows[d, r, l] is 1 when row r satisfies every split on feature d of leaf l's path
+            x = rows[:, leaf_ids.T].transpose(1, 0, 2)
+            follows = np.where(
+                np.isnan(x), nan_follows[leaves].T[:, None, :],
+                (x > lower[leaves].T[:, None, :]) & (x <= upper[leaves].T[:, None, :])
+            ).astype(np.float64)
+
+            leaf_z = z[..., leaves]
+            factors = leaf_z * (1 - u) + follows[:, None] * u
+            others = np.divide(factors.prod(axis=0), factors, out=np.zeros_like(factors), where=factors > 0)
+            integral = np.tensordot(point_weights, others, axes=(0, 1))
+            leaf_phi = integral * (follows - leaf_z[:, 0])
+
+            # (rows, leaves * depth) ordering to match the scatter matrix
+            leaf_phi = leaf_phi.transpose(1, 2, 0)
+            leaf_scatter = scatter[leaf_start * depth:(leaf_start + len(leaf_ids)) * depth]
+            for output in range(values.shape[1]):
+                block = leaf_phi * values[leaves][None, :, output, None]
+                phi[start:start + len(rows), :, output] += block.reshape(len(rows), -1) @ leaf_scatter
+
+    return phi, expected_value, n_rows
+
+
+def _leaf_paths(tree, is_classifier):
+    """
+    Collects, for every leaf, the distinct features on its path together with
+    the interval a row must fall in, whether missing values follow the path,
+    and the product of training cover fractions of their splits
+
+    Paths are padded to the longest one with dummy features that every row
+    follows and that keep the full cover; such players never change a
+    Shapley value.
+    """
+    left = tree.children_left
+    right = tree.children_right
+    feature = tree.feature
+    threshold = tree.threshold
+    node_cover = tree.weighted_n_node_samples
+    missing_left = getattr(tree, 'missing_go_to_left', np.ones(tree.node_count, dtype=bool)).astype(bool)
+
+    # Only the features this tree splits on need to be tracked
+    used = np.unique(feature[left >= 0])
+    local = np.full(max(int(feature.max()), 0) + 1, -1, dtype=np.intp)
+    local[used] = np.arange(len(used))
+
+    n_nodes, n_used = tree.node_count, len(used)
+    lower = np.full((n_nodes, n_used), -np.inf)
+    upper = np.full((n_nodes, n_used), np.inf)
+    nan_follows = np.ones((n_nodes, n_used), dtype=bool)
+    cover = np.ones((n_nodes, n_used))
+    on_path = np.zeros((n_nodes, n_used), dtype=bool)
+
+    frontier = np.array([0])
+    while frontier.size:
+        parents = frontier[left[frontier] >= 0]
+        columns = local[feature[parents]]
+        for children, goes_left in ((left[parents], True), (right[parents], False)):
+            lower[children] = lower[parents]
+            upper[children] = upper[parents]
+            nan_follows[children] = nan_follows[parents]
+            cover[children] = cover[parents]
+            on_path[children] = on_path[parents]
+
+            if goes_left:
+                upper[children, columns] = np.minimum(upper[parents, columns], threshold[parents])
+                nan_follows[children, columns] &= missing_left[parents]
+            else:
+                lower[children, columns] = np.maximum(lower[parents, columns], threshold[parents])
+                nan_follows[children, columns] &= ~missing_left[parents]
+            cover[children, columns] *= node_cover[children] / node_cover[parents]
+            on_path[children, columns] = True
+        frontier = np.concatenate([left[parents], right[parents]])
+
+    leaves = np.flatnonzero(left < 0)
+    on_path = on_path[leaves]
+    depth = int(on_path.sum(axis=1).max()) if n_used else 0
+
+    # Path features first, padding after
+    order = np.argsort(~on_path, axis=1, kind='stable')[:, :depth]
+    padding = ~np.take_along_axis(on_path, order, axis=1)
+
+    def gather(values, fill):
+        gathered = np.take_along_axis(values[leaves], order, axis=1)
+        gathered[padding] = fill
+        return gathered
+
+    feature_ids = used[order] if n_used else np.zeros((len(leaves), 0), dtype=np.intp)
+    feature_ids[padding] = 0
+
+    values = tree.value[leaves, 0, :]
+    if is_classifier:
+        totals = values.sum(axis=1, keepdims=True)
+        values = np.divide(values, totals, out=np.zeros_like(values), where=totals > 0)
+
+    return (
+        feature_ids,
+        gather(lower, -np.inf),
+        gather(upper, np.inf),
+        gather(nan_follows, True),
+        gather(cover, 1.0),
+        values
+    )
+
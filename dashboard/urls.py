@@ -22,4 +22,9 @@ urlpatterns = [
     path('api/analyze-model-transparency/', views.analyze_model_transparency, name='analyze_model_transparency'),
     path('api/get-governance-framework/<str:framework_type>/', views.get_governance_framework, name='get_governance_framework'),
     path('api/analyze-fairness-metrics/', views.analyze_fairness_metrics, name='analyze_fairness_metrics'),
+    path('api/ai/status/', views.ai_status, name='ai_status'),
+    path('api/analyses/<int:analysis_id>/', views.analysis_results, name='analysis_results'),
+    path('api/jobs/<uuid:job_id>/', views.job_status, name='job_status'),
+    path('api/jobs/<uuid:job_id>/progress/', views.job_progress, name='job_progress'),
+    path('api/jobs/<uuid:job_id>/events/', views.job_events, name='job_events'),
 ]
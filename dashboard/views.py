@@ -1,50 +1,103 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.core.serializers.json import DjangoJSONEncoder
 import json
 import pandas as pd
 import numpy as np
 import io
+import time
 
-# Ensure we're encoding JSON in a consistent way
-class CustomJSONEncoder(DjangoJSONEncoder):
-    """Custom JSON encoder that handles additional types"""
-    def default(self, obj):
-        if isinstance(obj, (np.int_, np.intc, np.intp, np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64)):
-            return int(obj)
-        elif isinstance(obj, (np.float_, np.float16, np.float32, np.float64)):
-            return float(obj)
-        elif isinstance(obj, (np.ndarray,)):
-            return obj.tolist()
-        return super().default(obj)
-
-from .models import ModelAnalysis, CaseStudy, EducationalResource, UserProfile, UserActivity
+from .models import ModelAnalysis, CaseStudy, EducationalResource, UserProfile, UserActivity, AnalysisJob
 from .forms import ModelUploadForm, TransparencyAnalyzerForm, CustomSignUpForm, CustomLoginForm, UserProfileForm
-from .bias_detection import detect_bias_in_data, calculate_fairness_metrics, perform_ai_ethics_analysis
+from .bias_detection import perform_ai_ethics_analysis_async
+from .analysis import read_uploaded_csv, run_bias_analysis
 from .transparency import analyze_model_explainability, generate_feature_importance
-from .governance import get_governance_template
+from .governance import TEMPLATES_LAST_MODIFIED, get_governance_template, get_governance_template_json
+from .model_cache import get_default_cache
+from .ai_cache import get_default_cache as get_default_ai_cache
+from .homepage_stats import get_homepage_stats
+from .jobs import enqueue_job
+from .result_store import RESULT_KINDS
+from .serialization import ResultJsonResponse, to_json
+from .gemini_async import run_alongside
 from . import gemini_ai
-from . import sample_data
+
+
+def redirect_to_job(request, view_name, job):
+    """
+    Redirects back to an analysis page after enqueueing a job
+    
+    Jobs that already finished (eager mode) report their outcome as a message;
+    otherwise the page is told which job to poll.
+    """
+    if not job.is_finished:
+        messages.info(request, "Your analysis has been queued and will appear below when it completes.")
+        return redirect(f"{reverse(view_name)}?job={job.pk}")
+    
+    if job.status == AnalysisJob.STATUS_FAILED:
+        messages.error(request, f"Error analyzing data: {job.error}")
+    elif job.analysis and 'error' in job.analysis.summary.get('bias_analysis', {}):
+        messages.warning(request, job.message)
+    else:
+        messages.success(request, job.message)
+    return redirect(view_name)
+
+
+def get_pending_job(request, job_type):
+    """Returns the unfinished job named in the ?job= query parameter, if any"""
+    job_id = request.GET.get('job')
+    if not job_id:
+        return None
+    
+    try:
+        job = AnalysisJob.objects.defer('dataset').get(pk=job_id, job_type=job_type)
+    except (AnalysisJob.DoesNotExist, ValidationError, ValueError):
+        return None
+    return None if job.is_finished else job
+
+
+def paginate_analyses(request, analyses):
+    """
+    Returns the requested ?page= of completed analyses
+    
+    Without ?page=, an ?analysis_id= selects the page holding that analysis.
+    Only the analysis rows and their summaries are read; the page loads the
+    full results from analysis_results when an analysis is opened.
+    """
+    # pk breaks ties so the page of an analysis is well defined
+    analyses = analyses.order_by('-created_at', '-pk')
+    page_number = request.GET.get('page')
+    
+    if page_number is None and request.GET.get('analysis_id', '').isdigit():
+        target = analyses.filter(pk=request.GET['analysis_id']).values('pk', 'created_at').first()
+        if target is not None:
+            newer = analyses.filter(
+                Q(created_at__gt=target['created_at']) | Q(created_at=target['created_at'], pk__gt=target['pk'])
+            ).count()
+            page_number = newer // settings.ANALYSIS_LIST_PAGE_SIZE + 1
+    
+    paginator = Paginator(analyses, settings.ANALYSIS_LIST_PAGE_SIZE)
+    return paginator.get_page(page_number)
 
 
 def index(request):
     """Main dashboard view"""
-    # Load sample data if database is empty
-    if (ModelAnalysis.objects.count() == 0 and 
-        CaseStudy.objects.count() == 0 and 
-        EducationalResource.objects.count() == 0):
-        sample_data.populate_sample_data()
-        messages.info(request, "Sample data has been loaded for demonstration purposes.")
-    
+    # Sample data is loaded once with the load_sample_data command
     context = {
         'title': 'AI Ethics Platform',
-        'recent_analyses': ModelAnalysis.objects.order_by('-created_at')[:5],
-        'case_studies_count': CaseStudy.objects.count(),
-        'resources_count': EducationalResource.objects.count()
+        **get_homepage_stats()
     }
     return render(request, 'dashboard/index.html', context)
 
@@ -56,11 +109,11 @@ def bias_detection(request):
     if request.method == 'POST':
         form = ModelUploadForm(request.POST, request.FILES)
         if form.is_valid():
-            model_analysis = form.save(commit=False)
-            
             try:
                 # Determine analysis type (dataset upload or manual input)
                 analysis_type = form.cleaned_data.get('analysis_type')
+                data_file = None
+                df = None
                 
                 # Process data based on analysis type
                 if analysis_type == 'dataset':
@@ -69,8 +122,10 @@ def bias_detection(request):
                     if not data_file:
                         messages.error(request, "Dataset file is required for dataset analysis")
                         return redirect('dashboard:bias_detection')
-                        
-                    df = pd.read_csv(data_file)
+                    
+                    # Only the header is needed here; the worker reads the data
+                    columns = pd.read_csv(data_file, nrows=0).columns
+                    data_file.seek(0)
                 else:  # manual input
                     # Create dataframe from manual input
                     from .bias_detection import create_dataframe_from_manual_input
@@ -79,20 +134,21 @@ def bias_detection(request):
                     if df is None or len(df) == 0:
                         messages.error(request, "Please provide at least two attributes for manual analysis")
                         return redirect('dashboard:bias_detection')
+                    columns = df.columns
                 
                 # Get sensitive attributes from form
                 sensitive_attrs = [attr.strip() for attr in 
                                  form.cleaned_data['sensitive_attributes'].split(',')]
                 
                 # Filter sensitive attributes to only include columns that exist in the dataframe
-                valid_sensitive_attrs = [attr for attr in sensitive_attrs if attr in df.columns]
+                valid_sensitive_attrs = [attr for attr in sensitive_attrs if attr in columns]
                 
                 if not valid_sensitive_attrs:
                     if analysis_type == 'manual':
                         # For manual input, use provided demographic attributes as sensitive attributes
                         demo_attrs = ['age', 'gender', 'ethnicity', 'income', 'education_level', 
                                      'employment_status', 'disability']
-                        valid_sensitive_attrs = [attr for attr in demo_attrs if attr in df.columns]
+                        valid_sensitive_attrs = [attr for attr in demo_attrs if attr in columns]
                         
                         if not valid_sensitive_attrs:
                             messages.error(request, "No valid sensitive attributes provided or found in data")
@@ -101,74 +157,32 @@ def bias_detection(request):
                         messages.error(request, "None of the specified sensitive attributes were found in the dataset")
                         return redirect('dashboard:bias_detection')
                 
-                # Get sample dataset type
-                sample_dataset_type = form.cleaned_data.get('sample_dataset_type', '')
-                
-                try:
-                    # Detect bias in the data
-                    bias_results = detect_bias_in_data(df, valid_sensitive_attrs, None, sample_dataset_type)
-                    
-                    # Structure for minimal viable result if there are issues
-                    if not isinstance(bias_results, dict):
-                        bias_results = {
-                            'error': 'Invalid bias results format',
-                            'dataset_size': len(df),
-                            'analysis_type': analysis_type
-                        }
-                    
-                    # Calculate fairness metrics
-                    fairness_metrics = calculate_fairness_metrics(df, valid_sensitive_attrs)
-                    
-                    # Perform AI-powered ethics analysis
-                    ai_ethics_analysis = perform_ai_ethics_analysis(df, valid_sensitive_attrs, None, sample_dataset_type)
-                    
-                    # Merge AI analysis with bias results (safely)
-                    if isinstance(ai_ethics_analysis, dict) and 'error' not in ai_ethics_analysis:
-                        bias_results['ai_ethics_analysis'] = ai_ethics_analysis
-                
-                    # Add analysis type to results
-                    bias_results['analysis_type'] = analysis_type
-                    
-                    # Save results to model - serialize with our custom encoder
-                    bias_json = json.dumps(bias_results, cls=CustomJSONEncoder)
-                    fairness_json = json.dumps(fairness_metrics, cls=CustomJSONEncoder)
-                    
-                    # Load back to ensure proper serialization
-                    model_analysis.bias_analysis = json.loads(bias_json)
-                    model_analysis.fairness_metrics = json.loads(fairness_json)
-                    model_analysis.save()
-                    
-                except Exception as e:
-                    # Create minimal valid results in case of error
-                    error_message = str(e)
-                    error_results = {
-                        'error': f"Error in analysis: {error_message}",
-                        'dataset_size': len(df),
-                        'analysis_type': analysis_type
-                    }
-                    
-                    # Serialize with custom encoder for consistency
-                    error_json = json.dumps(error_results, cls=CustomJSONEncoder)
-                    model_analysis.bias_analysis = json.loads(error_json)
-                    model_analysis.save()
-                    messages.warning(request, f"Analysis completed with errors: {error_message}")
-                    return redirect('dashboard:bias_detection')
-                
-                messages.success(request, "Bias analysis completed successfully.")
-                return redirect('dashboard:bias_detection')
+                # Queue the analysis; the worker saves the ModelAnalysis
+                job = enqueue_job(
+                    'bias',
+                    {
+                        'analysis': {field: form.cleaned_data.get(field, '') for field in ModelUploadForm.Meta.fields},
+                        'analysis_type': analysis_type,
+                        'sensitive_attributes': valid_sensitive_attrs,
+                        'sample_dataset_type': form.cleaned_data.get('sample_dataset_type', '')
+                    },
+                    data_file=data_file,
+                    df=df,
+                    user=request.user
+                )
+                return redirect_to_job(request, 'dashboard:bias_detection', job)
             
             except Exception as e:
                 messages.error(request, f"Error analyzing data: {str(e)}")
     
     # Get previously completed analyses
-    completed_analyses = ModelAnalysis.objects.filter(
-        bias_analysis__isnull=False
-    ).order_by('-created_at')
+    completed_analyses = paginate_analyses(request, ModelAnalysis.objects.filter(has_bias=True))
     
     context = {
         'title': 'AI Bias Detection',
         'form': form,
-        'completed_analyses': completed_analyses
+        'completed_analyses': completed_analyses,
+        'pending_job': get_pending_job(request, 'bias')
     }
     return render(request, 'dashboard/bias_detection.html', context)
 
@@ -194,10 +208,12 @@ def transparency(request):
                         messages.error(request, "Dataset file is required for dataset analysis")
                         return redirect('dashboard:transparency')
                         
-                    df = pd.read_csv(data_file)
+                    # Only the header is needed here; the worker reads the data
+                    columns = pd.read_csv(data_file, nrows=0).columns
+                    data_file.seek(0)
                     target_column = form.cleaned_data.get('target_column')
                     
-                    if not target_column or target_column not in df.columns:
+                    if not target_column or target_column not in columns:
                         messages.error(request, "Please specify a valid target column in the dataset")
                         return redirect('dashboard:transparency')
                 else:  # manual input
@@ -279,70 +295,32 @@ def transparency(request):
                         # Append to dataframe
                         df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
                 
-                # Generate model explainability
-                explainability_results = analyze_model_explainability(
-                    df, 
-                    target_column,
-                    model_type,
-                    explanation_level
+                # Queue the analysis; the worker saves the ModelAnalysis
+                job = enqueue_job(
+                    'transparency',
+                    {
+                        'analysis_type': analysis_type,
+                        'model_type': model_type,
+                        'explanation_level': explanation_level,
+                        'target_column': target_column
+                    },
+                    data_file=data_file if analysis_type == 'dataset' else None,
+                    df=df if analysis_type != 'dataset' else None,
+                    user=request.user
                 )
-                
-                # Add AI-powered insights for enhanced transparency
-                feature_importances = {}
-                if 'feature_importance' in explainability_results:
-                    feature_importances = explainability_results['feature_importance']
-                
-                # Add analysis type to results
-                explainability_results['analysis_type'] = analysis_type
-                
-                # Prepare model info for AI analysis
-                model_info = {
-                    'model_type': model_type,
-                    'data_shape': df.shape,
-                    'target_column': target_column,
-                    'explanation_level': explanation_level,
-                    'analysis_type': analysis_type
-                }
-                
-                # Get AI-powered transparency insights
-                try:
-                    ai_transparency_insights = gemini_ai.generate_transparency_insights(
-                        model_info, 
-                        feature_importances
-                    )
-                    
-                    # Add AI insights to results
-                    if 'error' not in ai_transparency_insights:
-                        explainability_results['ai_transparency_insights'] = ai_transparency_insights
-                except Exception as ai_error:
-                    # Log the error but continue without AI insights
-                    print(f"AI transparency analysis error: {str(ai_error)}")
-                
-                # Create and save analysis
-                model_analysis = ModelAnalysis(
-                    name=f"Transparency Analysis - {model_type}",
-                    description=f"Explainability analysis with {explanation_level} detail",
-                    model_type=model_type,
-                    dataset_description=f"Dataset with {len(df)} records, target: {target_column}",
-                    transparency_analysis=explainability_results
-                )
-                model_analysis.save()
-                
-                messages.success(request, "Transparency analysis completed successfully.")
-                return redirect('dashboard:transparency')
+                return redirect_to_job(request, 'dashboard:transparency', job)
             
             except Exception as e:
                 messages.error(request, f"Error analyzing model transparency: {str(e)}")
     
     # Get previously completed transparency analyses
-    completed_analyses = ModelAnalysis.objects.filter(
-        transparency_analysis__isnull=False
-    ).order_by('-created_at')
+    completed_analyses = paginate_analyses(request, ModelAnalysis.objects.filter(has_transparency=True))
     
     context = {
         'title': 'AI Transparency Analyzer',
         'form': form,
-        'completed_analyses': completed_analyses
+        'completed_analyses': completed_analyses,
+        'pending_job': get_pending_job(request, 'transparency')
     }
     return render(request, 'dashboard/transparency.html', context)
 
@@ -530,7 +508,7 @@ def analyze_bias(request):
             return JsonResponse({'error': 'No data file provided'}, status=400)
         
         data_file = request.FILES['data_file']
-        df = pd.read_csv(data_file)
+        df, stream_file = read_uploaded_csv(data_file)
         
         # Get sensitive attributes from request
         sensitive_attrs = request.POST.get('sensitive_attributes', '').split(',')
@@ -539,17 +517,21 @@ def analyze_bias(request):
         if not sensitive_attrs:
             return JsonResponse({'error': 'No sensitive attributes specified'}, status=400)
         
-        # Run bias detection
-        bias_results = detect_bias_in_data(df, sensitive_attrs)
-        fairness_metrics = calculate_fairness_metrics(df, sensitive_attrs)
-        
         # Add AI-powered ethics analysis if requested
         use_ai = request.POST.get('use_ai_analysis', 'false').lower() == 'true'
         ai_ethics_analysis = None
         
         if use_ai:
+            # Run bias detection while the AI analysis runs in the background
             target_column = request.POST.get('target_column', None)
-            ai_ethics_analysis = perform_ai_ethics_analysis(df, sensitive_attrs, target_column)
+            per_attribute = request.POST.get('per_attribute_analysis', 'false').lower() == 'true'
+            (bias_results, fairness_metrics), ai_ethics_analysis = run_alongside(
+                lambda: run_bias_analysis(df, stream_file, sensitive_attrs),
+                perform_ai_ethics_analysis_async(df, sensitive_attrs, target_column, per_attribute=per_attribute)
+            )
+        else:
+            # Run bias detection
+            bias_results, fairness_metrics = run_bias_analysis(df, stream_file, sensitive_attrs)
         
         response_data = {
             'success': True,
@@ -560,11 +542,11 @@ def analyze_bias(request):
         if ai_ethics_analysis:
             response_data['ai_ethics_analysis'] = ai_ethics_analysis
         
-        # Use custom encoder to ensure proper serialization of numpy types
-        return JsonResponse(response_data, encoder=CustomJSONEncoder)
+        # The results still hold NumPy values; ResultJsonResponse encodes them directly
+        return ResultJsonResponse(response_data)
     
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500, encoder=CustomJSONEncoder)
+        return JsonResponse({'error': str(e)}, status=500)
 
 
 @csrf_exempt
@@ -592,7 +574,9 @@ def analyze_model_transparency(request):
             df, 
             target_column,
             model_type,
-            explanation_level
+            explanation_level,
+            model_cache=get_default_cache(),
+            adaptive_sampling=settings.TRANSPARENCY_ADAPTIVE_SAMPLING
         )
         
         # Add AI-powered transparency insights if requested
@@ -612,11 +596,17 @@ def analyze_model_transparency(request):
             if 'feature_importance' in explainability_results:
                 feature_importances = explainability_results['feature_importance']
             
-            # Get AI-powered transparency insights
-            ai_transparency_insights = gemini_ai.generate_transparency_insights(
-                model_info, 
-                feature_importances
-            )
+            # Get AI-powered transparency insights; the local results are returned regardless
+            try:
+                ai_transparency_insights = gemini_ai.generate_transparency_insights(
+                    model_info, 
+                    feature_importances
+                )
+            except Exception as ai_error:
+                ai_transparency_insights = {
+                    'error': str(ai_error),
+                    'message': 'AI-powered transparency insights could not be generated'
+                }
         
         response_data = {
             'success': True,
@@ -626,11 +616,11 @@ def analyze_model_transparency(request):
         if ai_transparency_insights:
             response_data['ai_transparency_insights'] = ai_transparency_insights
         
-        # Use custom encoder to ensure proper serialization of numpy types
-        return JsonResponse(response_data, encoder=CustomJSONEncoder)
+        # The results still hold NumPy values; ResultJsonResponse encodes them directly
+        return ResultJsonResponse(response_data)
     
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500, encoder=CustomJSONEncoder)
+        return JsonResponse({"error": str(e)}, status=500)
 
 
 def get_governance_framework(request, framework_type):
@@ -638,25 +628,42 @@ def get_governance_framework(request, framework_type):
     if framework_type not in ['general', 'industry', 'regulatory', 'fairness', 'privacy']:
         return JsonResponse({'error': 'Invalid framework type'}, status=400)
     
-    framework_template = get_governance_template(framework_type)
-    
     # Check if AI-powered recommendations are requested
     use_ai = request.GET.get('use_ai_analysis', 'false').lower() == 'true'
-    ai_governance_recommendations = None
-    
-    if use_ai:
-        # Get parameters for AI recommendations
-        industry = request.GET.get('industry', 'general')
-        regulatory_requirements = request.GET.get('regulatory_requirements', '').split(',')
-        regulatory_requirements = [req.strip() for req in regulatory_requirements if req.strip()]
-        model_risk_level = request.GET.get('model_risk_level', 'medium')
-        
-        # Generate AI-powered governance recommendations
+    if not use_ai:
+        return governance_template_response(request, framework_type)
+    
+    framework_template = get_governance_template(framework_type)
+    
+    # Get parameters for AI recommendations
+    industry = request.GET.get('industry', 'general')
+    regulatory_requirements = request.GET.get('regulatory_requirements', '').split(',')
+    regulatory_requirements = [req.strip() for req in regulatory_requirements if req.strip()]
+    model_risk_level = request.GET.get('model_risk_level', 'medium')
+    
+    if request.GET.get('stream', 'false').lower() == 'true':
+        # Send the template at once and the recommendations as they are generated
+        return event_stream_response(stream_ai_events(
+            gemini_ai.stream_governance_recommendations(
+                industry,
+                regulatory_requirements or ['general compliance'],
+                model_risk_level
+            ),
+            first=('framework', to_json(framework_template))
+        ))
+    
+    # Generate AI-powered governance recommendations; the template is returned regardless
+    try:
         ai_governance_recommendations = gemini_ai.create_governance_recommendations(
             industry,
             regulatory_requirements or ['general compliance'],
             model_risk_level
         )
+    except Exception as ai_error:
+        ai_governance_recommendations = {
+            'error': str(ai_error),
+            'message': 'AI-powered governance recommendations could not be generated'
+        }
     
     response_data = {
         'success': True,
@@ -666,8 +673,28 @@ def get_governance_framework(request, framework_type):
     if ai_governance_recommendations:
         response_data['ai_governance_recommendations'] = ai_governance_recommendations
     
-    # Use custom encoder to ensure proper serialization of numpy types
-    return JsonResponse(response_data, encoder=CustomJSONEncoder)
+    return ResultJsonResponse(response_data)
+
+
+def governance_template_response(request, framework_type):
+    """
+    Serves a governance template from its pre-serialized JSON
+    
+    The response carries the template's ETag and Last-Modified, and a
+    conditional request for an unchanged template gets a 304 without a body.
+    """
+    template_json, etag = get_governance_template_json(framework_type)
+    last_modified = TEMPLATES_LAST_MODIFIED.timestamp()
+    
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(b'{"success":true,"framework":' + template_json + b'}',
+                                content_type='application/json')
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Cached copies are revalidated on every use
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 
 @csrf_exempt
@@ -693,6 +720,11 @@ def analyze_fairness_metrics(request):
         if not sensitive_groups:
             return JsonResponse({'error': 'No sensitive groups specified'}, status=400)
         
+        if request.GET.get('stream', 'false').lower() == 'true':
+            return event_stream_response(stream_ai_events(
+                gemini_ai.stream_fairness_metrics_analysis(metrics_data, model_type, sensitive_groups)
+            ))
+        
         # Analyze fairness metrics with AI
         analysis_results = gemini_ai.analyze_fairness_metrics(
             metrics_data,
@@ -700,10 +732,182 @@ def analyze_fairness_metrics(request):
             sensitive_groups
         )
         
-        return JsonResponse({
+        return ResultJsonResponse({
             'success': True,
             'analysis_results': analysis_results
-        }, encoder=CustomJSONEncoder)
+        })
     
+    except gemini_ai.AIUnavailableError as e:
+        return JsonResponse({"error": str(e)}, status=503)
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500, encoder=CustomJSONEncoder)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def ai_status(request):
+    """API endpoint reporting the Gemini circuit breaker and response cache counters"""
+    response_data = {'circuit_breaker': gemini_ai.get_circuit_breaker().metrics()}
+    
+    cache = get_default_ai_cache()
+    if cache is not None:
+        response_data['response_cache'] = {
+            'hits': cache.hits,
+            'disk_hits': cache.disk_hits,
+            'shared': cache.shared,
+            'misses': cache.misses
+        }
+    
+    return JsonResponse(response_data)
+
+
+def job_status(request, job_id):
+    """API endpoint reporting the state of a queued analysis job"""
+    job = get_object_or_404(AnalysisJob.objects.defer('payload', 'dataset'), pk=job_id)
+    
+    response_data = {
+        'id': str(job.pk),
+        'job_type': job.job_type,
+        'status': job.status,
+        'stage': job.stage,
+        'progress': job.progress,
+        'message': job.message,
+        'error': job.error,
+        'analysis_id': job.analysis_id,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at
+    }
+    
+    if job.status == AnalysisJob.STATUS_QUEUED:
+        response_data['queue_position'] = AnalysisJob.objects.filter(
+            status=AnalysisJob.STATUS_QUEUED,
+            created_at__lt=job.created_at
+        ).count() + 1
+    
+    return JsonResponse(response_data)
+
+
+def job_progress(request, job_id):
+    """Lightweight API endpoint polled by the analysis pages while a job runs"""
+    job = (AnalysisJob.objects.filter(pk=job_id)
+           .values('status', 'stage', 'progress', 'error', 'started_at', 'analysis_id')
+           .first())
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    
+    started_at = job.pop('started_at')
+    job['elapsed'] = (timezone.now() - started_at).total_seconds() if started_at else None
+    return JsonResponse(job)
+
+
+def analysis_results(request, analysis_id):
+    """
+    API endpoint returning the JSON results of one analysis
+    
+    ?fields= limits the response to some of bias_analysis,
+    transparency_analysis and fairness_metrics; only those results are read
+    and decompressed.
+    """
+    fields = request.GET.get('fields')
+    fields = [field for field in fields.split(',') if field] if fields else list(RESULT_KINDS)
+    unknown = set(fields) - set(RESULT_KINDS)
+    if unknown:
+        return JsonResponse({'error': f"Unknown fields: {', '.join(sorted(unknown))}"}, status=400)
+    
+    analysis = ModelAnalysis.objects.filter(pk=analysis_id).only('id').first()
+    if analysis is None:
+        return JsonResponse({'error': 'Analysis not found'}, status=404)
+    return ResultJsonResponse({'id': analysis.pk, **analysis.load_results(*fields)})
+
+
+def event_stream_response(events):
+    """Wraps formatted Server-Sent Events in an unbuffered streaming response"""
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def stream_ai_events(events, first=None):
+    """
+    Formats the (event, data) pairs of a streaming gemini_ai call as Server-Sent Events
+    
+    'delta' events carry generated text, 'section' events each section once it
+    is complete and 'done' the structured result. A failure ends the stream
+    with an 'error' event.
+    """
+    if first is not None:
+        yield format_server_sent_event(first[1], first[0])
+    try:
+        for event, data in events:
+            yield format_server_sent_event(data, event)
+    except Exception as ai_error:
+        yield format_server_sent_event({
+            'error': str(ai_error),
+            'unavailable': isinstance(ai_error, gemini_ai.AIUnavailableError)
+        }, 'error')
+
+
+def format_server_sent_event(data, event=None, event_id=None):
+    """Formats one Server-Sent Event"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, cls=DjangoJSONEncoder)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_job_events(job_id, last_seq):
+    """
+    Yields a job's progress events as they are recorded
+
+    Sends a 'progress' event for every new job event and a final 'done' event
+    once the job has finished. This is a long poll: the stream ends as soon as
+    it has sent new events, or after ANALYSIS_EVENTS_STREAM_SECONDS without
+    any, so a sync worker is only held briefly; the browser reconnects and
+    resumes from the Last-Event-ID it saw.
+    """
+    deadline = time.monotonic() + settings.ANALYSIS_EVENTS_STREAM_SECONDS
+    sent_from = last_seq
+    yield "retry: 1000\n\n"
+
+    while True:
+        job = (AnalysisJob.objects.filter(pk=job_id)
+               .values('status', 'events', 'error', 'analysis_id')
+               .first())
+        if job is None:
+            return
+
+        for event in job['events']:
+            if event['seq'] > last_seq:
+                last_seq = event['seq']
+                yield format_server_sent_event(event, 'progress', last_seq)
+
+        if job['status'] in (AnalysisJob.STATUS_SUCCEEDED, AnalysisJob.STATUS_FAILED):
+            yield format_server_sent_event(
+                {'status': job['status'], 'error': job['error'], 'analysis_id': job['analysis_id']},
+                'done'
+            )
+            return
+
+        # Long poll: end once something new was sent, or at the deadline
+        if last_seq > sent_from or time.monotonic() >= deadline:
+            return
+
+        # Comment line so proxies keep the connection open
+        yield ": keep-alive\n\n"
+        time.sleep(settings.ANALYSIS_EVENTS_POLL_INTERVAL)
+
+
+def job_events(request, job_id):
+    """Server-Sent Events stream of a job's progress (stage, rows processed, elapsed time)"""
+    if not AnalysisJob.objects.filter(pk=job_id).exists():
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID') or request.GET.get('after') or 0)
+    except ValueError:
+        last_seq = 0
+    
+    return event_stream_response(stream_job_events(job_id, last_seq))
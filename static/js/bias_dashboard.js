@@ -5,6 +5,19 @@
 
 let biasCharts = {};
 
+// Display names of the progress stages reported by bias analysis jobs
+const BIAS_JOB_STAGES = {
+    starting: 'Starting',
+    loading_data: 'Loading dataset',
+    bias_statistics: 'Computing group statistics',
+    reading_csv: 'Reading dataset',
+    group_statistics: 'Computing group statistics',
+    bias_tests: 'Running bias tests',
+    fairness_metrics: 'Calculating fairness metrics',
+    ai_ethics_analysis: 'Generating AI ethics analysis',
+    saving: 'Saving results'
+};
+
 document.addEventListener('DOMContentLoaded', function() {
     // Initialize bias detection form
     const biasForm = document.getElementById('bias-detection-form');
@@ -12,6 +25,11 @@ document.addEventListener('DOMContentLoaded', function() {
         initBiasDetectionForm();
     }
     
+    // Follow a queued bias analysis
+    document.querySelectorAll('.analysis-job-status').forEach(statusElement => {
+        watchAnalysisJob(statusElement, BIAS_JOB_STAGES);
+    });
+    
     // Initialize existing bias analysis visualizations
     const biasAnalyses = document.querySelectorAll('.bias-analysis');
     if (biasAnalyses.length > 0) {
@@ -174,55 +192,15 @@ function initSensitiveAttributesSuggestions() {
  * Initialize visualizations for existing bias analyses
  */
 function initExistingBiasVisualizations() {
-    const biasAnalyses = document.querySelectorAll('.bias-analysis');
-    
-    biasAnalyses.forEach(analysis => {
-        try {
-            // Get analysis data
-            const analysisId = analysis.getAttribute('data-analysis-id');
-            const biasResultsStr = analysis.getAttribute('data-bias-results');
-            const fairnessMetricsStr = analysis.getAttribute('data-fairness-metrics');
-            
-            // Parse JSON data safely
-            let biasResults, fairnessMetrics;
-            
-            try {
-                // Decode HTML entities (like &quot;) before parsing
-                const decodedBiasResults = biasResultsStr ? decodeHtmlEntities(biasResultsStr) : '{}';
-                biasResults = JSON.parse(decodedBiasResults);
-            } catch (parseError) {
-                console.error('Error parsing bias results JSON:', parseError);
-                console.log('Raw JSON string:', biasResultsStr);
-                biasResults = { error: 'Invalid JSON data' };
-            }
-            
-            try {
-                // Decode HTML entities before parsing
-                const decodedFairnessMetrics = fairnessMetricsStr ? decodeHtmlEntities(fairnessMetricsStr) : 'null';
-                fairnessMetrics = JSON.parse(decodedFairnessMetrics);
-            } catch (parseError) {
-                console.error('Error parsing fairness metrics JSON:', parseError);
-                console.log('Raw JSON string:', fairnessMetricsStr);
-                fairnessMetrics = null;
-            }
-            
-            // Helper function to decode HTML entities
-            function decodeHtmlEntities(str) {
-                if (!str) return '';
-                const txt = document.createElement('textarea');
-                txt.innerHTML = str;
-                return txt.value;
-            }
-            
-            // Create visualizations
-            createBiasVisualizations(analysisId, biasResults, fairnessMetrics);
-            
-            // Show additional information
-            populateBiasAnalysisSummary(analysisId, biasResults, fairnessMetrics);
-            
-        } catch (error) {
-            console.error('Error initializing bias visualization:', error);
-        }
+    initLazyAnalysisCards('.bias-analysis', (analysisId, results) => {
+        const biasResults = results.bias_analysis || { error: 'No bias results' };
+        const fairnessMetrics = results.fairness_metrics;
+        
+        // Create visualizations
+        createBiasVisualizations(analysisId, biasResults, fairnessMetrics);
+        
+        // Show additional information
+        populateBiasAnalysisSummary(analysisId, biasResults, fairnessMetrics);
     });
 }
 
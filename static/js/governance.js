@@ -123,6 +123,7 @@ function loadFrameworkDetails(frameworkType) {
                 showFrameworkError(contentContainer, data.error);
             } else if (data.success && data.framework) {
                 displayFramework(contentContainer, data.framework);
+                addAIRecommendationsPanel(contentContainer, frameworkType);
             } else {
                 showFrameworkError(contentContainer, 'Invalid response from server');
             }
@@ -299,6 +300,80 @@ function displayFramework(container, framework) {
     container.innerHTML = html;
 }
 
+// Headings of the AI governance recommendation sections
+const AI_RECOMMENDATION_SECTIONS = {
+    governance_framework: 'Governance Framework',
+    documentation_requirements: 'Documentation Requirements',
+    testing_protocols: 'Testing Protocols',
+    monitoring_procedures: 'Monitoring Procedures',
+    roles_responsibilities: 'Roles and Responsibilities'
+};
+
+/**
+ * Add a panel that streams AI governance recommendations for a framework
+ * @param {HTMLElement} container - Framework content container
+ * @param {string} frameworkType - Type of framework
+ */
+function addAIRecommendationsPanel(container, frameworkType) {
+    const panel = document.createElement('div');
+    panel.className = 'ai-recommendations mt-4';
+    panel.innerHTML = `
+        <h4>AI Recommendations</h4>
+        <button class="btn btn-secondary ai-recommendations-btn">Generate AI recommendations</button>
+        <div class="ai-recommendations-sections"></div>
+        <pre class="ai-recommendations-text" style="white-space: pre-wrap;"></pre>
+    `;
+    container.appendChild(panel);
+    
+    panel.querySelector('.ai-recommendations-btn').addEventListener('click', function() {
+        this.disabled = true;
+        streamAIRecommendations(frameworkType, panel);
+    });
+}
+
+/**
+ * Stream AI governance recommendations into a panel as they are generated
+ * @param {string} frameworkType - Type of framework
+ * @param {HTMLElement} panel - Panel created by addAIRecommendationsPanel
+ */
+function streamAIRecommendations(frameworkType, panel) {
+    const sectionsContainer = panel.querySelector('.ai-recommendations-sections');
+    const textContainer = panel.querySelector('.ai-recommendations-text');
+    const button = panel.querySelector('.ai-recommendations-btn');
+    
+    sectionsContainer.innerHTML = '';
+    textContainer.textContent = '';
+    
+    const params = new URLSearchParams({ use_ai_analysis: 'true', stream: 'true', industry: frameworkType });
+    const source = new EventSource(`/api/get-governance-framework/${frameworkType}/?${params}`);
+    
+    // Raw text shows up as it is generated; each section replaces it once complete
+    source.addEventListener('delta', message => {
+        textContainer.textContent += JSON.parse(message.data);
+    });
+    source.addEventListener('section', message => {
+        const section = JSON.parse(message.data);
+        const card = document.createElement('div');
+        card.className = 'card mb-3';
+        card.innerHTML = `<div class="card-body"><h5></h5><p style="white-space: pre-wrap;"></p></div>`;
+        card.querySelector('h5').textContent = AI_RECOMMENDATION_SECTIONS[section.name] || section.name;
+        card.querySelector('p').textContent = section.text;
+        sectionsContainer.appendChild(card);
+    });
+    source.addEventListener('done', () => {
+        source.close();
+        textContainer.textContent = '';
+        button.disabled = false;
+    });
+    source.addEventListener('error', message => {
+        source.close();
+        button.disabled = false;
+        // Server-sent error events carry data; connection errors do not
+        const detail = message.data ? JSON.parse(message.data).error : 'Connection lost';
+        textContainer.textContent = `AI recommendations are unavailable: ${detail}`;
+    });
+}
+
 /**
  * Show error message when framework loading fails
  * @param {HTMLElement} container - Container element
@@ -202,6 +202,49 @@ function ajaxRequest(url, options = {}) {
         });
 }
 
+/**
+ * Load a completed analysis's results the first time its card is opened
+ * @param {string} selector - Selector of the analysis cards
+ * @param {Function} render - Called with the analysis ID and its results once loaded
+ */
+function initLazyAnalysisCards(selector, render) {
+    const requestedId = new URLSearchParams(window.location.search).get('analysis_id');
+    
+    document.querySelectorAll(selector).forEach(card => {
+        const toggle = card.querySelector('.analysis-toggle');
+        const results = card.querySelector('.analysis-results');
+        if (!toggle || !results) return;
+        
+        let loaded = false;
+        toggle.addEventListener('click', () => {
+            const open = results.classList.toggle('open');
+            toggle.textContent = open ? 'Hide results' : 'Show results';
+            if (!open || loaded) return;
+            
+            loaded = true;
+            ajaxRequest(card.dataset.resultsUrl)
+                .then(data => render(card.dataset.analysisId, data))
+                .catch(error => {
+                    // Allow another attempt on the next click
+                    loaded = false;
+                    results.classList.remove('open');
+                    toggle.textContent = 'Show results';
+                    const alert = document.createElement('div');
+                    alert.className = 'alert alert-error';
+                    alert.textContent = `Could not load the results: ${error.message}`;
+                    toggle.after(alert);
+                    setTimeout(() => alert.remove(), 5000);
+                });
+        });
+        
+        // Open the analysis linked from the profile page
+        if (requestedId === card.dataset.analysisId) {
+            toggle.click();
+            card.scrollIntoView();
+        }
+    });
+}
+
 /**
  * Copy text to clipboard
  * @param {string} text - Text to copy
@@ -224,3 +267,116 @@ function copyToClipboard(text) {
     document.body.removeChild(el);
     return success;
 }
+
+/**
+ * Format seconds as a short elapsed-time label
+ */
+function formatElapsed(seconds) {
+    if (seconds === null || seconds === undefined) return '';
+    seconds = Math.round(seconds);
+    const minutes = Math.floor(seconds / 60);
+    return minutes > 0 ? `${minutes}m ${seconds % 60}s` : `${seconds}s`;
+}
+
+/**
+ * Follow the progress of a queued analysis job and reload the page once it finishes
+ *
+ * Progress events (stage, rows processed, elapsed time) are streamed with
+ * Server-Sent Events; browsers without EventSource, or streams that keep
+ * failing, fall back to polling the progress endpoint.
+ *
+ * @param {HTMLElement} statusElement - The .analysis-job-status element
+ * @param {Object} stageLabels - Optional display names keyed by stage
+ */
+function watchAnalysisJob(statusElement, stageLabels = {}) {
+    const stageLabel = statusElement.querySelector('.job-stage');
+    const detailLabel = statusElement.querySelector('.job-detail');
+    const progressBar = statusElement.querySelector('.job-progress-bar');
+    
+    const describeStage = stage => stageLabels[stage] || stage.replace(/_/g, ' ');
+    
+    const showEvent = event => {
+        stageLabel.textContent = describeStage(event.stage);
+        if (event.fraction !== null && event.fraction !== undefined) {
+            progressBar.style.width = `${Math.round(event.fraction * 100)}%`;
+        }
+        if (detailLabel) {
+            const parts = [];
+            if (event.rows_processed !== null && event.rows_processed !== undefined) {
+                parts.push(event.total_rows
+                    ? `${event.rows_processed.toLocaleString()} / ${event.total_rows.toLocaleString()} rows`
+                    : `${event.rows_processed.toLocaleString()} rows`);
+            }
+            parts.push(formatElapsed(event.elapsed));
+            detailLabel.textContent = parts.filter(Boolean).join(' · ');
+        }
+    };
+    
+    const finish = job => {
+        if (job.status === 'succeeded') {
+            progressBar.style.width = '100%';
+            stageLabel.textContent = 'Complete';
+            // Reload without the job parameter to show the saved analysis
+            window.location.replace(window.location.pathname);
+        } else {
+            statusElement.classList.replace('alert-info', 'alert-error');
+            stageLabel.textContent = `Failed: ${job.error}`;
+        }
+    };
+    
+    const poll = () => {
+        fetch(statusElement.dataset.progressUrl, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(job => {
+                if (job.error && !job.status) {
+                    stageLabel.textContent = job.error;
+                    return;
+                }
+                
+                if (job.status === 'succeeded' || job.status === 'failed') {
+                    finish(job);
+                } else if (job.status === 'queued') {
+                    stageLabel.textContent = 'Waiting for a worker';
+                    setTimeout(poll, 2000);
+                } else {
+                    showEvent({ stage: job.stage, fraction: job.progress, elapsed: job.elapsed });
+                    setTimeout(poll, 2000);
+                }
+            })
+            .catch(error => {
+                console.error('Error polling analysis job:', error);
+                setTimeout(poll, 5000);
+            });
+    };
+    
+    const eventsUrl = statusElement.dataset.eventsUrl;
+    if (!eventsUrl || typeof EventSource === 'undefined') {
+        poll();
+        return;
+    }
+    
+    // The server ends each stream after a few seconds (long poll); EventSource
+    // reconnects by itself and resumes from the last event id
+    const source = new EventSource(eventsUrl);
+    let failures = 0;
+    
+    // A clean end of the stream is followed by a reconnect that opens again;
+    // only errors without a successful reconnect in between count as failures
+    source.onopen = () => {
+        failures = 0;
+    };
+    source.addEventListener('progress', message => {
+        showEvent(JSON.parse(message.data));
+    });
+    source.addEventListener('done', message => {
+        source.close();
+        finish(JSON.parse(message.data));
+    });
+    source.onerror = () => {
+        failures += 1;
+        if (source.readyState === EventSource.CLOSED || failures >= 3) {
+            source.close();
+            poll();
+        }
+    };
+}
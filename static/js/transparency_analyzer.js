@@ -5,6 +5,22 @@
 
 let transparencyCharts = {};
 
+// Display names of the progress stages reported by transparency analysis jobs
+const TRANSPARENCY_JOB_STAGES = {
+    starting: 'Starting',
+    loading_data: 'Loading dataset',
+    explainability: 'Analyzing explainability',
+    preprocessing: 'Preprocessing data',
+    model_training: 'Training surrogate model',
+    feature_importance: 'Ranking features',
+    model_complexity: 'Assessing model complexity',
+    feature_interactions: 'Finding feature interactions',
+    shap_values: 'Computing SHAP values',
+    model_limitations: 'Reviewing model limitations',
+    ai_transparency_insights: 'Generating AI insights',
+    saving: 'Saving results'
+};
+
 document.addEventListener('DOMContentLoaded', function() {
     // Initialize transparency analyzer form
     const transparencyForm = document.getElementById('transparency-analyzer-form');
@@ -12,6 +28,11 @@ document.addEventListener('DOMContentLoaded', function() {
         initTransparencyForm();
     }
     
+    // Follow a queued transparency analysis
+    document.querySelectorAll('.analysis-job-status').forEach(statusElement => {
+        watchAnalysisJob(statusElement, TRANSPARENCY_JOB_STAGES);
+    });
+    
     // Initialize existing transparency analysis visualizations
     const transparencyAnalyses = document.querySelectorAll('.transparency-analysis');
     if (transparencyAnalyses.length > 0) {
@@ -223,52 +244,15 @@ function decodeHtmlEntities(str) {
  * Initialize visualizations for existing transparency analyses
  */
 function initExistingTransparencyVisualizations() {
-    const transparencyAnalyses = document.querySelectorAll('.transparency-analysis');
-    
-    if (!transparencyAnalyses || transparencyAnalyses.length === 0) {
-        console.log('No transparency analyses found on this page');
-        return;
-    }
-    
-    transparencyAnalyses.forEach(analysis => {
-        try {
-            // Get analysis data
-            const analysisId = analysis.getAttribute('data-analysis-id');
-            const transparencyResultsStr = analysis.getAttribute('data-transparency-results');
-            
-            if (!analysisId) {
-                console.error('Missing analysis ID in transparency analysis element');
-                return;
-            }
-            
-            if (!transparencyResultsStr) {
-                console.error(`Missing transparency results for analysis ID: ${analysisId}`);
-                return;
-            }
-            
-            // Parse JSON data safely
-            let transparencyResults;
-            
-            try {
-                // Decode HTML entities (like &quot;) before parsing
-                const decodedResults = transparencyResultsStr ? decodeHtmlEntities(transparencyResultsStr) : '{}';
-                transparencyResults = JSON.parse(decodedResults);
-            } catch (parseError) {
-                console.error('Error parsing transparency results JSON:', parseError);
-                console.log('Raw JSON string:', transparencyResultsStr);
-                transparencyResults = { error: 'Invalid JSON data' };
-            }
-            
-            // Create visualizations
-            if (transparencyResults && !transparencyResults.error) {
-                createTransparencyVisualizations(analysisId, transparencyResults);
-                
-                // Show additional information
-                populateTransparencySummary(analysisId, transparencyResults);
-            }
+    initLazyAnalysisCards('.transparency-analysis', (analysisId, results) => {
+        const transparencyResults = results.transparency_analysis;
+        
+        // Create visualizations
+        if (transparencyResults && !transparencyResults.error) {
+            createTransparencyVisualizations(analysisId, transparencyResults);
             
-        } catch (error) {
-            console.error('Error initializing transparency visualization:', error);
+            // Show additional information
+            populateTransparencySummary(analysisId, transparencyResults);
         }
     });
 }
@@ -405,6 +389,30 @@ function populateTransparencySummary(analysisId, transparencyResults) {
         `;
     }
     
+    // SHAP values
+    if (transparencyResults.shap_values &&
+        transparencyResults.shap_values.global_importance) {
+
+        const shap = transparencyResults.shap_values;
+        const shapFeatures = Object.entries(shap.global_importance).slice(0, 5);
+
+        summaryHtml += `
+            <div class="mb-3">
+                <h4>SHAP Feature Attributions</h4>
+                <div class="bias-metric-card">
+                    <p class="metric-label">Mean absolute SHAP value over ${shap.rows_sampled} sampled rows:</p>
+                    <ol>
+                        ${shapFeatures.map(([feature, value]) =>
+                            `<li><strong>${feature}</strong>: ${value.toFixed(4)}</li>`
+                        ).join('')}
+                    </ol>
+                    ${shap.complete ? '' :
+                        `<p class="text-muted">Approximated from ${shap.trees_used} of ${shap.total_trees} trees within the time budget.</p>`}
+                </div>
+            </div>
+        `;
+    }
+
     // Model limitations
     if (transparencyResults.model_limitations) {
         summaryHtml += `